@@ -0,0 +1,77 @@
+"""Measures the memory used by large random circuits, stored as QuantumCircuit and as CompactCircuit.
+
+Usage: python benchmarks/circuit_memory.py [--gates 1000000] [--qubits 20]
+
+Memory is measured with tracemalloc, so it covers everything allocated while building the circuit except the
+interpreter and the imported modules.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from shor.compact import CompactCircuit
+from shor.gates import CCNOT, CNOT, Hadamard, PauliX, Rx, Rz
+from shor.quantum import QuantumCircuit
+
+
+def random_gates(num_gates: int, num_qubits: int, seed: int = 0, chunk_size: int = 10000):
+    """Yields random gates, drawing their kinds, qubits and angles a chunk at a time to keep the peak memory low."""
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, num_gates, chunk_size):
+        size = min(chunk_size, num_gates - start)
+        kinds = rng.integers(0, 6, size=size).tolist()
+        qubits = np.argsort(rng.random((size, num_qubits)), axis=1)[:, :3].tolist()
+        angles = rng.uniform(0, 2 * np.pi, size=size).tolist()
+
+        for kind, q, angle in zip(kinds, qubits, angles):
+            if kind == 0:
+                yield Hadamard(q[0])
+            elif kind == 1:
+                yield PauliX(q[0])
+            elif kind == 2:
+                yield CNOT(q[0], q[1])
+            elif kind == 3:
+                yield CCNOT(q[0], q[1], q[2])
+            elif kind == 4:
+                yield Rx(q[0], angle=angle)
+            else:
+                yield Rz(q[0], angle=angle)
+
+
+def measure(circuit_class, num_gates: int, num_qubits: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    circuit = circuit_class()
+    for gate in random_gates(num_gates, num_qubits):
+        circuit.add(gate)
+
+    seconds = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return circuit, size, peak, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gates", type=int, default=10 ** 6)
+    parser.add_argument("--qubits", type=int, default=20)
+    args = parser.parse_args()
+
+    print("{:<16} {:>12} {:>12} {:>12} {:>10}".format("circuit", "size MB", "peak MB", "bytes/gate", "build s"))
+    for circuit_class in (QuantumCircuit, CompactCircuit):
+        circuit, size, peak, seconds = measure(circuit_class, args.gates, args.qubits)
+        print(
+            "{:<16} {:>12.1f} {:>12.1f} {:>12.1f} {:>10.2f}".format(
+                circuit_class.__name__, size / 2 ** 20, peak / 2 ** 20, size / args.gates, seconds
+            )
+        )
+        del circuit
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measures how long importing shor takes in a fresh interpreter.
+
+Usage: python benchmarks/import_time.py [--repeat 10]
+
+Each statement runs in its own subprocess so nothing is cached between runs, the median over all runs is reported
+along with whether qiskit ended up in sys.modules. Importing shor.quantum and shor.gates should stay in the tens of
+milliseconds (most of which is numpy), providers are only imported by name when a circuit is run.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import numpy",
+    "import shor.quantum, shor.gates",
+    "import shor.providers",
+    "from shor.providers import get_provider; get_provider('statevector')",
+]
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, 'qiskit' in sys.modules)
+"""
+
+
+def time_import(statement: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)], check=True, stdout=subprocess.PIPE
+        ).stdout.split()
+        timings.append(float(output[0]))
+
+    return statistics.median(timings), output[1] == b"True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print("{:<70} {:>10} {:>8}".format("statement", "median ms", "qiskit"))
+    for statement in STATEMENTS:
+        seconds, imported_qiskit = time_import(statement, args.repeat)
+        print("{:<70} {:>10.1f} {:>8}".format(statement, seconds * 1000, "yes" if imported_qiskit else "no"))
+
+
+if __name__ == "__main__":
+    main()
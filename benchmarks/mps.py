@@ -0,0 +1,88 @@
+"""Times the MPS provider on wide nearest neighbour ansatze and approximate QFTs across bond dimension caps.
+
+Usage: python benchmarks/mps.py [--qubits 50 100] [--bonds 8 32 128] [--shots 10000]
+
+For each circuit and cap, reports the time to apply the gates, the time to sample the shots, the largest bond
+reached, the swaps made to route gates and the accrued truncation error.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from shor.gates import CNOT, CRZ, H, Ry, Rz
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import MPSProvider
+from shor.quantum import QuantumCircuit
+
+
+def ansatz(num_qubits: int, depth: int, seed: int = 0) -> QuantumCircuit:
+    """Layers of random Ry and Rz rotations followed by a brickwork of neighbouring CNOTs."""
+    rng = np.random.default_rng(seed)
+
+    circuit = QuantumCircuit().add(Qubits(num_qubits))
+    for layer in range(depth):
+        for q in range(num_qubits):
+            circuit.add(Ry(q, angle=rng.uniform(0, np.pi))).add(Rz(q, angle=rng.uniform(0, np.pi)))
+        for q in range(layer % 2, num_qubits - 1, 2):
+            circuit.add(CNOT(q, q + 1))
+
+    return circuit.add(Measure(list(range(num_qubits))))
+
+
+def approximate_qft(num_qubits: int, max_distance: int = 4) -> QuantumCircuit:
+    """QFT of a product state, dropping the controlled rotations between qubits more than max_distance apart."""
+    circuit = QuantumCircuit().add(Qubits(num_qubits)).add(H(list(range(0, num_qubits, 3))))
+    for target in range(num_qubits):
+        circuit.add(H(target))
+        for control in range(target + 1, min(num_qubits, target + 1 + max_distance)):
+            circuit.add(CRZ(control, target, angle=np.pi / 2 ** (control - target)))
+
+    return circuit.add(Measure(list(range(num_qubits))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[50, 100])
+    parser.add_argument("--bonds", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--depth", type=int, default=16)
+    parser.add_argument("--shots", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(
+        "{:<8} {:>7} {:>6} {:>9} {:>10} {:>6} {:>7} {:>12}".format(
+            "circuit", "qubits", "bond", "gates s", "sample s", "max", "swaps", "trunc error"
+        )
+    )
+    for num_qubits in args.qubits:
+        circuits = [("ansatz", ansatz(num_qubits, args.depth)), ("aqft", approximate_qft(num_qubits))]
+        for name, circuit in circuits:
+            for bond in args.bonds:
+                provider = MPSProvider(seed=0, max_bond_dimension=bond)
+
+                start = time.perf_counter()
+                state = provider.state(circuit)
+                gates_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                state.sample(list(range(num_qubits)), args.shots, provider.rng)
+                sample_seconds = time.perf_counter() - start
+
+                stats = provider.stats
+                print(
+                    "{:<8} {:>7} {:>6} {:>9.2f} {:>10.2f} {:>6} {:>7} {:>12.2e}".format(
+                        name,
+                        num_qubits,
+                        bond,
+                        gates_seconds,
+                        sample_seconds,
+                        stats.max_bond,
+                        stats.swaps,
+                        stats.truncation_error,
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
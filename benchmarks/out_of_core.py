@@ -0,0 +1,80 @@
+"""Simulates a random circuit with the state on disk, reporting the passes over the file and the I/O they cost.
+
+Usage: python benchmarks/out_of_core.py [--qubits 24] [--local-qubits 18] [--depth 10] [--directory /tmp]
+
+The random circuit has layers of single qubit rotations and CNOT ladders, so gates regularly touch the high, global,
+qubits. The in-memory StatevectorProvider is timed on the same circuit when --compare is given.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from shor.gates import CNOT, Hadamard, Rx, Rz
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import MemmapProvider, StatevectorProvider
+from shor.quantum import QuantumCircuit
+
+
+def random_circuit(num_qubits: int, depth: int, seed: int = 0) -> QuantumCircuit:
+    rng = np.random.default_rng(seed)
+
+    circuit = QuantumCircuit().add(Qubits(num_qubits)).add(Hadamard(*range(num_qubits)))
+    for _ in range(depth):
+        for q in range(num_qubits):
+            circuit.add(Rx(q, angle=rng.uniform(0, 2 * np.pi))).add(Rz(q, angle=rng.uniform(0, 2 * np.pi)))
+        for q in range(int(rng.integers(0, 2)), num_qubits - 1, 2):
+            circuit.add(CNOT(q, q + 1))
+
+    return circuit.add(Measure(list(range(num_qubits))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, default=24)
+    parser.add_argument("--local-qubits", type=int, default=18)
+    parser.add_argument("--max-swap-qubits", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--precision", default="complex64")
+    parser.add_argument("--directory", default=None)
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    circuit = random_circuit(args.qubits, args.depth)
+    provider = MemmapProvider(
+        local_qubits=args.local_qubits,
+        max_swap_qubits=args.max_swap_qubits,
+        precision=args.precision,
+        directory=args.directory,
+        progress=lambda stats: print(
+            "  {:>4}/{} gates, {} passes".format(stats.gates_applied, stats.total_gates, stats.passes), end="\r"
+        ),
+    )
+
+    start = time.perf_counter()
+    provider.run(circuit, 1000)
+    seconds = time.perf_counter() - start
+
+    stats = provider.stats
+    state_bytes = 2 ** args.qubits * np.dtype(args.precision).itemsize
+    print("memmap       {:>8.2f} s".format(seconds) + " " * 20)
+    print(
+        "  local passes {}, swap passes {} ({} qubits)".format(
+            stats.local_passes, stats.swap_passes, stats.swapped_qubits
+        )
+    )
+    print(
+        "  read {:.1f} GiB, written {:.1f} GiB, {:.1f} state sizes".format(
+            stats.bytes_read / 2 ** 30, stats.bytes_written / 2 ** 30, stats.bytes_read / state_bytes
+        )
+    )
+
+    if args.compare:
+        start = time.perf_counter()
+        StatevectorProvider(precision=args.precision).run(circuit, 1000)
+        print("statevector  {:>8.2f} s".format(time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
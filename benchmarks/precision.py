@@ -0,0 +1,72 @@
+"""Compares simulating random circuits in complex128 and complex64.
+
+Usage: python benchmarks/precision.py [--qubits 18 20 22] [--depth 20]
+
+For each size the same circuit is simulated at both precisions, reporting the wall time, the memory of the state and
+the fidelity |<psi64|psi128>|^2 of the complex64 result against the complex128 one.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from shor.gates import CNOT, Hadamard, Rx, Rz, T
+from shor.layers import Qubits
+from shor.quantum import QuantumCircuit
+from shor.utils.statevector import simulate
+
+
+def random_circuit(num_qubits: int, depth: int, seed: int = 0) -> QuantumCircuit:
+    """depth rounds of random single qubit rotations on every qubit followed by a ladder of CNOTs."""
+    rng = np.random.default_rng(seed)
+
+    circuit = QuantumCircuit().add(Qubits(num_qubits)).add(Hadamard(*range(num_qubits)))
+    for _ in range(depth):
+        for q in range(num_qubits):
+            circuit.add(Rx(q, angle=rng.uniform(0, 2 * np.pi))).add(Rz(q, angle=rng.uniform(0, 2 * np.pi)))
+            circuit.add(T(q))
+        for q in range(int(rng.integers(0, 2)), num_qubits - 1, 2):
+            circuit.add(CNOT(q, q + 1))
+
+    return circuit
+
+
+def run(circuit: QuantumCircuit, precision: str):
+    start = time.perf_counter()
+    state = simulate(circuit, precision=precision)
+    return state, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[18, 20, 22])
+    parser.add_argument("--depth", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        "{:>7} {:>9} {:>9} {:>9} {:>9} {:>8} {:>14}".format(
+            "qubits", "c128 s", "c64 s", "c128 MB", "c64 MB", "speedup", "1 - fidelity"
+        )
+    )
+    for num_qubits in args.qubits:
+        circuit = random_circuit(num_qubits, args.depth)
+
+        exact, exact_seconds = run(circuit, "complex128")
+        single, single_seconds = run(circuit, "complex64")
+        fidelity = abs(np.vdot(single.astype("complex128"), exact)) ** 2
+
+        print(
+            "{:>7} {:>9.2f} {:>9.2f} {:>9.1f} {:>9.1f} {:>8.2f} {:>14.2e}".format(
+                num_qubits,
+                exact_seconds,
+                single_seconds,
+                exact.nbytes / 2 ** 20,
+                single.nbytes / 2 ** 20,
+                exact_seconds / single_seconds,
+                1 - fidelity,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
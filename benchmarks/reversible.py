@@ -0,0 +1,74 @@
+"""Times the reversible provider evaluating ripple carry adders on many inputs at once.
+
+Usage: python benchmarks/reversible.py [--bits 8 32 128] [--inputs 1000000]
+
+For each adder width, reports the time per input to evaluate random inputs through the bit sliced states, and the
+time to tabulate every input of an adder small enough to enumerate.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from shor.gates import CCNOT, CNOT
+from shor.layers import Qubits
+from shor.providers import ReversibleProvider
+from shor.quantum import QuantumCircuit
+from shor.utils.reversible import BitSlicedStates
+
+
+def ripple_carry_adder(num_bits: int) -> QuantumCircuit:
+    """Adds a (qubits 0..n-1) into b (qubits n..2n-1), with carries on qubits 2n..3n."""
+    circuit = QuantumCircuit().add(Qubits(3 * num_bits + 1))
+    for i in range(num_bits):
+        a, b, carry, carry_out = i, num_bits + i, 2 * num_bits + i, 2 * num_bits + i + 1
+        circuit.add(CCNOT(a, b, carry_out)).add(CNOT(a, b)).add(CCNOT(carry, b, carry_out)).add(CNOT(carry, b))
+
+    return circuit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--inputs", type=int, default=10 ** 6)
+    args = parser.parse_args()
+
+    provider = ReversibleProvider()
+    rng = np.random.default_rng(0)
+
+    print(
+        "{:<10} {:>7} {:>7} {:>10} {:>12} {:>12}".format("circuit", "qubits", "gates", "inputs", "gates s", "us/input")
+    )
+    for num_bits in args.bits:
+        circuit = ripple_carry_adder(num_bits)
+        num_qubits = 3 * num_bits + 1
+
+        # Sliced directly from random bits, so the timing is the circuit's rather than converting Python ints
+        states = BitSlicedStates.from_bits(rng.integers(0, 2, size=(args.inputs, num_qubits), dtype=np.uint8))
+        gates = circuit.to_gates()
+
+        start = time.perf_counter()
+        states.apply(gates)
+        seconds = time.perf_counter() - start
+
+        print(
+            "{:<10} {:>7} {:>7} {:>10} {:>12.3f} {:>12.4f}".format(
+                "adder", num_qubits, len(gates), args.inputs, seconds, 1e6 * seconds / args.inputs
+            )
+        )
+
+    # Every input of an adder of two 10 bit numbers
+    circuit = ripple_carry_adder(10)
+    start = time.perf_counter()
+    table = provider.tabulate(circuit, inputs=list(range(20)), outputs=list(range(10, 20)) + [30])
+    seconds = time.perf_counter() - start
+
+    x = np.arange(2 ** 20)
+    assert np.array_equal(table, (x & 1023) + (x >> 10))
+    print(
+        "{:<10} {:>7} {:>7} {:>10} {:>12.3f} {:>12.4f}".format("table", 31, 40, x.size, seconds, 1e6 * seconds / x.size)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Times the stabilizer provider on GHZ and random Clifford circuits of thousands of qubits.
+
+Usage: python benchmarks/stabilizer.py [--qubits 1000 2000 4000] [--shots 10000]
+
+Reports the time to apply the gates to the tableau and the time to measure every qubit and sample all the shots.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from shor.gates import CNOT, Cz, Hadamard, S
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import StabilizerProvider
+from shor.quantum import QuantumCircuit
+
+
+def ghz(num_qubits: int) -> QuantumCircuit:
+    circuit = QuantumCircuit().add(Qubits(num_qubits)).add(Hadamard(0))
+    for q in range(num_qubits - 1):
+        circuit.add(CNOT(q, q + 1))
+
+    return circuit.add(Measure(list(range(num_qubits))))
+
+
+def random_clifford(num_qubits: int, num_gates: int, seed: int = 0) -> QuantumCircuit:
+    rng = np.random.default_rng(seed)
+
+    circuit = QuantumCircuit().add(Qubits(num_qubits))
+    for kind, a, b in zip(
+        rng.integers(0, 4, num_gates).tolist(),
+        rng.integers(0, num_qubits, num_gates).tolist(),
+        rng.integers(0, num_qubits, num_gates).tolist(),
+    ):
+        if a == b or kind == 0:
+            circuit.add(Hadamard(a))
+        elif kind == 1:
+            circuit.add(S(a))
+        elif kind == 2:
+            circuit.add(CNOT(a, b))
+        else:
+            circuit.add(Cz(a, b))
+
+    return circuit.add(Measure(list(range(num_qubits))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[1000, 2000, 4000])
+    parser.add_argument("--shots", type=int, default=10000)
+    args = parser.parse_args()
+
+    provider = StabilizerProvider(seed=0)
+    print(
+        "{:<8} {:>7} {:>7} {:>9} {:>10} {:>9}".format("circuit", "qubits", "gates", "gates s", "sample s", "outcomes")
+    )
+    for num_qubits in args.qubits:
+        for name, circuit in [("ghz", ghz(num_qubits)), ("random", random_clifford(num_qubits, 10 * num_qubits))]:
+            start = time.perf_counter()
+            tableau = provider.tableau(circuit)
+            gates_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            counts = tableau.sample(list(range(num_qubits)), args.shots, provider.rng)
+            sample_seconds = time.perf_counter() - start
+
+            print(
+                "{:<8} {:>7} {:>7} {:>9.2f} {:>10.2f} {:>9}".format(
+                    name, num_qubits, len(circuit.layers) - 2, gates_seconds, sample_seconds, len(counts)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
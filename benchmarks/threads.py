@@ -0,0 +1,80 @@
+"""Measures how statevector simulation scales with the number of threads, on QFT and random circuits.
+
+Usage: python benchmarks/threads.py [--qubits 20 24 28] [--threads 1 2 4 8] [--precision complex64]
+
+Every gate is applied to independent slabs of the state from a thread pool, see ``shor.utils.statevector.evolve``.
+The speedup is relative to one thread, the thread counts default to powers of two up to the number of cores.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from shor.gates import CNOT, SWAP, CRk, Hadamard, Rx, Rz
+from shor.utils.statevector import evolve
+
+
+def qft_gates(num_qubits: int):
+    """The QFT as Hadamards, controlled phases and the final qubit reversal."""
+    gates = []
+    for target in range(num_qubits):
+        gates.append(Hadamard(target))
+        for control in range(target + 1, num_qubits):
+            gates.append(CRk(control, target, k=control - target + 1))
+    for q in range(num_qubits // 2):
+        gates.append(SWAP(q, num_qubits - 1 - q))
+
+    return gates
+
+
+def random_gates(num_qubits: int, depth: int = 10, seed: int = 0):
+    rng = np.random.default_rng(seed)
+
+    gates = []
+    for _ in range(depth):
+        for q in range(num_qubits):
+            gates.append(Rx(q, angle=rng.uniform(0, 2 * np.pi)))
+            gates.append(Rz(q, angle=rng.uniform(0, 2 * np.pi)))
+        for q in range(int(rng.integers(0, 2)), num_qubits - 1, 2):
+            gates.append(CNOT(q, q + 1))
+
+    return gates
+
+
+def time_evolve(gates, num_qubits: int, num_threads: int, precision: str) -> float:
+    state = np.zeros((2,) * num_qubits, dtype=precision)
+    state[(0,) * num_qubits] = 1
+
+    start = time.perf_counter()
+    evolve(state, gates, num_threads)
+    return time.perf_counter() - start
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[20, 24])
+    parser.add_argument("--threads", type=int, nargs="+", default=[2 ** i for i in range(cores.bit_length())])
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--precision", default="complex64")
+    args = parser.parse_args()
+
+    print("{} cores".format(cores))
+    print("{:<8} {:>7} {:>8} {:>9} {:>8}".format("circuit", "qubits", "threads", "seconds", "speedup"))
+    for num_qubits in args.qubits:
+        circuits = [("qft", qft_gates(num_qubits)), ("random", random_gates(num_qubits, args.depth))]
+        for name, gates in circuits:
+            baseline = None
+            for num_threads in args.threads:
+                seconds = time_evolve(gates, num_qubits, num_threads, args.precision)
+                baseline = baseline or seconds
+                print(
+                    "{:<8} {:>7} {:>8} {:>9.2f} {:>8.2f}".format(
+                        name, num_qubits, num_threads, seconds, baseline / seconds
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from collections.abc import Sequence
+from numbers import Real
+from typing import Dict, List, Union
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import _Gate
+from shor.layers import Qbits, _Layer
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.quantum import QuantumCircuit
+
+# Gate classes get an opcode the first time a CompactCircuit stores one, other layer classes map to OBJECT
+_GATE_CLASSES: List[type] = []
+_OPCODES: Dict[type, int] = {}
+
+# Opcode of layers that are kept as Python objects
+OBJECT = -1
+
+
+class _Column(object):
+    """Growable 1D NumPy array.
+
+    Values are buffered in a list and copied into the array in blocks, the array doubles its capacity when full.
+    """
+
+    __slots__ = ("data", "_size", "_pending")
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, dtype, values=()):
+        self.data = np.empty(max(16, len(values)), dtype=dtype)
+        self.data[: len(values)] = values
+        self._size = len(values)
+        self._pending = []
+
+    def __len__(self):
+        return self._size + len(self._pending)
+
+    def extend(self, values):
+        self._pending.extend(values)
+        if len(self._pending) >= self.BLOCK_SIZE:
+            self.flush()
+
+    def append(self, value):
+        self._pending.append(value)
+        if len(self._pending) >= self.BLOCK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        end = self._size + len(self._pending)
+        if end > len(self.data):
+            self.data = np.resize(self.data, max(end, 2 * len(self.data)))
+
+        self.data[self._size : end] = self._pending
+        self._size = end
+        self._pending = []
+
+    @property
+    def array(self) -> np.ndarray:
+        self.flush()
+        return self.data[: self._size]
+
+
+class CompactLayers(Sequence):
+    """Read-only view of a CompactCircuit's layers, gates are materialized one at a time as they are accessed."""
+
+    def __init__(self, circuit: "CompactCircuit"):
+        self.circuit = circuit
+
+    def __len__(self):
+        return len(self.circuit._opcodes)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.circuit._layer(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("layer index out of range")
+
+        return self.circuit._layer(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.circuit._layer(i)
+
+    def __repr__(self):
+        return "CompactLayers({} layers)".format(len(self))
+
+
+class CompactCircuit(QuantumCircuit):
+    """QuantumCircuit which stores its gates as opcodes, qubit indices and parameters in NumPy arrays.
+
+    A gate costs a few dozen bytes instead of a Python object, and gate objects are only created again when the
+    circuit's layers are accessed. Gates with Parameters, operations (e.g. Measure), registers and gates defined
+    outside shor.gates are kept as objects.
+
+    ``layers`` is a read-only view, add layers with ``add``.
+
+    # Properties
+    opcodes = index into the gate class table per layer, -1 for layers kept as objects.
+    qubit_offsets / parameter_offsets = layer i acts on qubits[qubit_offsets[i]:qubit_offsets[i + 1]] and has
+        parameters[parameter_offsets[i]:parameter_offsets[i + 1]].
+    """
+
+    def __init__(self):
+        self._opcodes = _Column(np.int16)
+        self._qubits = _Column(np.int32)
+        self._qubit_offsets = _Column(np.int64, [0])
+        self._parameters = _Column(np.float64)
+        self._parameter_offsets = _Column(np.int64, [0])
+        self._objects: Dict[int, _Layer] = {}
+        self._layers = CompactLayers(self)
+        self._reset_fingerprint()
+
+    @property
+    def layers(self) -> CompactLayers:
+        return self._layers
+
+    @property
+    def opcodes(self) -> np.ndarray:
+        return self._opcodes.array
+
+    @property
+    def qubits(self) -> np.ndarray:
+        return self._qubits.array
+
+    @property
+    def qubit_offsets(self) -> np.ndarray:
+        return self._qubit_offsets.array
+
+    @property
+    def parameters_array(self) -> np.ndarray:
+        return self._parameters.array
+
+    @property
+    def parameter_offsets(self) -> np.ndarray:
+        return self._parameter_offsets.array
+
+    @staticmethod
+    def gate_class(opcode: int) -> type:
+        return _GATE_CLASSES[opcode]
+
+    def add(self, layer_or_circuit: Union[_Layer, QuantumCircuit]):
+        if isinstance(layer_or_circuit, _Layer):
+            layers = [layer_or_circuit]
+        elif isinstance(layer_or_circuit, QuantumCircuit):
+            layers = layer_or_circuit.layers
+        else:
+            raise TypeError("QuantumCircuit class cannot add the type: {}".format(type(layer_or_circuit)))
+
+        for layer in layers:
+            # Hash from the object we already have, rather than materializing it again later
+            self._hash_layer(layer)
+            self._store(layer)
+            self._hashed_layers += 1
+
+        return self
+
+    def _store(self, layer: _Layer):
+        opcode = _OPCODES.get(type(layer))
+        if opcode is None:
+            opcode = _register(type(layer))
+
+        parameters = layer.parameters if opcode != OBJECT else ()
+        if opcode == OBJECT or layer.name != "Layer" or not all(isinstance(p, Real) for p in parameters):
+            opcode = OBJECT
+            self._objects[len(self._opcodes)] = layer
+        else:
+            self._qubits.extend(layer.qbits)
+            self._parameters.extend(parameters)
+
+        self._opcodes.append(opcode)
+        self._qubit_offsets.append(len(self._qubits))
+        self._parameter_offsets.append(len(self._parameters))
+
+    def _layer(self, i: int) -> _Layer:
+        if i in self._objects:
+            return self._objects[i]
+
+        qubit_offsets, parameter_offsets = self.qubit_offsets, self.parameter_offsets
+        gate_class = _GATE_CLASSES[self.opcodes[i]]
+        qbits = self.qubits[qubit_offsets[i] : qubit_offsets[i + 1]].tolist()
+        values = self.parameters_array[parameter_offsets[i] : parameter_offsets[i + 1]].tolist()
+
+        return gate_class(*qbits, **dict(zip(gate_class.parameter_names, values)))
+
+    # Registers, measurements and parameterized gates are always kept as objects, so these skip the gates
+
+    def initial_state(self) -> List[int]:
+        initial_qubits = []
+        for qbit_layer in filter(lambda layer: type(layer) is Qbits, self._objects.values()):
+            initial_qubits.extend([qbit_layer.state] * qbit_layer.num)
+
+        return initial_qubits
+
+    def measure_bits(self):
+        measure_bits = []
+        for m in filter(lambda layer: type(layer) is Measure, self._objects.values()):
+            measure_bits.extend(m.qbits)
+
+        if not measure_bits:
+            raise CircuitError("No measurement found. Valid quantum circuits must contain a 'Measurement' operation")
+
+        return measure_bits
+
+    @property
+    def parameters(self) -> List[Parameter]:
+        parameters = []
+        for layer in filter(lambda layer: isinstance(layer, _Gate), self._objects.values()):
+            parameters.extend(p for p in layer.free_parameters if p not in parameters)
+
+        return parameters
+
+    def bind(self, bindings) -> "CompactCircuit":
+        bound = CompactCircuit()
+        for layer in self.layers:
+            bound.add(layer.bind(bindings) if isinstance(layer, _Gate) else layer)
+
+        return bound
+
+
+def _register(layer_class: type) -> int:
+    # Only gates which shor.gates can rebuild from their class, qubits and numeric parameters get an opcode
+    if issubclass(layer_class, _Gate) and layer_class.__module__ == _Gate.__module__:
+        _OPCODES[layer_class] = len(_GATE_CLASSES)
+        _GATE_CLASSES.append(layer_class)
+    else:
+        _OPCODES[layer_class] = OBJECT
+
+    return _OPCODES[layer_class]
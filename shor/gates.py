@@ -1,14 +1,68 @@
+import copy
 import math
-from typing import Iterable, Union
+from typing import Iterable, List, Union
 
 import numpy as np
 
 from shor.errors import CircuitError
 from shor.layers import _Layer
-from shor.utils.collections import flatten
+from shor.parameters import Parameter, is_parameter
+from shor.utils.collections import LRUCache, flatten
 
 QbitOrIterable = Union[int, Iterable]
 
+# Canonical gate matrices, keyed by gate class, dimension, parameters and dtype.
+MATRIX_CACHE_SIZE = 4096
+_MATRIX_CACHE = LRUCache(MATRIX_CACHE_SIZE)
+
+
+def gate_matrix(gate: "_Gate", dtype="complex128") -> np.ndarray:
+    """Returns the gate's matrix as a read-only array of the given dtype.
+
+    Matrices are memoized, so gates that share a class and parameters share one array. Only classes whose
+    matrix is determined by their parameters are memoized, see ``_is_cacheable``.
+    """
+    if gate.free_parameters:
+        raise CircuitError(
+            "The '{}' gate has unbound parameters {}, bind them first".format(gate.symbol, gate.free_parameters)
+        )
+
+    dtype = np.dtype(dtype)
+    if not _is_cacheable(gate.__class__):
+        return _build_matrix(gate, dtype)
+
+    key = (gate.__class__, gate.dimension, gate.parameters, dtype.str)
+    try:
+        matrix = _MATRIX_CACHE.get(key)
+    except TypeError:
+        # Unhashable parameters, build the matrix without caching it
+        return _build_matrix(gate, dtype)
+
+    if matrix is None:
+        matrix = _build_matrix(gate, dtype)
+        _MATRIX_CACHE[key] = matrix
+
+    return matrix
+
+
+def _build_matrix(gate: "_Gate", dtype: np.dtype) -> np.ndarray:
+    matrix = np.array(gate.to_matrix(), dtype=dtype)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _is_cacheable(cls: type) -> bool:
+    """Whether the class's parameters fully describe its matrix: shor's own gates, and gates declaring their
+    ``parameter_names``. Other subclasses may keep undeclared state (an angle, a matrix) the cache key can't see.
+    """
+    return cls.__module__ == __name__ or "parameter_names" in cls.__dict__
+
+
+def controlled_phase_matrix(angle) -> np.ndarray:
+    """diag(1, 1, 1, e^(i * angle)), built from the outer product of the control and target bits."""
+    bits = np.arange(2)
+    return np.diag(np.exp(1j * angle * np.outer(bits, bits).ravel()))
+
 
 class _Gate(_Layer):
     """Abstract base quantum gate class
@@ -16,8 +70,15 @@ class _Gate(_Layer):
     # Properties
     input_length = valid length of input qubits
     qubits = indices of qubits, to be used as input to gate.
+    parameter_names = names of the attributes holding the gate's parameters.
+    is_diagonal = whether the gate's matrix is diagonal, simulators apply those as element-wise phases.
     """
 
+    __slots__ = ("qbits", "dimension")
+
+    parameter_names = ()
+    is_diagonal = False
+
     @property
     def symbol(self):
         return self.__class__.__name__.lower()
@@ -42,8 +103,10 @@ class _Gate(_Layer):
 
     def to_gates(self):
         if len(self.qbits) > self.dimension:
+            parameters = dict(zip(self.parameter_names, self.parameters))
             return [
-                self.__class__(self.qbits[i : i + self.dimension]) for i in range(0, len(self.qbits), self.dimension)
+                self.__class__(self.qbits[i : i + self.dimension], **parameters)
+                for i in range(0, len(self.qbits), self.dimension)
             ]
         return [self]
 
@@ -51,12 +114,36 @@ class _Gate(_Layer):
     def num_states(self):
         return np.power(2, self.dimension)
 
+    @property
+    def parameters(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.parameter_names)
+
+    @property
+    def free_parameters(self) -> List[Parameter]:
+        return [p for p in self.parameters if is_parameter(p)]
+
+    def bind(self, bindings) -> "_Gate":
+        """Returns a copy of the gate with its Parameters replaced by their bound values."""
+        if not self.free_parameters:
+            return self
+
+        gate = copy.copy(self)
+        for name, value in zip(self.parameter_names, self.parameters):
+            if is_parameter(value):
+                setattr(gate, name, value.resolve(bindings))
+
+        return gate
+
     def to_matrix(self) -> np.ndarray:
-        return np.eye(self.num_states())
+        return np.eye(self.num_states)
 
     @property
     def matrix(self):
-        return self.to_matrix()
+        return gate_matrix(self)
+
+    @property
+    def diagonal(self) -> np.ndarray:
+        return np.diagonal(self.matrix)
 
     def invert(self):
         return self
@@ -70,6 +157,7 @@ class _Gate(_Layer):
 
 
 class CNOT(_Gate):
+    __slots__ = ()
     symbol = "CX"
 
     def __init__(self, *qubits, **kwargs):
@@ -85,6 +173,7 @@ class CNOT(_Gate):
 
 
 class CY(_Gate):
+    __slots__ = ()
     symbol = "CY"
 
     def __init__(self, *qubits, **kwargs):
@@ -100,6 +189,7 @@ class CY(_Gate):
 
 
 class CSWAP(_Gate):
+    __slots__ = ()
     symbol = "CSWAP"
 
     def __init__(self, *qubits, **kwargs):
@@ -117,6 +207,7 @@ class CSWAP(_Gate):
 
 
 class Hadamard(_Gate):
+    __slots__ = ()
     symbol = "H"
 
     def __init__(self, *qubits, **kwargs):
@@ -131,6 +222,7 @@ class Hadamard(_Gate):
 
 
 class PauliX(_Gate):
+    __slots__ = ()
     symbol = "X"
 
     def __init__(self, *qubits, **kwargs):
@@ -146,6 +238,7 @@ class PauliX(_Gate):
 
 
 class PauliY(_Gate):
+    __slots__ = ()
     symbol = "Y"
 
     def __init__(self, *qubits, **kwargs):
@@ -161,6 +254,8 @@ class PauliY(_Gate):
 
 
 class PauliZ(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "Z"
 
     def __init__(self, *qubits, **kwargs):
@@ -176,6 +271,8 @@ class PauliZ(_Gate):
 
 
 class QFT(_Gate):
+    __slots__ = ()
+
     def __init__(self, *qubits, **kwargs):
         if not qubits:
             qubits = [0, 1]
@@ -190,18 +287,15 @@ class QFT(_Gate):
         return np.exp((2j * np.pi * k) / self.num_states)
 
     def to_matrix(self) -> np.ndarray:
-        m = np.array(np.ones((self.num_states, self.num_states)), dtype="complex")
-
-        for i in range(1, self.num_states):
-            for j in range(i, self.num_states):
-                w = self.get_nth_unity_root(i * j)
-                m[i, j] = w
-                m[j, i] = w
+        indices = np.arange(self.num_states)
+        # Reducing the exponent modulo 2^k keeps the angles small and the roots of unity accurate
+        m = self.get_nth_unity_root(np.outer(indices, indices) % self.num_states)
 
         return np.around(np.multiply(1 / np.sqrt(self.num_states), m), decimals=15)
 
 
 class SWAP(_Gate):
+    __slots__ = ()
     symbol = "SWAP"
 
     def __init__(self, *qubits, **kwargs):
@@ -217,6 +311,7 @@ class SWAP(_Gate):
 
 
 class Cx(_Gate):
+    __slots__ = ()
     symbol = "CX"
 
     def __init__(self, *qubits, **kwargs):
@@ -232,6 +327,7 @@ class Cx(_Gate):
 
 
 class CCNOT(_Gate):
+    __slots__ = ()
     symbol = "CCX"
 
     def __init__(self, *qubits, **kwargs):
@@ -258,7 +354,10 @@ class CCNOT(_Gate):
 
 
 class CRZ(_Gate):
+    __slots__ = ("angle",)
+    is_diagonal = True
     symbol = "CRZ"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle=0, **kwargs):
         kwargs["dimension"] = 2
@@ -280,6 +379,7 @@ class CRZ(_Gate):
 
 
 class CH(_Gate):
+    __slots__ = ()
     symbol = "CH"
 
     def __init__(self, *qubits, **kwargs):
@@ -302,6 +402,8 @@ class CH(_Gate):
 
 
 class S(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "S"
 
     def __init__(self, *qubits, **kwargs):
@@ -317,6 +419,8 @@ class S(_Gate):
 
 
 class Sdg(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "Sdg"
 
     def __init__(self, *qubits, **kwargs):
@@ -332,6 +436,8 @@ class Sdg(_Gate):
 
 
 class T(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "T"
 
     def __init__(self, *qubits, **kwargs):
@@ -347,6 +453,8 @@ class T(_Gate):
 
 
 class Tdg(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "Tdg"
 
     def __init__(self, *qubits, **kwargs):
@@ -362,6 +470,8 @@ class Tdg(_Gate):
 
 
 class ID(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "I"
 
     def __init__(self, *qubits, **kwargs):
@@ -377,7 +487,10 @@ class ID(_Gate):
 
 
 class U1(_Gate):
+    __slots__ = ("angle",)
+    is_diagonal = True
     symbol = "U1"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle=0, **kwargs):
         kwargs["dimension"] = 1
@@ -392,6 +505,8 @@ class U1(_Gate):
 
 
 class Cz(_Gate):
+    __slots__ = ()
+    is_diagonal = True
     symbol = "CZ"
 
     def __init__(self, *qubits, **kwargs):
@@ -407,7 +522,9 @@ class Cz(_Gate):
 
 
 class Rx(_Gate):
+    __slots__ = ("angle",)
     symbol = "RX"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle=math.pi / 2, **kwargs):
         kwargs["dimension"] = 1
@@ -427,7 +544,9 @@ class Rx(_Gate):
 
 
 class Ry(_Gate):
+    __slots__ = ("angle",)
     symbol = "RY"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle=math.pi / 2, **kwargs):
         kwargs["dimension"] = 1
@@ -447,7 +566,10 @@ class Ry(_Gate):
 
 
 class Rz(_Gate):
+    __slots__ = ("angle",)
+    is_diagonal = True
     symbol = "RZ"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle, **kwargs):
         self.angle = angle
@@ -463,7 +585,9 @@ class Rz(_Gate):
 
 
 class U3(_Gate):
+    __slots__ = ("theta", "phi", "lam")
     symbol = "U3"
+    parameter_names = ("theta", "phi", "lam")
 
     def __init__(self, *qubits, theta=0, phi=0, lam=0, **kwargs):
         kwargs["dimension"] = 1
@@ -489,14 +613,17 @@ class U3(_Gate):
 
 
 class U2(U3):
+    __slots__ = ()
     symbol = "U2"
+    parameter_names = ("phi", "lam")
 
     def __init__(self, *qubits, phi=0, lam=0, **kwargs):
         super().__init__(*qubits, theta=np.pi / 2, phi=phi, lam=lam, **kwargs)
-        self.symbol = "u2"
 
 
 class Init_x(_Gate):
+    __slots__ = ("H",)
+
     def __init__(self, *qubits, **kwargs):
         self.H = Hadamard(0)
         kwargs["dimension"] = 1
@@ -507,6 +634,8 @@ class Init_x(_Gate):
 
 
 class Init_y(_Gate):
+    __slots__ = ("H", "S")
+
     def __init__(self, *qubits, **kwargs):
         self.H = Hadamard(0)
         self.S = S()
@@ -518,7 +647,10 @@ class Init_y(_Gate):
 
 
 class Cr(_Gate):
+    __slots__ = ("angle",)
+    is_diagonal = True
     symbol = "CU1"
+    parameter_names = ("angle",)
 
     def __init__(self, *qubits, angle, **kwargs):
         self.angle = angle
@@ -528,10 +660,14 @@ class Cr(_Gate):
         super().__init__(*qubits, **kwargs)
 
     def to_matrix(self) -> np.ndarray:
-        return np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, np.exp(1j * self.angle)]], dtype="complex")
+        return controlled_phase_matrix(self.angle)
 
 
 class CRk(_Gate):
+    __slots__ = ("k",)
+    is_diagonal = True
+    parameter_names = ("k",)
+
     def __init__(self, *qubits, k, **kwargs):
         self.k = k
         kwargs["dimension"] = 2
@@ -540,9 +676,7 @@ class CRk(_Gate):
         super().__init__(*qubits, **kwargs)
 
     def to_matrix(self) -> np.ndarray:
-        return np.array(
-            [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, np.exp(2 * 1j * np.pi / 2 ** self.k)]], dtype="complex"
-        )
+        return controlled_phase_matrix(2 * np.pi / 2 ** self.k)
 
 
 # Aliases
@@ -4,6 +4,8 @@ from collections import Iterable
 class _Layer(object):
     """Abstract base quantum layer class"""
 
+    __slots__ = ("name",)
+
     def __init__(self, **kwargs):
         self.name = kwargs.get("name", "Layer")
         pass
@@ -13,6 +15,8 @@ class _Layer(object):
 
 
 class Qbits(_Layer, Iterable):
+    __slots__ = ("num", "state", "_qbits")
+
     def __init__(self, num, state=0, **kwargs):
         self.num = num
         self.state = state
@@ -0,0 +1,229 @@
+from numbers import Number
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.utils.collections import LRUCache
+from shor.utils.precision import get_precision
+
+PAULIS = "IXYZ"
+_PAULI_FROM_BITS = {(0, 0): "I", (1, 0): "X", (1, 1): "Y", (0, 1): "Z"}
+
+# Final states of recently evaluated circuits, keyed by fingerprint and precision, so many observables share one
+# simulation
+STATE_CACHE_SIZE = 4
+_STATE_CACHE = LRUCache(STATE_CACHE_SIZE)
+
+
+class PauliString(object):
+    """A tensor product of Pauli operators with a coefficient, e.g. ``0.5 * PauliString("XIZ")``.
+
+    paulis is either a string whose i-th character is the Pauli acting on qubit i, or a mapping from qubits to
+    Paulis, e.g. ``PauliString({0: "X", 2: "Z"})``. Qubits not mentioned are acted on by the identity.
+
+    # Properties
+    x_mask / z_mask = bit q is set when qubit q is acted on by X or Y / Z or Y, since Y = iXZ.
+    """
+
+    __slots__ = ("x_mask", "z_mask", "coefficient")
+
+    def __init__(self, paulis: Union[str, Mapping[int, str]] = "", coefficient: Number = 1):
+        if isinstance(paulis, str):
+            paulis = dict(enumerate(paulis))
+
+        self.x_mask = 0
+        self.z_mask = 0
+        self.coefficient = coefficient
+
+        for qubit, pauli in paulis.items():
+            pauli = pauli.upper()
+            if pauli not in PAULIS:
+                raise CircuitError("Unknown Pauli '{}', expected one of {}".format(pauli, PAULIS))
+            if pauli in "XY":
+                self.x_mask |= 1 << qubit
+            if pauli in "ZY":
+                self.z_mask |= 1 << qubit
+
+    @property
+    def paulis(self) -> Dict[int, str]:
+        paulis = {}
+        for qubit in range(max(self.x_mask, self.z_mask).bit_length()):
+            pauli = _PAULI_FROM_BITS[self.x_mask >> qubit & 1, self.z_mask >> qubit & 1]
+            if pauli != "I":
+                paulis[qubit] = pauli
+
+        return paulis
+
+    @property
+    def num_qubits(self) -> int:
+        """Number of qubits the string needs, i.e. the highest qubit acted on + 1."""
+        return max(self.x_mask, self.z_mask).bit_length()
+
+    def __mul__(self, other: Number) -> "PauliString":
+        if not isinstance(other, Number):
+            return NotImplemented
+
+        scaled = PauliString(coefficient=self.coefficient * other)
+        scaled.x_mask, scaled.z_mask = self.x_mask, self.z_mask
+        return scaled
+
+    __rmul__ = __mul__
+
+    def __add__(self, other: Union["PauliString", "PauliSum"]) -> "PauliSum":
+        return PauliSum([self]) + other
+
+    def __repr__(self):
+        label = "".join(self.paulis.get(q, "I") for q in range(self.num_qubits)) or "I"
+        return "{} * PauliString({})".format(self.coefficient, label)
+
+
+class PauliSum(object):
+    """A weighted sum of PauliStrings, e.g. a Hamiltonian. ``PauliString + PauliString`` builds one."""
+
+    def __init__(self, terms: Iterable[PauliString] = ()):
+        self.terms: List[PauliString] = list(terms)
+
+    def __add__(self, other: Union[PauliString, "PauliSum"]) -> "PauliSum":
+        if isinstance(other, PauliString):
+            return PauliSum(self.terms + [other])
+        if isinstance(other, PauliSum):
+            return PauliSum(self.terms + other.terms)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Number) -> "PauliSum":
+        return PauliSum(term * other for term in self.terms)
+
+    __rmul__ = __mul__
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __iter__(self):
+        return iter(self.terms)
+
+    @property
+    def num_qubits(self) -> int:
+        return max((term.num_qubits for term in self.terms), default=0)
+
+    def __repr__(self):
+        return " + ".join(map(repr, self.terms)) or "PauliSum([])"
+
+
+Observable = Union[PauliString, PauliSum]
+
+
+def expectation(state: np.ndarray, observable: Observable):
+    """<psi|O|psi> for a state given as a (2,) * n tensor (axis i = qubit i) or a little endian vector.
+
+    Terms are grouped by their X mask. Per group, conj(psi[b ^ x]) * psi[b] is computed once from a flipped view
+    of the state, and every Z mask of the group is then the sum of it signed by the parity of b & z. Large groups
+    are evaluated for all Z masks at once by a Walsh-Hadamard transform. Returns a float when all coefficients are
+    real.
+    """
+    terms = [observable] if isinstance(observable, PauliString) else list(observable)
+    psi = little_endian_vector(state)
+    num_qubits = psi.size.bit_length() - 1
+
+    if any(term.num_qubits > num_qubits for term in terms):
+        raise CircuitError(
+            "The observable acts on {} qubits, the state has {}".format(
+                max(term.num_qubits for term in terms), num_qubits
+            )
+        )
+
+    groups: Dict[int, List[PauliString]] = {}
+    for term in terms:
+        groups.setdefault(term.x_mask, []).append(term)
+
+    # Axis a of the reshaped state is qubit n - 1 - a, flipping the axes of the X qubits maps psi[b] to psi[b ^ x]
+    tensor = psi.reshape((2,) * num_qubits)
+    total = 0j
+    for x_mask, group in groups.items():
+        if x_mask:
+            flipped = np.flip(tensor, [num_qubits - 1 - q for q in range(num_qubits) if x_mask >> q & 1])
+            overlap = (np.conj(flipped) * tensor).reshape(-1)
+        else:
+            overlap = np.square(psi.real) + np.square(psi.imag)
+
+        z_masks = np.array([term.z_mask for term in group], dtype=np.int64)
+        if len(group) > num_qubits:
+            values = walsh_hadamard(overlap)[z_masks]
+        else:
+            values = np.array([signed_sum(overlap, z) for z in z_masks.tolist()])
+
+        # Y = iXZ, so each Y contributes a factor of i
+        num_y = np.array([bin(x_mask & z).count("1") for z in z_masks.tolist()])
+        coefficients = np.array([term.coefficient for term in group], dtype=complex)
+        total += np.sum(coefficients * 1j ** num_y * values)
+
+    if all(np.isreal(term.coefficient) for term in terms):
+        return float(total.real)
+    return complex(total)
+
+
+def expectation_values(state: np.ndarray, observables: Sequence[Observable]) -> np.ndarray:
+    return np.array([expectation(state, observable) for observable in observables])
+
+
+def circuit_expectation(circuit, observable: Union[Observable, Sequence[Observable]]):
+    """Exact expectation value(s) of observable(s) in the circuit's final state, measurements are ignored.
+
+    The final state is cached by circuit fingerprint and precision, so evaluating many observables simulates the
+    circuit once.
+    """
+    precision = get_precision()
+    key = (circuit.fingerprint, precision.str)
+    psi = _STATE_CACHE.get(key)
+    if psi is None:
+        from shor.utils.statevector import simulate
+
+        psi = little_endian_vector(simulate(circuit, precision=precision))
+        psi.flags.writeable = False
+        _STATE_CACHE[key] = psi
+
+    if isinstance(observable, (PauliString, PauliSum)):
+        return expectation(psi, observable)
+    return expectation_values(psi, observable)
+
+
+def little_endian_vector(state: np.ndarray) -> np.ndarray:
+    """Flattens a (2,) * n state tensor so that bit q of an index is qubit q, vectors are returned as they are."""
+    if state.ndim == 1:
+        return state
+    return np.transpose(state).reshape(-1)
+
+
+def signed_sum(values: np.ndarray, z_mask: int) -> complex:
+    """Sum over b of values[b] * (-1)^parity(b & z).
+
+    The vector is folded one qubit at a time: entries with bit q set are subtracted from those without it when q is
+    in z, and added to them otherwise.
+    """
+    num_qubits = values.size.bit_length() - 1
+    folded = values.reshape((2,) * num_qubits)
+
+    # Axis 0 is always the highest remaining qubit
+    for qubit in range(num_qubits - 1, -1, -1):
+        folded = folded[0] - folded[1] if z_mask >> qubit & 1 else folded[0] + folded[1]
+
+    return complex(folded)
+
+
+def walsh_hadamard(values: np.ndarray) -> np.ndarray:
+    """Unnormalized Walsh-Hadamard transform: result[z] = sum over b of values[b] * (-1)^parity(b & z)."""
+    num_qubits = values.size.bit_length() - 1
+    result = np.array(values, dtype=complex).reshape((2,) * num_qubits)
+
+    for axis in range(num_qubits):
+        zero = [slice(None)] * num_qubits
+        one = [slice(None)] * num_qubits
+        zero[axis], one[axis] = 0, 1
+
+        a, b = result[tuple(zero)].copy(), result[tuple(one)]
+        result[tuple(zero)] += b
+        result[tuple(one)] = a - b
+
+    return result.reshape(-1)
@@ -15,6 +15,8 @@ class _Operation(_Layer):
     - Logic conditioned on measurement
     """
 
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -23,6 +25,7 @@ class _Operation(_Layer):
 
 
 class Measure(_Operation):
+    __slots__ = ("qbits", "bits")
     symbol = "measure"
 
     def __init__(self, *qbits, output_bits=None, axis="z", **kwargs):
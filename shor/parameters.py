@@ -0,0 +1,31 @@
+from typing import Any, Mapping, Union
+
+from shor.errors import CircuitError
+
+
+class Parameter(object):
+    """Placeholder for a numeric gate parameter, e.g. ``Rx(0, angle=Parameter("theta"))``.
+
+    Circuits containing parameters are templates: bind values with ``QuantumCircuit.bind`` or run many values at
+    once with ``Provider.run_sweep``. Bindings map either the Parameter itself or its name to a value.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def resolve(self, bindings: Mapping[Union["Parameter", str], Any]):
+        if self in bindings:
+            return bindings[self]
+        if self.name in bindings:
+            return bindings[self.name]
+
+        raise CircuitError("No value bound for parameter '{}'".format(self.name))
+
+    def __repr__(self):
+        return "Parameter({})".format(self.name)
+
+
+def is_parameter(value) -> bool:
+    return isinstance(value, Parameter)
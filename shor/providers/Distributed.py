@@ -0,0 +1,53 @@
+import os
+
+from shor.quantum import QC
+from shor.utils.distributed import DistributedStatevector
+from shor.utils.partition import PartitionedProvider
+from shor.utils.statevector import num_circuit_qubits
+
+
+class DistributedProvider(PartitionedProvider):
+    """Statevector simulator which splits the state across worker processes.
+
+    Each of the 2^g workers holds 2^(n - g) amplitudes in shared memory and applies the gates on its local qubits
+    on its own, gates mixing one of the g global qubits first swap it with a local qubit by a pairwise exchange
+    between workers, see ``shor.utils.distributed.DistributedStatevector``. Needs Python 3.8 or later, for
+    ``multiprocessing.shared_memory``.
+
+    # Config
+    seed = seed for the measurement sampler.
+    num_workers = number of worker processes, a power of 2. Defaults to the largest power of 2 up to the number
+        of cores.
+    transport = how workers exchange amplitudes: "shared_memory" (default), "socket" to go through TCP connections
+        as separate nodes would, or a ``shor.utils.distributed.Transport``.
+    lookahead = gates scanned ahead when picking which local qubit a global one is swapped with.
+    max_diagonal_qubits = runs of diagonal gates over up to this many qubits are folded into one, 0 disables it.
+    precision = "complex64" or "complex128", defaults to the global precision.
+    progress = called with the IOStats of the running simulation after every pass.
+    context = multiprocessing start method of the workers, e.g. "fork" or "spawn".
+
+    # Properties
+    stats = IOStats of the last run, bytes_exchanged counts the amplitudes sent between workers.
+    """
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.num_workers = config.get("num_workers", 2 ** ((os.cpu_count() or 1).bit_length() - 1))
+        self.transport = config.get("transport", "shared_memory")
+        self.context = config.get("context", None)
+
+    def state(self, circuit: QC) -> DistributedStatevector:
+        """Starts the workers holding the circuit's initial state, close it (or use it as a context manager)."""
+        num_qubits = num_circuit_qubits(circuit)
+        initial_state = circuit.initial_state()
+
+        return DistributedStatevector(
+            num_qubits,
+            initial_state + [0] * (num_qubits - len(initial_state)),
+            num_workers=self.num_workers,
+            transport=self.transport,
+            lookahead=self.lookahead,
+            precision=self.precision,
+            progress=self.progress,
+            context=self.context,
+        )
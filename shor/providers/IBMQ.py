@@ -1,32 +1,47 @@
-from typing import List
-
-from qiskit import Aer, QuantumCircuit, execute
+from typing import TYPE_CHECKING, Iterable, List, Mapping
 
+from shor.errors import CircuitError
 from shor.operations import _Operation
+from shor.parameters import Parameter, is_parameter
 from shor.providers.base import Job, Provider, Result
 from shor.quantum import QC
+from shor.utils.collections import LRUCache
 from shor.utils.qbits import int_from_bit_string
 
-DEFAULT_BACKEND = Aer.get_backend("qasm_simulator")
+if TYPE_CHECKING:
+    import qiskit
+
+# Qiskit takes seconds to import, so it is only imported once a circuit is actually converted or run on it
+DEFAULT_BACKEND_NAME = "qasm_simulator"
+
+
+def default_backend():
+    from qiskit import Aer
+
+    return Aer.get_backend(DEFAULT_BACKEND_NAME)
 
 
 class IBMQResult(Result):
-    def __init__(self, ibmq_result):
+    def __init__(self, ibmq_result, experiment=None):
         self.ibmq_result = ibmq_result
+        self.experiment = experiment
 
     @property
     def counts(self):
-        return {int_from_bit_string(k.split(" ")[0]): v for k, v in self.ibmq_result.get_counts().items()}
+        return {
+            int_from_bit_string(k.split(" ")[0]): v for k, v in self.ibmq_result.get_counts(self.experiment).items()
+        }
 
     @property
     def sig_bits(self):
-        measurement_bases = list(self.ibmq_result.get_counts().keys())
+        measurement_bases = list(self.ibmq_result.get_counts(self.experiment).keys())
         return len(measurement_bases[0]) if measurement_bases else 0
 
 
 class IBMQJob(Job):
-    def __init__(self, ibmq_job):
+    def __init__(self, ibmq_job, experiment=None):
         self.ibmq_job = ibmq_job
+        self.experiment = experiment
 
     @property
     def status(self):
@@ -34,12 +49,68 @@ class IBMQJob(Job):
 
     @property
     def result(self) -> IBMQResult:
-        return IBMQResult(self.ibmq_job.result())
+        return IBMQResult(self.ibmq_job.result(), self.experiment)
+
+
+class TranspileCache(object):
+    """LRU cache of shor circuits converted to, and optionally transpiled for a backend as, qiskit circuits.
+
+    Circuits are keyed by their structure (``QuantumCircuit.fingerprint``), so resubmitting an equal circuit skips
+    both the conversion and qiskit's transpiler. The cached qiskit circuits are shared and must not be modified.
+
+    # Properties
+    hits / misses = number of lookups that were / weren't served from the cache, for sizing maxsize.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.hits = 0
+        self.misses = 0
+        self._circuits = LRUCache(maxsize)
+
+    @property
+    def maxsize(self) -> int:
+        return self._circuits.maxsize
+
+    def __len__(self):
+        return len(self._circuits)
+
+    def get(self, circuit: QC, backend=None) -> "qiskit.QuantumCircuit":
+        """The circuit as a qiskit circuit, transpiled for backend unless it is None."""
+        key = (circuit.fingerprint, backend)
+        qiskit_circuit = self._circuits.get(key)
+        if qiskit_circuit is not None:
+            self.hits += 1
+            return qiskit_circuit
+        self.misses += 1
+
+        qiskit_circuit = to_qiskit_circuit(circuit)
+        if backend is not None:
+            from qiskit import transpile
+
+            qiskit_circuit = transpile(qiskit_circuit, backend)
+
+        self._circuits[key] = qiskit_circuit
+        return qiskit_circuit
+
+    def clear(self):
+        self._circuits.clear()
+        self.hits = self.misses = 0
 
 
 class IBMQProvider(Provider):
+    """Runs circuits on a Qiskit backend.
+
+    # Config
+    backend = the Qiskit backend to run on, defaults to Aer's qasm_simulator.
+    transpile = when True, circuits are transpiled for the backend once and cached, instead of by qiskit's
+        ``execute`` on every run.
+    transpile_cache_size = how many converted circuits to keep, 0 disables the cache.
+    """
+
     def __init__(self, **config):
-        self.backend = config.get("backend", DEFAULT_BACKEND)
+        self.backend = config["backend"] if "backend" in config else default_backend()
+        self.transpile = config.get("transpile", False)
+        self.transpile_cache = TranspileCache(config.get("transpile_cache_size", 128))
         # register(config['APItoken'], config['url'])
 
     @property
@@ -47,19 +118,52 @@ class IBMQProvider(Provider):
         return list(map(lambda j: IBMQJob(j), self.backend.get_jobs()))
 
     def run(self, circuit: QC, times: int) -> IBMQJob:
-        job = execute(to_qiskit_circuit(circuit), self.backend, shots=times)
+        if self.transpile:
+            from qiskit import assemble
+
+            qiskit_circuit = self.transpile_cache.get(circuit, self.backend)
+            job = self.backend.run(assemble(qiskit_circuit, self.backend, shots=times))
+        else:
+            from qiskit import execute
+
+            job = execute(self.transpile_cache.get(circuit), self.backend, shots=times)
 
         return IBMQJob(job)
 
+    def run_sweep(self, circuit: QC, bindings: Iterable[Mapping], times: int) -> List[IBMQJob]:
+        """Parameters are matched to the qiskit template's by name, so they must have distinct names."""
+        parameters = circuit.parameters
+        check_parameter_names(parameters)
+
+        from qiskit import assemble
+
+        # Convert and transpile the parameterized template once, then only bind values per experiment
+        template = self.transpile_cache.get(circuit, self.backend)
+        qiskit_parameters = {p.name: p for p in template.parameters}
+
+        experiments = []
+        for binding in bindings:
+            values = {qiskit_parameters[p.name]: p.resolve(binding) for p in parameters}
+            experiments.append(template.bind_parameters(values))
+
+        job = self.backend.run(assemble(experiments, self.backend, shots=times))
+        return [IBMQJob(job, experiment=i) for i in range(len(experiments))]
+
 
-def to_qiskit_circuit(shor_circuit: QC) -> QuantumCircuit:
-    qiskit_circuit = QuantumCircuit(
-        len(shor_circuit.initial_state()),
-        len(shor_circuit.measure_bits()),
-    )
+def to_qiskit_circuit(shor_circuit: QC) -> "qiskit.QuantumCircuit":
+    initial_state = shor_circuit.initial_state()
+    check_initial_state(initial_state)
+    from qiskit import QuantumCircuit
 
+    qiskit_circuit = QuantumCircuit(len(initial_state), len(shor_circuit.measure_bits()))
+    # Qiskit starts every qubit in |0>, qubits starting in |1> are flipped first
+    for qubit, state in enumerate(initial_state):
+        if state == 1:
+            qiskit_circuit.x(qubit)
+
+    parameter_map = {}
     for gate_or_op in shor_circuit.to_gates(include_operations=True):
-        transpile_gate(qiskit_circuit, gate_or_op)
+        transpile_gate(qiskit_circuit, gate_or_op, parameter_map)
 
     return qiskit_circuit
 
@@ -68,8 +172,41 @@ def ibmq_symbol(shor_gate):
     return shor_gate.symbol.lower()
 
 
-def transpile_gate(qiskit_circuit, shor_gate):
+def qiskit_value(value, parameter_map: dict):
+    """Numbers pass through, shor Parameters map to one qiskit Parameter each."""
+    if not is_parameter(value):
+        return value
+
+    if value not in parameter_map:
+        check_parameter_names(list(parameter_map) + [value])
+        from qiskit.circuit import Parameter as QiskitParameter
+
+        parameter_map[value] = QiskitParameter(value.name)
+    return parameter_map[value]
+
+
+def check_initial_state(initial_state: List[int]):
+    unsupported = sorted({state for state in initial_state if state not in (0, 1)})
+    if unsupported:
+        raise CircuitError(
+            "Qubits run on qiskit start in |0> or |1>, got initial states: {}".format(", ".join(map(str, unsupported)))
+        )
+
+
+def check_parameter_names(parameters: List[Parameter]):
+    """Qiskit parameters are identified by name, distinct shor Parameters sharing one would be bound together."""
+    names = [p.name for p in parameters]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise CircuitError(
+            "Parameters run on qiskit need distinct names, several are named: {}".format(", ".join(duplicates))
+        )
+
+
+def transpile_gate(qiskit_circuit, shor_gate, parameter_map: dict = None):
     symbol = ibmq_symbol(shor_gate)
+    if parameter_map is None:
+        parameter_map = {}
 
     if isinstance(shor_gate, _Operation):
         if symbol == "measure":
@@ -85,12 +222,12 @@ def transpile_gate(qiskit_circuit, shor_gate):
     kwargs = {}
 
     if symbol in ["crx", "cry", "crz", "cu1", "rx", "ry", "rz", "u1"]:
-        args.append(shor_gate.angle)
+        args.append(qiskit_value(shor_gate.angle, parameter_map))
     if symbol == "u3":
-        args.append(shor_gate.theta)
+        args.append(qiskit_value(shor_gate.theta, parameter_map))
     if symbol in ["u2", "u3"]:
-        args.append(shor_gate.phi)
-        args.append(shor_gate.lam)
+        args.append(qiskit_value(shor_gate.phi, parameter_map))
+        args.append(qiskit_value(shor_gate.lam, parameter_map))
 
     args.extend(shor_gate.qbits)
     qiskit_circuit.__getattribute__(symbol)(*args, **kwargs)
@@ -0,0 +1,84 @@
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+from shor.providers.base import CompletedJob, Job, Provider, Result
+from shor.quantum import QC
+from shor.utils.mps import MPS, TruncationStats
+from shor.utils.qbits import outcome_index
+from shor.utils.statevector import measured_qubits, num_circuit_qubits
+
+
+class MPSResult(Result):
+    """Measurement counts, keyed by arbitrarily large outcome integers, and the truncation error of the run."""
+
+    def __init__(self, counts: Counter, sig_bits: int, truncation_error: float = 0.0):
+        self._counts = counts
+        self._sig_bits = sig_bits
+        self.truncation_error = truncation_error
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def sig_bits(self):
+        return self._sig_bits
+
+
+class MPSProvider(Provider):
+    """Simulates wide, weakly entangled circuits as a matrix product state, see ``shor.utils.mps.MPS``.
+
+    Memory grows with the number of qubits times the square of the bond dimension, which the entanglement of the
+    state sets, rather than with 2^n: nearest neighbour ansatze or approximate QFTs of a hundred qubits fit easily.
+    Gates on qubits that aren't neighbours on the chain are routed with swaps. Bonds are truncated with an SVD, so
+    a capped bond dimension trades accuracy for speed, and the error given up is reported with every result.
+
+    # Config
+    seed = seed for the measurement sampler.
+    max_bond_dimension = largest bond kept by an SVD, None (the default) keeps every singular value above cutoff.
+    cutoff = squared singular values summing to at most this fraction of the norm are dropped by every SVD.
+    precision = "complex64" or "complex128", defaults to the global precision.
+
+    # Properties
+    stats = TruncationStats of the last run: truncation error, fidelity estimate, largest bond, swaps.
+    """
+
+    def __init__(self, **config):
+        self.seed = config.get("seed", None)
+        self.max_bond_dimension = config.get("max_bond_dimension", None)
+        self.cutoff = config.get("cutoff", 1e-12)
+        self.precision = config.get("precision", None)
+        self.rng = np.random.default_rng(self.seed)
+        self.stats = TruncationStats()
+        self._jobs: List[CompletedJob] = []
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    def state(self, circuit: QC) -> MPS:
+        """The circuit's final state, measurements are ignored."""
+        state = MPS(
+            num_circuit_qubits(circuit),
+            circuit.initial_state(),
+            max_bond_dimension=self.max_bond_dimension,
+            cutoff=self.cutoff,
+            precision=self.precision,
+        )
+        self.stats = state.stats
+        state.apply(circuit.to_gates())
+
+        return state
+
+    def run(self, circuit: QC, times: int) -> CompletedJob:
+        qubits = measured_qubits(circuit)
+        bits = self.state(circuit).sample(qubits, times, self.rng)
+
+        outcomes, counts = np.unique(bits, axis=0, return_counts=True)
+        counts = Counter({outcome_index(outcome): int(count) for outcome, count in zip(outcomes, counts)})
+
+        job = CompletedJob(MPSResult(counts, len(qubits), self.stats.truncation_error))
+        self._jobs.append(job)
+        return job
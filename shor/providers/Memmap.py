@@ -0,0 +1,49 @@
+from shor.quantum import QC
+from shor.utils.memmap import MemmapStatevector
+from shor.utils.partition import PartitionedProvider
+from shor.utils.statevector import num_circuit_qubits
+
+
+class MemmapProvider(PartitionedProvider):
+    """Statevector simulator whose state lives in a file on disk rather than in memory.
+
+    Wide circuits whose state exceeds RAM (e.g. 2^32 complex64 amplitudes = 32 GiB) are simulated through a
+    ``numpy.memmap``, chunk by chunk, see ``shor.utils.memmap.MemmapStatevector``. Gates on the low local_qubits
+    qubits are batched into a single pass over the file, gates mixing higher qubits first swap them in.
+
+    # Config
+    seed = seed for the measurement sampler.
+    local_qubits = qubits held by each in-memory chunk, the chunk is 2^local_qubits amplitudes.
+    max_swap_qubits = qubits a swap pass may exchange at once, it holds 2^max_swap_qubits chunks in memory.
+    lookahead = gates scanned ahead for global qubits to swap in along with the one a gate needs.
+    max_diagonal_qubits = runs of diagonal gates over up to this many qubits are folded into one, 0 disables it.
+    precision = "complex64" or "complex128", defaults to the global precision.
+    directory = where the state file is created, defaults to the system's temporary directory. It's removed after
+        each run.
+    progress = called with the IOStats of the running simulation after every pass over the file.
+
+    # Properties
+    stats = IOStats of the last run: passes over the file, bytes read and written, swaps.
+    """
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.local_qubits = config.get("local_qubits", 20)
+        self.max_swap_qubits = config.get("max_swap_qubits", 2)
+        self.directory = config.get("directory", None)
+
+    def state(self, circuit: QC) -> MemmapStatevector:
+        """Creates the circuit's initial state on disk, close it (or use it as a context manager) to remove it."""
+        num_qubits = num_circuit_qubits(circuit)
+        initial_state = circuit.initial_state()
+
+        return MemmapStatevector(
+            num_qubits,
+            initial_state + [0] * (num_qubits - len(initial_state)),
+            local_qubits=self.local_qubits,
+            max_swap_qubits=self.max_swap_qubits,
+            lookahead=self.lookahead,
+            precision=self.precision,
+            directory=self.directory,
+            progress=self.progress,
+        )
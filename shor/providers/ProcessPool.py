@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Union
+
+import numpy as np
+
+from shor.providers.base import Job, JobStatus, JobStatusCode, Provider, Result
+from shor.providers.registry import resolve_provider
+from shor.quantum import QC
+
+
+def _run_job(provider: Provider, circuit: QC, times: int, seed: np.random.SeedSequence) -> Result:
+    # Every job gets a pickled copy of the provider, reseed it so jobs don't all replay the same samples
+    if hasattr(provider, "rng"):
+        provider.rng = np.random.default_rng(seed)
+
+    return provider.run(circuit, times).result
+
+
+class ProcessPoolJob(Job):
+    def __init__(self, future: Future):
+        self.future = future
+
+    @property
+    def status(self) -> JobStatus:
+        if self.future.cancelled():
+            return JobStatus(JobStatusCode.ERROR, "Job was cancelled")
+        if self.future.running():
+            return JobStatus(JobStatusCode.RUNNING)
+        if not self.future.done():
+            return JobStatus(JobStatusCode.WAITING)
+
+        exception = self.future.exception()
+        if exception is not None:
+            return JobStatus(JobStatusCode.ERROR, repr(exception))
+        return JobStatus(JobStatusCode.COMPLETED)
+
+    @property
+    def result(self) -> Result:
+        return self.future.result()
+
+    async def result_async(self) -> Result:
+        return await asyncio.wrap_future(self.future)
+
+    def wait(self, timeout: float = None) -> Result:
+        """Blocks for at most timeout seconds, raising ``concurrent.futures.TimeoutError`` if the job isn't done."""
+        return self.future.result(timeout)
+
+    def cancel(self) -> bool:
+        """Cancels the job if it hasn't started running yet, returns whether it was cancelled."""
+        return self.future.cancel()
+
+
+class ProcessPoolProvider(Provider):
+    """Runs circuits on another provider from a pool of worker processes.
+
+    ``run`` returns immediately with a ProcessPoolJob, so many circuits (e.g. a parameter scan) run concurrently,
+    one per core. The wrapped provider, given as an instance or a registered name, and the circuits must be picklable.
+
+    # Config
+    max_workers = number of worker processes, defaults to the number of cores.
+    seed = seeds the per-job samplers, for reproducible results.
+    """
+
+    def __init__(self, provider: Union[Provider, str] = None, **config):
+        self.provider = resolve_provider(provider)
+        self.max_workers = config.get("max_workers", None)
+        self.seed_sequence = np.random.SeedSequence(config.get("seed", None))
+
+        self._executor = None
+        self._jobs: List[ProcessPoolJob] = []
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    def run(self, circuit: QC, times: int) -> ProcessPoolJob:
+        seed = self.seed_sequence.spawn(1)[0]
+        job = ProcessPoolJob(self.executor.submit(_run_job, self.provider, circuit, times, seed))
+
+        self._jobs.append(job)
+        return job
+
+    async def run_async(self, circuit: QC, times: int) -> ProcessPoolJob:
+        # Submitting never blocks, await the job's result_async() for the result
+        return self.run(circuit, times)
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -0,0 +1,85 @@
+from collections import Counter
+from typing import List, Sequence
+
+from shor.errors import CircuitError
+from shor.operations import Measure
+from shor.providers.base import CompletedJob, Job, Provider, Result
+from shor.quantum import QC
+from shor.utils.reversible import BasisStates, evaluate, is_reversible, tabulate
+from shor.utils.statevector import measured_qubits, num_circuit_qubits
+
+
+class ReversibleResult(Result):
+    """Measurement counts of a deterministic circuit, a single outcome holding every shot."""
+
+    def __init__(self, counts: Counter, sig_bits: int):
+        self._counts = counts
+        self._sig_bits = sig_bits
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def sig_bits(self):
+        return self._sig_bits
+
+
+class ReversibleProvider(Provider):
+    """Simulates classical reversible circuits (X, CNOT, Cx, CCNOT, SWAP, CSWAP) on computational basis states.
+
+    Such a circuit, e.g. ``quantum_amod_15`` or a modular arithmetic oracle, only permutes basis states, so its
+    action on a basis state is a reversible boolean function. It is evaluated with bitwise operations on bit sliced
+    states, see ``shor.utils.reversible.BitSlicedStates``, for any number of qubits and 64 inputs per word. Besides
+    running circuits, ``evaluate`` and ``tabulate`` map many inputs at once to verify or tabulate an oracle.
+
+    The registry picks this provider for circuits run without one when all of their gates are reversible gates.
+    """
+
+    def __init__(self, **config):
+        self._jobs: List[CompletedJob] = []
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    def evaluate(self, circuit: QC, states: BasisStates) -> BasisStates:
+        """The basis state the circuit maps each basis state to, bit q of each being qubit q.
+
+        Up to 64 qubits, states are a uint64 array, Python ints of any size otherwise.
+        """
+        return evaluate(self._gates(circuit), states, num_circuit_qubits(circuit))
+
+    def tabulate(self, circuit: QC, inputs: Sequence[int] = None, outputs: Sequence[int] = None) -> BasisStates:
+        """Truth table over the input qubits, entry x is the output qubits' value when inputs[j] reads bit j of x.
+
+        Qubits which aren't inputs start in the circuit's initial state. inputs default to every qubit and outputs
+        to the measured qubits, or every qubit when none are measured.
+        """
+        if outputs is None and any(isinstance(layer, Measure) for layer in circuit.layers):
+            outputs = measured_qubits(circuit)
+
+        return tabulate(self._gates(circuit), num_circuit_qubits(circuit), inputs, outputs, circuit.initial_state())
+
+    def run(self, circuit: QC, times: int) -> CompletedJob:
+        qubits = measured_qubits(circuit)
+        initial_state = circuit.initial_state()
+        if not all(state in (0, 1) for state in initial_state):
+            raise CircuitError("The reversible provider only runs circuits starting in a computational basis state")
+
+        # The truth table over no inputs is the image of the initial state
+        outcome = tabulate(self._gates(circuit), num_circuit_qubits(circuit), [], qubits, initial_state)[0]
+        job = CompletedJob(ReversibleResult(Counter({int(outcome): times}), len(qubits)))
+        self._jobs.append(job)
+        return job
+
+    def _gates(self, circuit: QC):
+        gates = circuit.to_gates()
+        if not is_reversible(gates):
+            raise CircuitError(
+                "The reversible provider only runs X, CNOT, CCNOT, SWAP and CSWAP circuits, got: {}".format(
+                    ", ".join(sorted({gate.symbol for gate in gates if not is_reversible([gate])}))
+                )
+            )
+
+        return gates
@@ -0,0 +1,188 @@
+import asyncio
+from collections import Counter
+from typing import Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import _Gate
+from shor.providers.base import CompletedJob, Job, Provider, Result
+from shor.quantum import QC
+from shor.utils.dag import CircuitDAG
+from shor.utils.fusion import fuse_diagonal_gates, fuse_gates
+from shor.utils.precision import resolve_precision
+from shor.utils.qbits import int_from_bit_string
+from shor.utils.statevector import (
+    batch_initial_states,
+    batch_measurement_probabilities,
+    evolve,
+    evolve_batch,
+    initial_statevector,
+    measured_qubits,
+    measurement_probabilities,
+    num_circuit_qubits,
+    sample_counts,
+    simulate,
+)
+
+
+class StatevectorResult(Result):
+    """Measurement counts stored as a sparse histogram.
+
+    outcomes holds the observed outcomes in increasing order and frequencies how often each one occurred,
+    the Counter behind ``counts`` is only built when it is asked for.
+    """
+
+    def __init__(self, outcomes: np.ndarray, frequencies: np.ndarray, sig_bits: int):
+        self.outcomes = outcomes
+        self.frequencies = frequencies
+        self._sig_bits = sig_bits
+        self._counts = None
+
+    @classmethod
+    def from_histogram(cls, histogram: np.ndarray, sig_bits: int) -> "StatevectorResult":
+        outcomes = np.flatnonzero(histogram)
+        return cls(outcomes, histogram[outcomes], sig_bits)
+
+    @property
+    def histogram(self) -> np.ndarray:
+        """Dense counts, index i is the number of times outcome i was measured."""
+        histogram = np.zeros(2 ** self.sig_bits, dtype=self.frequencies.dtype)
+        histogram[self.outcomes] = self.frequencies
+        return histogram
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            self._counts = Counter(dict(zip(self.outcomes.tolist(), self.frequencies.tolist())))
+        return self._counts
+
+    @property
+    def sig_bits(self):
+        return self._sig_bits
+
+    def get(self, key, default=0):
+        idx = int_from_bit_string(key) if isinstance(key, str) else key
+
+        i = np.searchsorted(self.outcomes, idx)
+        if i < self.outcomes.size and self.outcomes[i] == idx:
+            return int(self.frequencies[i])
+        return default
+
+
+class StatevectorJob(CompletedJob):
+    @property
+    def result(self) -> StatevectorResult:
+        return self._result
+
+
+class StatevectorProvider(Provider):
+    """Local simulator which keeps the full state as a (2,) * n complex tensor.
+
+    Gates are applied as tensor contractions over their target axes, measurements are sampled once
+    from the final state.
+
+    # Config
+    seed = seed for the measurement sampler.
+    max_batch_amplitudes = upper bound on the amplitudes held at once by ``run_batch``, larger batches are split.
+    max_fused_qubits = when > 1, consecutive gates are fused into blocks of up to this many qubits before
+        simulating, trading a few small matrix products for fewer passes over the state.
+    max_diagonal_qubits = runs of diagonal gates (Z, S, T, Rz, controlled phases, ...) over up to this many qubits
+        are folded into one phase tensor and applied in a single pass, 0 disables it.
+    precision = complex dtype of the state and gate matrices, "complex128" or "complex64". complex64 halves the
+        memory and roughly doubles the speed of large simulations, at ~1e-7 relative error per gate. Defaults to the
+        global precision, see ``shor.utils.precision.set_precision``.
+    num_threads = threads each gate is applied with, on independent slabs of the state. Defaults to 1, the calling
+        thread; states too small to be worth splitting are always simulated on the calling thread.
+    """
+
+    def __init__(self, **config):
+        self.seed = config.get("seed", None)
+        self.max_fused_qubits = config.get("max_fused_qubits", 0)
+        self.max_diagonal_qubits = config.get("max_diagonal_qubits", 10)
+        self.max_batch_amplitudes = config.get("max_batch_amplitudes", 2 ** 24)
+        self.precision = config.get("precision", None)
+        self.num_threads = config.get("num_threads", 1)
+        if self.precision is not None:
+            self.precision = resolve_precision(self.precision)
+        self.rng = np.random.default_rng(self.seed)
+        self._jobs: List[StatevectorJob] = []
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    def run(self, circuit: QC, times: int) -> StatevectorJob:
+        qubits = measured_qubits(circuit)
+        state = simulate(circuit, self._gates(circuit), self.precision, self.num_threads)
+        probabilities = measurement_probabilities(state, qubits)
+
+        return self._sample(probabilities, qubits, times)
+
+    async def run_async(self, circuit: QC, times: int) -> StatevectorJob:
+        """Simulates on the event loop thread, yielding to other tasks after every layer of independent gates."""
+        qubits = measured_qubits(circuit)
+
+        state = initial_statevector(circuit, precision=self.precision)
+        for layer in CircuitDAG(self._gates(circuit)).layers():
+            state = evolve(state, layer, self.num_threads)
+            await asyncio.sleep(0)
+
+        return self._sample(measurement_probabilities(state, qubits), qubits, times)
+
+    def run_sweep(self, circuit: QC, bindings: Iterable[Mapping], times: int) -> List[StatevectorJob]:
+        return self.run_batch(circuit, times, bindings=list(bindings))
+
+    def run_batch(
+        self, circuit: QC, times: int, initial_states=None, bindings: Sequence[Mapping] = None
+    ) -> List[StatevectorJob]:
+        """Runs one circuit over a batch of initial states and/or parameter bindings, returning a job per element.
+
+        The whole batch is held as one (B, 2, ..., 2) array and every gate is applied to all B states in a single
+        contraction. The template is flattened once, only parameterized gates are rebound per element.
+
+        initial_states = computational basis indices or a (B, 2^n) array of amplitudes, indexed like
+            ``Result.counts``. Defaults to the circuit's own initial state.
+        bindings = one parameter binding per batch element.
+        """
+        qubits = measured_qubits(circuit)
+        num_qubits = num_circuit_qubits(circuit)
+        gates = circuit.to_gates()
+
+        if initial_states is None:
+            batch_size = 1 if bindings is None else len(bindings)
+            initial_state = initial_statevector(circuit, num_qubits, self.precision)
+            states = np.broadcast_to(initial_state, (batch_size,) + initial_state.shape)
+        else:
+            states = batch_initial_states(num_qubits, initial_states, self.precision)
+
+        if bindings is not None and len(bindings) != len(states):
+            raise CircuitError("Got {} bindings for a batch of {} states".format(len(bindings), len(states)))
+
+        chunk_size = max(1, self.max_batch_amplitudes // 2 ** num_qubits)
+
+        jobs = []
+        for start in range(0, len(states), chunk_size):
+            chunk_bindings = None if bindings is None else bindings[start : start + chunk_size]
+            final_states = evolve_batch(states[start : start + chunk_size], gates, chunk_bindings)
+
+            probabilities = batch_measurement_probabilities(final_states, qubits)
+            jobs.extend(self._sample(p, qubits, times) for p in probabilities)
+
+        return jobs
+
+    def _gates(self, circuit: QC) -> List[_Gate]:
+        gates = circuit.to_gates()
+        if self.max_diagonal_qubits > 0:
+            gates, _ = fuse_diagonal_gates(gates, self.max_diagonal_qubits)
+        if self.max_fused_qubits > 1:
+            gates, _ = fuse_gates(gates, self.max_fused_qubits)
+
+        return gates
+
+    def _sample(self, probabilities, qubits, times) -> StatevectorJob:
+        histogram = sample_counts(probabilities, times, self.rng)
+        job = StatevectorJob(StatevectorResult.from_histogram(histogram, len(qubits)))
+
+        self._jobs.append(job)
+        return job
@@ -1,4 +1,67 @@
-from .base import Job, Provider, Result
-from .IBMQ import IBMQJob, IBMQProvider, IBMQResult
+import sys
 
-__all__ = [Job, Provider, Result, IBMQJob, IBMQProvider, IBMQResult]
+from .base import CompletedJob, Job, Provider, Result
+from .registry import _load, available_providers, get_provider, register_provider
+
+# Backends are only imported the first time one of their names is looked up, like the registry's providers, so
+# importing shor.providers doesn't pay for (or require the dependencies of) every backend
+_LAZY = {
+    "DistributedProvider": "shor.providers.Distributed:DistributedProvider",
+    "IBMQJob": "shor.providers.IBMQ:IBMQJob",
+    "IBMQProvider": "shor.providers.IBMQ:IBMQProvider",
+    "IBMQResult": "shor.providers.IBMQ:IBMQResult",
+    "MemmapProvider": "shor.providers.Memmap:MemmapProvider",
+    "MPSProvider": "shor.providers.MPS:MPSProvider",
+    "MPSResult": "shor.providers.MPS:MPSResult",
+    "ProcessPoolJob": "shor.providers.ProcessPool:ProcessPoolJob",
+    "ProcessPoolProvider": "shor.providers.ProcessPool:ProcessPoolProvider",
+    "ReversibleProvider": "shor.providers.Reversible:ReversibleProvider",
+    "ReversibleResult": "shor.providers.Reversible:ReversibleResult",
+    "StabilizerProvider": "shor.providers.Stabilizer:StabilizerProvider",
+    "StabilizerResult": "shor.providers.Stabilizer:StabilizerResult",
+    "StatevectorJob": "shor.providers.Statevector:StatevectorJob",
+    "StatevectorProvider": "shor.providers.Statevector:StatevectorProvider",
+    "StatevectorResult": "shor.providers.Statevector:StatevectorResult",
+}
+
+__all__ = [
+    "CompletedJob",
+    "Job",
+    "Provider",
+    "Result",
+    "DistributedProvider",
+    "IBMQJob",
+    "IBMQProvider",
+    "IBMQResult",
+    "MemmapProvider",
+    "MPSProvider",
+    "MPSResult",
+    "ProcessPoolJob",
+    "ProcessPoolProvider",
+    "ReversibleProvider",
+    "ReversibleResult",
+    "StabilizerProvider",
+    "StabilizerResult",
+    "StatevectorJob",
+    "StatevectorProvider",
+    "StatevectorResult",
+    "available_providers",
+    "get_provider",
+    "register_provider",
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    value = globals()[name] = _load(_LAZY[name])
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if sys.version_info < (3, 7):  # No module __getattr__ (PEP 562), import every backend up front
+    globals().update({name: _load(target) for name, target in _LAZY.items()})
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List
+from typing import Iterable, List, Mapping
 
 from shor.quantum import QuantumCircuit
 from shor.utils.qbits import int_from_bit_string, int_to_bit_string
@@ -33,9 +33,9 @@ class Result(ABC):
 
 
 class JobStatusCode(Enum):
-    COMPLETED = ("completed",)
-    ERROR = ("error",)
-    RUNNING = ("running",)
+    COMPLETED = "completed"
+    ERROR = "error"
+    RUNNING = "running"
     WAITING = "waiting"
 
 
@@ -45,6 +45,9 @@ class JobStatus(object):
         self.message = message
         self.api_error_code = api_error_code
 
+    def __repr__(self):
+        return "JobStatus({}{})".format(self.code.value, ": " + self.message if self.message else "")
+
 
 class Job(ABC):
     @property
@@ -57,6 +60,28 @@ class Job(ABC):
     def status(self):
         pass
 
+    async def result_async(self):
+        """Awaitable ``result``. Jobs that block while waiting for their result are waited on in an executor."""
+        return await _run_in_executor(lambda: self.result)
+
+
+class CompletedJob(Job):
+    """Job of a provider which simulates synchronously, already done when ``run`` returns it."""
+
+    def __init__(self, result: Result):
+        self._result = result
+
+    @property
+    def status(self):
+        return JobStatus(JobStatusCode.COMPLETED)
+
+    @property
+    def result(self) -> Result:
+        return self._result
+
+    async def result_async(self) -> Result:
+        return self._result
+
 
 class Provider(ABC):
     @property
@@ -67,3 +92,32 @@ class Provider(ABC):
     @abstractmethod
     def run(self, circuit: QuantumCircuit, times: int) -> Job:
         pass
+
+    def run_many(self, circuits: Iterable[QuantumCircuit], times: int) -> List[Job]:
+        return [self.run(circuit, times) for circuit in circuits]
+
+    async def run_async(self, circuit: QuantumCircuit, times: int) -> Job:
+        """Awaitable ``run``. Blocking providers are run in an executor so the event loop keeps going."""
+        return await _run_in_executor(self.run, circuit, times)
+
+    async def run_many_async(self, circuits: Iterable[QuantumCircuit], times: int) -> List[Job]:
+        # asyncio is only imported by coroutines, it's loaded by the time they run and importing it up front
+        # would double the time it takes to import shor.providers
+        import asyncio
+
+        return list(await asyncio.gather(*(self.run_async(circuit, times) for circuit in circuits)))
+
+    def run_sweep(self, circuit: QuantumCircuit, bindings: Iterable[Mapping], times: int) -> List[Job]:
+        """Runs a parameterized circuit once per binding, returning one job per binding.
+
+        Providers override this to prepare the template once and only substitute values per binding.
+        """
+        return [self.run(circuit.bind(binding), times) for binding in bindings]
+
+
+async def _run_in_executor(function, *args):
+    import asyncio
+
+    # get_running_loop is Python 3.7+, on 3.6 get_event_loop returns the running loop from inside a coroutine
+    get_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+    return await get_loop().run_in_executor(None, function, *args)
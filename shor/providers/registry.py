@@ -0,0 +1,119 @@
+from importlib import import_module
+from typing import Callable, Dict, List, Union
+
+from shor.errors import ProviderError
+from shor.providers.base import Provider
+from shor.quantum import QuantumCircuit
+
+# Third party packages register providers under this group, e.g. in setup.py:
+#   entry_points={"shor.providers": ["my_backend = my_package.module:MyProvider"]}
+ENTRY_POINT_GROUP = "shor.providers"
+
+DEFAULT_PROVIDER = "statevector"
+
+# name -> "module:attribute" of a Provider class (or factory), only imported the first time the name is used
+_PROVIDERS: Dict[str, Union[str, Callable[..., Provider]]] = {
+    "distributed": "shor.providers.Distributed:DistributedProvider",
+    "ibmq": "shor.providers.IBMQ:IBMQProvider",
+    "memmap": "shor.providers.Memmap:MemmapProvider",
+    "mps": "shor.providers.MPS:MPSProvider",
+    "process_pool": "shor.providers.ProcessPool:ProcessPoolProvider",
+    "reversible": "shor.providers.Reversible:ReversibleProvider",
+    "stabilizer": "shor.providers.Stabilizer:StabilizerProvider",
+    "statevector": "shor.providers.Statevector:StatevectorProvider",
+}
+
+# name -> "module:attribute" of a check whether the provider can run a circuit. Circuits run without a provider go
+# to the first provider whose check passes, before falling back to DEFAULT_PROVIDER.
+_ELIGIBLE: Dict[str, Union[str, Callable[[QuantumCircuit], bool]]] = {
+    "reversible": "shor.utils.reversible:is_reversible_circuit",
+    "stabilizer": "shor.utils.stabilizer:is_clifford_circuit",
+}
+
+
+def register_provider(
+    name: str,
+    provider: Union[str, Callable[..., Provider]],
+    eligible: Union[str, Callable[[QuantumCircuit], bool]] = None,
+):
+    """Registers a Provider class or factory, or a "module:attribute" path to one, under name.
+
+    eligible = check (or path to one) of whether the provider should run a circuit that is run without a provider.
+    """
+    _PROVIDERS[name.lower()] = provider
+    if eligible is not None:
+        _ELIGIBLE[name.lower()] = eligible
+
+
+def available_providers() -> List[str]:
+    """Names of every registered and installed provider, none of them are imported."""
+    return sorted(set(_PROVIDERS) | set(_entry_points()))
+
+
+def get_provider_class(name: str) -> Callable[..., Provider]:
+    key = name.lower()
+
+    if key not in _PROVIDERS:
+        entry_point = _entry_points().get(key)
+        if entry_point is None:
+            raise ProviderError(
+                "Unknown provider '{}', expected one of: {}".format(name, ", ".join(available_providers()))
+            )
+        _PROVIDERS[key] = entry_point.load()
+
+    provider = _PROVIDERS[key] = _load(_PROVIDERS[key])
+    return provider
+
+
+def select_provider(circuit: QuantumCircuit) -> str:
+    """Name of the first registered provider eligible to run circuit, DEFAULT_PROVIDER if none are."""
+    for name in list(_ELIGIBLE):
+        eligible = _ELIGIBLE[name] = _load(_ELIGIBLE[name])
+        if eligible(circuit):
+            return name
+
+    return DEFAULT_PROVIDER
+
+
+def get_provider(name: str = DEFAULT_PROVIDER, **config) -> Provider:
+    """Looks a provider up by name, importing it on first use, and creates it with the given config."""
+    return get_provider_class(name)(**config)
+
+
+def resolve_provider(provider: Union[Provider, str, None] = None, circuit: QuantumCircuit = None, **config) -> Provider:
+    """Provider instances pass through, names are looked up in the registry.
+
+    None means the first provider eligible to run circuit (e.g. the stabilizer provider for Clifford circuits), or
+    the default provider when no circuit is given.
+    """
+    if provider is None:
+        provider = DEFAULT_PROVIDER if circuit is None else select_provider(circuit)
+    if isinstance(provider, str):
+        return get_provider(provider, **config)
+
+    return provider
+
+
+def _load(target):
+    if isinstance(target, str):
+        module, _, attribute = target.partition(":")
+        return getattr(import_module(module), attribute)
+    return target
+
+
+def _entry_points() -> Dict[str, object]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return {}
+
+    installed = entry_points()
+    if hasattr(installed, "select"):
+        group = installed.select(group=ENTRY_POINT_GROUP)
+    else:
+        group = installed.get(ENTRY_POINT_GROUP, [])
+
+    return {entry_point.name.lower(): entry_point for entry_point in group}
@@ -1,3 +1,5 @@
+import hashlib
+from numbers import Real
 from typing import List, Union
 
 import numpy as np
@@ -6,11 +8,18 @@ from shor.errors import CircuitError
 from shor.gates import _Gate
 from shor.layers import Qbits, _Layer
 from shor.operations import Measure, _Operation
+from shor.parameters import Parameter, is_parameter
+from shor.utils.collections import LRUCache, flatten
+
+# Unitaries from QuantumCircuit.to_unitary, keyed by circuit fingerprint. They grow as 4^n, so only a few are kept.
+UNITARY_CACHE_SIZE = 8
+_UNITARY_CACHE = LRUCache(UNITARY_CACHE_SIZE)
 
 
 class QuantumCircuit(object):
     def __init__(self):
         self.layers: List[_Layer] = []
+        self._reset_fingerprint()
 
     def add(self, layer_or_circuit: Union[_Layer, "QuantumCircuit"]):
         if isinstance(layer_or_circuit, _Layer):
@@ -20,8 +29,59 @@ class QuantumCircuit(object):
         else:
             raise TypeError("QuantumCircuit class cannot add the type: {}".format(type(layer_or_circuit)))
 
+        self._update_fingerprint()
         return self
 
+    @property
+    def fingerprint(self) -> str:
+        """Canonical hash of the circuit's structure: registers, gates, qubits, parameters and measurements.
+
+        Circuits with equal fingerprints describe the same program, e.g. H([0, 1]) and H(0), H(1) are equal and
+        Parameters compare by name. The hash is extended as layers are added rather than recomputed, layers
+        modified in place after being added are not picked up.
+        """
+        self._update_fingerprint()
+        return self._hasher.hexdigest()
+
+    def _reset_fingerprint(self):
+        # Running hash over self.layers[:self._hashed_layers]
+        self._hasher = hashlib.blake2b(digest_size=16)
+        self._hashed_layers = 0
+        self._hashed_list = self.layers
+
+    def _update_fingerprint(self):
+        if self._hashed_list is not self.layers or self._hashed_layers > len(self.layers):
+            # self.layers was replaced or shrunk, start over
+            self._reset_fingerprint()
+
+        for layer in self.layers[self._hashed_layers :]:
+            self._hash_layer(layer)
+        self._hashed_layers = len(self.layers)
+
+    def _hash_layer(self, layer: _Layer):
+        for key in layer_keys(layer):
+            self._hasher.update(repr(key).encode())
+
+    def __getstate__(self):
+        # Hash objects can't be pickled or shared between copies, copies rebuild the fingerprint on first use
+        state = self.__dict__.copy()
+        for attribute in ("_hasher", "_hashed_layers", "_hashed_list"):
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_fingerprint()
+
+    def __eq__(self, other):
+        if not isinstance(other, QuantumCircuit):
+            return NotImplemented
+        return self is other or self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        # Like the fingerprint, the hash changes as layers are added
+        return hash(self.fingerprint)
+
     def draw(self):
         # Use the qiskit drawing function, may want to replace in future.
         from shor.providers.IBMQ import to_qiskit_circuit
@@ -43,6 +103,59 @@ class QuantumCircuit(object):
             gates.extend(operation_or_gates)
         return gates
 
+    @property
+    def parameters(self) -> List[Parameter]:
+        """The circuit's unbound Parameters, in order of first use."""
+        parameters = []
+        for layer in filter(lambda layer: isinstance(layer, _Gate), self.layers):
+            parameters.extend(p for p in layer.free_parameters if p not in parameters)
+
+        return parameters
+
+    def bind(self, bindings) -> "QuantumCircuit":
+        """Returns a copy of this circuit with every Parameter replaced by its value in bindings.
+
+        bindings maps Parameters, or their names, to values. Layers without parameters are shared with the copy.
+        """
+        bound = QuantumCircuit()
+        bound.layers = [layer.bind(bindings) if isinstance(layer, _Gate) else layer for layer in self.layers]
+
+        return bound
+
+    def to_unitary(self, chunk_size: int = None) -> np.ndarray:
+        """The circuit's unitary as a read-only 2^n x 2^n array, measurements and initial states are ignored.
+
+        Qubit 0 is the most significant bit, the same convention as gate matrices. Gates are applied to an
+        identity tensor with the statevector kernels, chunk_size columns at a time to bound the working memory.
+        Results are cached by fingerprint, so equal circuits share one array.
+        """
+        key = self.fingerprint
+        matrix = _UNITARY_CACHE.get(key)
+        if matrix is not None:
+            return matrix
+
+        from shor.utils.statevector import num_circuit_qubits, unitary
+
+        matrix = unitary(self.to_gates(), num_circuit_qubits(self), chunk_size)
+        matrix.flags.writeable = False
+
+        _UNITARY_CACHE[key] = matrix
+        return matrix
+
+    def expectation(self, observable):
+        """Exact <psi|O|psi> of a PauliString or PauliSum (or a list of them) in the circuit's final state.
+
+        No shots are sampled. The final state is cached, so evaluating many observables simulates only once.
+        """
+        from shor.observables import circuit_expectation
+
+        return circuit_expectation(self, observable)
+
+    def to_dag(self):
+        from shor.utils.dag import CircuitDAG
+
+        return CircuitDAG(self)
+
     def measure_bits(self):
         measure_bits = []
         for m in filter(lambda l: type(l) == Measure, self.layers):
@@ -57,12 +170,50 @@ class QuantumCircuit(object):
         return self.add(other)
 
     def run(self, num_shots: int, provider=None, **kwargs):
-        if provider is None:
-            from shor.providers.IBMQ import IBMQProvider
-
-            provider = IBMQProvider()
-
-        return provider.run(self, num_shots)
+        """provider = a Provider, or the name of a registered one which is created with kwargs as its config.
+
+        Without a provider, classical reversible circuits run on the reversible provider, Clifford circuits on the
+        stabilizer provider and others on the statevector provider.
+        """
+        from shor.providers.registry import resolve_provider
+
+        return resolve_provider(provider, self, **kwargs).run(self, num_shots)
+
+    async def run_async(self, num_shots: int, provider=None, **kwargs):
+        """provider = a Provider, or the name of a registered one which is created with kwargs as its config.
+
+        Without a provider, classical reversible circuits run on the reversible provider, Clifford circuits on the
+        stabilizer provider and others on the statevector provider.
+        """
+        from shor.providers.registry import resolve_provider
+
+        return await resolve_provider(provider, self, **kwargs).run_async(self, num_shots)
+
+
+def layer_keys(layer: _Layer) -> List[tuple]:
+    """Canonical keys of the gates or operation a layer flattens to, hashed into QuantumCircuit.fingerprint."""
+    if isinstance(layer, Qbits):
+        return [(Qbits.__name__, layer.num, layer.state)]
+    if isinstance(layer, _Gate):
+        return [
+            (type(gate).__name__, tuple(gate.qbits), tuple(map(canonical_parameter, gate.parameters)))
+            for gate in layer.to_gates()
+        ]
+
+    return [
+        (type(layer).__name__, tuple(flatten(getattr(layer, "qbits", ()))), tuple(flatten(getattr(layer, "bits", ()))))
+    ]
+
+
+def canonical_parameter(value):
+    # Parameters compare by name and numbers by value, so Rx(angle=1) == Rx(angle=np.float64(1.0))
+    if is_parameter(value):
+        return Parameter.__name__, value.name
+    if isinstance(value, Real):
+        return float(value)
+    if isinstance(value, complex):
+        return complex(value)
+    return value
 
 
 # Aliases
@@ -6,3 +6,43 @@ def flatten(x):
         return [a for i in x for a in flatten(i)]
     else:
         return [x]
+
+
+class LRUCache(object):
+    """Mapping of at most maxsize entries, the least recently used one is dropped to make room for a new one.
+
+    Unlike ``functools.lru_cache`` it's keyed explicitly, for values built from arguments that aren't hashable
+    themselves (circuits, gates) or looked up by several callers. A maxsize of 0 caches nothing.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "collections.OrderedDict" = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        """The value of key, marking it as the most recently used, or default when it isn't cached."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
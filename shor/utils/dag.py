@@ -0,0 +1,108 @@
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+
+from shor.gates import _Gate
+from shor.layers import _Layer
+from shor.quantum import QuantumCircuit
+from shor.utils.collections import flatten
+
+
+class CircuitDAG(object):
+    """Dependency graph over the gates and measurements of a circuit.
+
+    Node i is the i-th entry of ``circuit.to_gates(include_operations=True)``. There is an edge a -> b when b is
+    the next node after a to act on one of a's qubits, so nodes without a path between them act on disjoint
+    qubits and may run in any order or in parallel.
+
+    # Properties
+    nodes = gates and operations, in circuit order.
+    predecessors / successors = node indices each node depends on / is depended on by.
+    asap = earliest moment each node can run in.
+    alap = latest moment each node can run in without increasing the depth.
+    """
+
+    def __init__(self, circuit_or_nodes: Union[QuantumCircuit, List[_Layer]]):
+        if isinstance(circuit_or_nodes, list):
+            self.nodes = circuit_or_nodes
+        else:
+            self.nodes = circuit_or_nodes.to_gates(include_operations=True)
+
+        num_nodes = len(self.nodes)
+        self.predecessors: List[List[int]] = [[] for _ in range(num_nodes)]
+        self.successors: List[List[int]] = [[] for _ in range(num_nodes)]
+        asap = [0] * num_nodes
+
+        last_node = {}
+        for i, node in enumerate(self.nodes):
+            moment = 0
+            predecessors = self.predecessors[i]
+            for q in node_qubits(node):
+                j = last_node.get(q)
+                last_node[q] = i
+                if j is None or j in predecessors:
+                    continue
+
+                predecessors.append(j)
+                self.successors[j].append(i)
+                if asap[j] >= moment:
+                    moment = asap[j] + 1
+
+            asap[i] = moment
+
+        self.depth = max(asap) + 1 if num_nodes else 0
+
+        alap = [self.depth - 1] * num_nodes
+        for i in range(num_nodes - 1, -1, -1):
+            for j in self.successors[i]:
+                if alap[j] <= alap[i]:
+                    alap[i] = alap[j] - 1
+
+        self.asap = np.array(asap, dtype=np.int64)
+        self.alap = np.array(alap, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        return [(i, j) for i, successors in enumerate(self.successors) for j in successors]
+
+    @property
+    def slack(self) -> np.ndarray:
+        """How many moments each node can be delayed by, critical nodes have no slack."""
+        return self.alap - self.asap
+
+    def critical_path(self) -> List[_Layer]:
+        """A longest chain of dependent nodes, its length is the circuit depth."""
+        if not self.nodes:
+            return []
+
+        path = [int(np.argmax(self.asap))]
+        while self.predecessors[path[-1]]:
+            moment = self.asap[path[-1]] - 1
+            path.append(next(j for j in self.predecessors[path[-1]] if self.asap[j] == moment))
+
+        return [self.nodes[i] for i in reversed(path)]
+
+    def moments(self, schedule: str = "asap") -> np.ndarray:
+        if schedule == "asap":
+            return self.asap
+        if schedule == "alap":
+            return self.alap
+        raise ValueError("Unknown schedule '{}', expected 'asap' or 'alap'".format(schedule))
+
+    def layers(self, schedule: str = "asap") -> Iterator[List[_Layer]]:
+        """Yields, moment by moment, the nodes scheduled in it. Nodes within one layer act on disjoint qubits."""
+        moments = self.moments(schedule)
+        order = np.argsort(moments, kind="stable")
+        boundaries = np.searchsorted(moments[order], np.arange(1, self.depth))
+
+        for indices in np.split(order, boundaries):
+            yield [self.nodes[i] for i in indices]
+
+
+def node_qubits(node: _Layer) -> List[int]:
+    if isinstance(node, _Gate):
+        return node.qbits
+    return flatten(getattr(node, "qbits", []))
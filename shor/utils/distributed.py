@@ -0,0 +1,400 @@
+import multiprocessing
+import socket
+import struct
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from shor.errors import ProviderError
+from shor.gates import _Gate
+from shor.utils.partition import IOStats, PartitionedStatevector, apply_to_slab, local_outcomes, slab_probabilities
+from shor.utils.precision import Precision, resolve_precision
+
+
+def shared_memory(**kwargs):
+    """A ``multiprocessing.shared_memory.SharedMemory`` block.
+
+    The module is new in Python 3.8, so it's only imported once a distributed state needs it and older Pythons can
+    still import shor.
+    """
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError:
+        raise ProviderError("The distributed provider needs Python 3.8 or later") from None
+
+    return SharedMemory(**kwargs)
+
+
+class Transport(ABC):
+    """Moves amplitudes between the workers of a DistributedStatevector.
+
+    The coordinator calls ``setup`` before starting the workers and ``shutdown`` once they have exited. The
+    transport is then pickled to every worker, which calls ``start`` with its rank and ``connect`` with the
+    addresses every worker's ``start`` returned.
+    """
+
+    def setup(self, num_workers: int, max_message_bytes: int, context):
+        pass
+
+    def start(self, rank: int):
+        """Returns this worker's address for the other workers, anything picklable."""
+        self.rank = rank
+
+    def connect(self, addresses: List):
+        pass
+
+    @abstractmethod
+    def exchange(self, partner: int, send: np.ndarray, receive: np.ndarray):
+        """Sends send to partner and fills receive with what partner sends back, both are contiguous."""
+
+    def abort(self):
+        """Called by a worker whose exchange failed, so its partner fails too rather than waiting on it forever."""
+
+    def close(self):
+        """Called by each worker before it exits."""
+
+    def shutdown(self):
+        """Called by the coordinator once the workers have exited."""
+
+
+class SharedMemoryTransport(Transport):
+    """Exchanges through a shared memory mailbox per worker, for workers on one machine.
+
+    Each worker copies its message into its own mailbox, and after a barrier copies its partner's mailbox out.
+
+    timeout = seconds a worker waits at the barrier for the others before giving up.
+    """
+
+    def __init__(self, timeout: float = 600):
+        self.timeout = timeout
+
+    def setup(self, num_workers: int, max_message_bytes: int, context):
+        self.mailboxes = [shared_memory(create=True, size=max(1, max_message_bytes)) for _ in range(num_workers)]
+        self.names = [mailbox.name for mailbox in self.mailboxes]
+        self.barrier = context.Barrier(num_workers)
+
+    def __getstate__(self):
+        # Workers attach to the mailboxes by name
+        return {"names": self.names, "barrier": self.barrier, "timeout": self.timeout}
+
+    def start(self, rank: int):
+        self.rank = rank
+        self.mailboxes = [shared_memory(name=name) for name in self.names]
+
+    def exchange(self, partner: int, send: np.ndarray, receive: np.ndarray):
+        own = np.ndarray(send.shape, send.dtype, buffer=self.mailboxes[self.rank].buf)
+        own[...] = send
+        self.barrier.wait(self.timeout)
+
+        receive[...] = np.ndarray(receive.shape, receive.dtype, buffer=self.mailboxes[partner].buf)
+        # Nobody may overwrite their mailbox before their partner has read it
+        self.barrier.wait(self.timeout)
+
+    def abort(self):
+        # Every worker waiting at the barrier, or reaching it later, raises BrokenBarrierError
+        self.barrier.abort()
+
+    def close(self):
+        for mailbox in self.mailboxes:
+            mailbox.close()
+
+    def shutdown(self):
+        for mailbox in self.mailboxes:
+            mailbox.close()
+            mailbox.unlink()
+
+
+class SocketTransport(Transport):
+    """Exchanges over TCP connections between the workers, standing in for workers on separate nodes.
+
+    Every worker listens on host, and the lower rank of each pair connects to the higher one the first time they
+    exchange. Messages are sent from a second thread while the reply is received, so large ones can't deadlock.
+
+    timeout = seconds a worker waits on its partner's connection or data before giving up.
+    """
+
+    HEADER = struct.Struct("!Q")
+
+    def __init__(self, host: str = "127.0.0.1", timeout: float = 600):
+        self.host = host
+        self.timeout = timeout
+
+    def __getstate__(self):
+        return {"host": self.host, "timeout": self.timeout}
+
+    def start(self, rank: int):
+        self.rank = rank
+        self.connections: Dict[int, socket.socket] = {}
+        # socket.create_server is Python 3.8+
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.settimeout(self.timeout)
+        self.listener.bind((self.host, 0))
+        self.listener.listen()
+        return self.listener.getsockname()
+
+    def connect(self, addresses: List):
+        self.addresses = addresses
+
+    def _connection(self, partner: int) -> socket.socket:
+        if partner in self.connections:
+            return self.connections[partner]
+
+        if self.rank < partner:
+            connection = socket.create_connection(tuple(self.addresses[partner]), self.timeout)
+            connection.sendall(self.HEADER.pack(self.rank))
+            self.connections[partner] = connection
+        else:
+            # Other workers may connect first, keep their connections for later
+            while partner not in self.connections:
+                connection, _ = self.listener.accept()
+                connection.settimeout(self.timeout)
+                (rank,) = self.HEADER.unpack(_receive(connection, self.HEADER.size))
+                self.connections[rank] = connection
+
+        return self.connections[partner]
+
+    def exchange(self, partner: int, send: np.ndarray, receive: np.ndarray):
+        connection = self._connection(partner)
+
+        sender = threading.Thread(target=connection.sendall, args=(memoryview(send).cast("B"),))
+        sender.start()
+        _receive(connection, receive.nbytes, memoryview(receive).cast("B"))
+        sender.join()
+
+    def abort(self):
+        # The partner's receive sees the connection close, or times out waiting for it
+        self.close()
+        self.connections = {}
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        self.listener.close()
+
+
+def _receive(connection: socket.socket, size: int, buffer: memoryview = None) -> memoryview:
+    buffer = memoryview(bytearray(size)) if buffer is None else buffer
+    received = 0
+    while received < size:
+        count = connection.recv_into(buffer[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Connection closed after {} of {} bytes".format(received, size))
+        received += count
+
+    return buffer
+
+
+# What a worker raises when its partner failed, or vanished, in the middle of an exchange
+PARTNER_ERRORS = (threading.BrokenBarrierError, ConnectionError, socket.timeout)
+
+TRANSPORTS = {"shared_memory": SharedMemoryTransport, "socket": SocketTransport}
+
+
+def make_transport(transport: Union[str, Transport, Callable[[], Transport]]) -> Transport:
+    if isinstance(transport, Transport):
+        return transport
+    if isinstance(transport, str):
+        if transport not in TRANSPORTS:
+            raise ProviderError(
+                "Unknown transport '{}', expected one of: {}".format(transport, ", ".join(sorted(TRANSPORTS)))
+            )
+        return TRANSPORTS[transport]()
+    return transport()
+
+
+class DistributedStatevector(PartitionedStatevector):
+    """Statevector split across worker processes, each holding one slab in shared memory.
+
+    There are 2^g workers for g global qubits, worker r holds the amplitudes whose high g index bits are r, see
+    ``PartitionedStatevector``. Runs of gates on local qubits are applied by every worker independently. Swapping a
+    global qubit with a local one is a pairwise exchange: each worker sends the half of its slab which belongs to
+    its partner across that qubit, and receives the partner's half in its place.
+
+    A worker whose exchange fails aborts the transport, so its partners fail rather than hang, and the coordinator
+    raises the worker's exception. The state can't be used afterwards, only closed.
+
+    transport = how workers exchange halves, "shared_memory", "socket" or a Transport (or a factory of one).
+    context = multiprocessing context the workers are started from, defaults to the platform's default.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        initial_state: Sequence[int] = (),
+        num_workers: int = 2,
+        transport: Union[str, Transport, Callable[[], Transport]] = "shared_memory",
+        lookahead: int = 64,
+        precision: Precision = None,
+        progress: Callable[[IOStats], None] = None,
+        context=None,
+    ):
+        if num_workers < 1 or num_workers & (num_workers - 1):
+            raise ProviderError("The number of workers must be a power of 2, got {}".format(num_workers))
+
+        # Every worker needs at least one local qubit
+        num_workers = min(num_workers, 2 ** max(0, num_qubits - 1))
+        local_qubits = num_qubits - (num_workers.bit_length() - 1)
+
+        # Each swap is one round of pairwise exchanges
+        super().__init__(num_qubits, local_qubits, 1, lookahead, progress)
+        self.dtype = resolve_precision(precision)
+        self.context = multiprocessing.get_context(context)
+        self.transport = make_transport(transport)
+
+        slab_bytes = 2 ** self.local_qubits * self.dtype.itemsize
+        self.blocks = [shared_memory(create=True, size=slab_bytes) for _ in range(self.num_slabs)]
+        self.slabs = [np.ndarray((2,) * self.local_qubits, self.dtype, buffer=block.buf) for block in self.blocks]
+        for slab in self.slabs:
+            slab[...] = 0
+
+        index = sum(1 << q for q, s in enumerate(initial_state) if s == 1)
+        self.slabs[index >> self.local_qubits].reshape(-1)[index & (2 ** self.local_qubits - 1)] = 1
+
+        self.transport.setup(self.num_slabs, slab_bytes // 2, self.context)
+        self.connections = []
+        self.workers = []
+        try:
+            for rank, block in enumerate(self.blocks):
+                connection, worker_connection = self.context.Pipe()
+                worker = self.context.Process(
+                    target=_worker,
+                    args=(rank, block.name, self.local_qubits, self.dtype.str, self.transport, worker_connection),
+                    daemon=True,
+                )
+                worker.start()
+                worker_connection.close()
+                self.connections.append(connection)
+                self.workers.append(worker)
+
+            addresses = self._gather()
+            self._broadcast(("connect", addresses))
+            self._gather()
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def num_workers(self) -> int:
+        return self.num_slabs
+
+    def _broadcast(self, command: tuple):
+        for connection in self.connections:
+            connection.send(command)
+
+    def _gather(self) -> List:
+        replies = [connection.recv() for connection in self.connections]
+        errors = [reply for reply in replies if isinstance(reply, BaseException)]
+        if errors:
+            # The worker which failed first, rather than the partners it left behind
+            raise next((e for e in errors if not isinstance(e, PARTNER_ERRORS)), errors[0])
+
+        return replies
+
+    def _local_pass(self, gates: List[_Gate]):
+        self._broadcast(("apply", gates, self.layout))
+        self._gather()
+
+    def _swap_pass(self, pairs: List[Tuple[int, int]]):
+        # The pairs are disjoint, so each is a separate round of exchanges
+        for g, q in pairs:
+            self._broadcast(("swap", self.layout[g], self.layout[q]))
+            self.stats.bytes_exchanged += sum(self._gather())
+
+    def _measure_pass(self, qubits: Sequence[int]) -> np.ndarray:
+        self._broadcast(("probabilities", list(qubits), self.layout))
+        return np.sum(self._gather(), axis=0)
+
+    def _amplitudes(self) -> np.ndarray:
+        return np.concatenate([slab.reshape(-1) for slab in self.slabs])
+
+    def close(self):
+        if not self.blocks:
+            return
+
+        for connection in self.connections:
+            try:
+                connection.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.workers = [], []
+
+        self.slabs = []
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+        self.transport.shutdown()
+
+
+def _worker(rank: int, name: str, local_qubits: int, dtype: str, transport: Transport, connection):
+    """Worker process loop, running the coordinator's commands on slab rank until it's told to close."""
+    block = shared_memory(name=name)
+    slab = np.ndarray((2,) * local_qubits, np.dtype(dtype), buffer=block.buf)
+
+    try:
+        connection.send(transport.start(rank))
+
+        while True:
+            command, *args = connection.recv()
+            if command == "close":
+                break
+
+            try:
+                if command == "connect":
+                    transport.connect(*args)
+                    connection.send(None)
+                elif command == "apply":
+                    gates, layout = args
+                    apply_to_slab(slab, gates, layout, rank)
+                    connection.send(None)
+                elif command == "swap":
+                    try:
+                        bytes_sent = _exchange(slab, rank, transport, *args)
+                    except Exception:
+                        transport.abort()
+                        raise
+                    connection.send(bytes_sent)
+                elif command == "probabilities":
+                    qubits, layout = args
+                    outcomes = local_outcomes(qubits, layout, local_qubits)
+                    connection.send(slab_probabilities(slab, qubits, layout, rank, outcomes))
+                else:
+                    raise ProviderError("Unknown command '{}'".format(command))
+            except Exception as e:
+                connection.send(e)
+    finally:
+        transport.close()
+        del slab
+        block.close()
+
+
+def _exchange(slab: np.ndarray, rank: int, transport: Transport, global_bit: int, local_bit: int) -> int:
+    """Exchanges index bits global_bit and local_bit with the partner across global_bit, returns the bytes sent.
+
+    After the swap, this worker's amplitudes with the local bit b are the ones which had the global bit b. Those
+    with b equal to this worker's global bit stay, the other half comes from the partner.
+    """
+    local_qubits = slab.ndim
+    shift = global_bit - local_qubits
+    own_bit = (rank >> shift) & 1
+
+    # A slice rather than an index keeps the half an array view, even of a single local qubit's slab
+    half = [slice(None)] * local_qubits
+    half[local_qubits - 1 - local_bit] = slice(1 - own_bit, 2 - own_bit)
+    half = tuple(half)
+
+    send = np.ascontiguousarray(slab[half])
+    receive = np.empty_like(send)
+    transport.exchange(rank ^ (1 << shift), send, receive)
+    slab[half] = receive
+
+    return send.nbytes
@@ -0,0 +1,172 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from shor.gates import _Gate
+from shor.layers import _Layer
+from shor.utils.statevector import apply_diagonal, apply_matrix, gate_axes
+
+
+class FusedGate(_Gate):
+    """Dense unitary standing in for a run of consecutive gates.
+
+    The matrix uses the same convention as every other gate: the first qubit is the most significant bit.
+    """
+
+    __slots__ = ("_matrix", "gates")
+    symbol = "fused"
+
+    def __init__(self, *qubits, matrix: np.ndarray, gates: List[_Gate] = None, **kwargs):
+        self._matrix = matrix
+        self.gates = gates or []
+        kwargs["dimension"] = int(np.log2(matrix.shape[0]))
+
+        super().__init__(*qubits, **kwargs)
+
+    def to_gates(self):
+        return [self]
+
+    def to_matrix(self) -> np.ndarray:
+        return self._matrix
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+
+class DiagonalGate(_Gate):
+    """Diagonal unitary standing in for a run of diagonal gates, only its diagonal is stored.
+
+    phases is a (2,) * k tensor whose axis i is qbits[i], so phases.ravel() is the diagonal in the usual
+    most significant bit first order.
+    """
+
+    __slots__ = ("phases", "gates")
+    symbol = "diagonal"
+    is_diagonal = True
+
+    def __init__(self, *qubits, phases: np.ndarray, gates: List[_Gate] = None, **kwargs):
+        self.phases = phases
+        self.gates = gates or []
+        kwargs["dimension"] = phases.ndim
+
+        super().__init__(*qubits, **kwargs)
+
+    def to_gates(self):
+        return [self]
+
+    @property
+    def diagonal(self) -> np.ndarray:
+        return self.phases.reshape(-1)
+
+    def to_matrix(self) -> np.ndarray:
+        return np.diag(self.diagonal)
+
+    @property
+    def matrix(self):
+        return self.to_matrix()
+
+
+def fuse_gates(gates: List[_Layer], max_qubits: int = 2) -> Tuple[List[_Layer], int]:
+    """Greedily merges consecutive gates acting on overlapping qubits into FusedGates of up to max_qubits qubits.
+
+    Operations (e.g. measurements) and gates wider than max_qubits are passed through untouched and end the
+    current block. Returns the new gate list and the number of input gates that were fused.
+    """
+    fused: List[_Layer] = []
+    num_fused = 0
+
+    block: List[_Gate] = []
+    block_qubits: List[int] = []
+
+    def flush():
+        nonlocal num_fused
+        if len(block) == 1:
+            fused.append(block[0])
+        elif block:
+            fused.append(FusedGate(block_qubits, matrix=block_matrix(block, block_qubits), gates=list(block)))
+            num_fused += len(block)
+
+        block.clear()
+        block_qubits.clear()
+
+    for gate in gates:
+        if not isinstance(gate, _Gate) or gate.dimension > max_qubits:
+            flush()
+            fused.append(gate)
+            continue
+
+        overlaps = not set(gate.qbits).isdisjoint(block_qubits)
+        new_qubits = [q for q in gate.qbits if q not in block_qubits]
+        if not overlaps or len(block_qubits) + len(new_qubits) > max_qubits:
+            flush()
+            new_qubits = list(gate.qbits)
+
+        block.append(gate)
+        block_qubits.extend(new_qubits)
+
+    flush()
+    return fused, num_fused
+
+
+def block_matrix(gates: List[_Gate], qubits: List[int]) -> np.ndarray:
+    """The product of gates (applied in order) as a 2^k x 2^k matrix over the given qubits."""
+    k = len(qubits)
+    unitary = np.eye(2 ** k, dtype="complex128").reshape((2,) * k + (2 ** k,))
+
+    for gate in gates:
+        unitary = apply_matrix(unitary, gate.matrix, [qubits.index(q) for q in gate_axes(gate)])
+
+    return unitary.reshape(2 ** k, 2 ** k)
+
+
+def fuse_diagonal_gates(gates: List[_Layer], max_qubits: int = 10) -> Tuple[List[_Layer], int]:
+    """Folds runs of consecutive diagonal gates into DiagonalGates over up to max_qubits qubits.
+
+    Diagonal gates commute, so a run may act on unrelated qubits. Its phases are multiplied together once, up
+    front, and the state is then swept once per run instead of once per gate. Any other gate, operation or
+    parameterized gate ends the run. Returns the new gate list and the number of input gates that were folded.
+    """
+    fused: List[_Layer] = []
+    num_fused = 0
+
+    block: List[_Gate] = []
+    block_qubits: List[int] = []
+
+    def flush():
+        nonlocal num_fused
+        if len(block) == 1:
+            fused.append(block[0])
+        elif block:
+            fused.append(DiagonalGate(block_qubits, phases=block_diagonal(block, block_qubits), gates=list(block)))
+            num_fused += len(block)
+
+        block.clear()
+        block_qubits.clear()
+
+    for gate in gates:
+        if not isinstance(gate, _Gate) or not gate.is_diagonal or gate.free_parameters:
+            flush()
+            fused.append(gate)
+            continue
+
+        new_qubits = [q for q in gate.qbits if q not in block_qubits]
+        if len(block_qubits) + len(new_qubits) > max_qubits:
+            flush()
+            new_qubits = list(gate.qbits)
+
+        block.append(gate)
+        block_qubits.extend(new_qubits)
+
+    flush()
+    return fused, num_fused
+
+
+def block_diagonal(gates: List[_Gate], qubits: List[int]) -> np.ndarray:
+    """The product of diagonal gates as a (2,) * k phase tensor over the given qubits."""
+    phases = np.ones((2,) * len(qubits), dtype="complex128")
+
+    for gate in gates:
+        phases = apply_diagonal(phases, gate.diagonal, [qubits.index(q) for q in gate_axes(gate)])
+
+    return phases
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from shor.gates import _Gate
+from shor.utils.partition import IOStats, PartitionedStatevector, apply_to_slab, local_outcomes, slab_probabilities
+from shor.utils.precision import Precision, resolve_precision
+
+
+class MemmapStatevector(PartitionedStatevector):
+    """Statevector stored in a memory-mapped file, for registers whose state doesn't fit in memory.
+
+    The file holds the slabs, see ``PartitionedStatevector``, as chunks of 2^local_qubits amplitudes. A local pass
+    reads each chunk once, applies the whole run of gates to it and writes it back. A swap pass of k qubit pairs
+    holds 2^k chunks at a time.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        initial_state: Sequence[int] = (),
+        local_qubits: int = 20,
+        max_swap_qubits: int = 2,
+        lookahead: int = 64,
+        precision: Precision = None,
+        path: str = None,
+        directory: str = None,
+        progress: Callable[[IOStats], None] = None,
+    ):
+        super().__init__(num_qubits, local_qubits, max_swap_qubits, lookahead, progress)
+        self.dtype = resolve_precision(precision)
+
+        self._owns_file = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".statevector", dir=directory)
+            os.close(handle)
+        self.path = path
+
+        # A new file is sparse and reads as zeros, only the initial basis state's amplitude is written
+        self.data = np.memmap(path, dtype=self.dtype, mode="w+", shape=(self.num_slabs, 2 ** self.local_qubits))
+
+        index = sum(1 << q for q, s in enumerate(initial_state) if s == 1)
+        self.data[index >> self.local_qubits, index & (2 ** self.local_qubits - 1)] = 1
+        self.stats.bytes_written += self.dtype.itemsize
+
+    @property
+    def num_chunks(self) -> int:
+        return self.num_slabs
+
+    def _local_pass(self, gates: List[_Gate]):
+        for c in range(self.num_chunks):
+            chunk = np.array(self.data[c]).reshape((2,) * self.local_qubits)
+            self.data[c] = apply_to_slab(chunk, gates, self.layout, c).reshape(-1)
+
+            self.stats.bytes_read += chunk.nbytes
+            self.stats.bytes_written += chunk.nbytes
+
+        self.data.flush()
+
+    def _swap_pass(self, pairs: List[Tuple[int, int]]):
+        L, k = self.local_qubits, len(pairs)
+        global_bits = [self.layout[g] - L for g, _ in pairs]
+        local_axes = [L - 1 - self.layout[q] for _, q in pairs]
+
+        # Member m of a group has bit j of global_bits set when bit k - 1 - j of m is, i.e. block axis j
+        offsets = np.zeros(2 ** k, dtype=np.int64)
+        for j, bit in enumerate(global_bits):
+            offsets |= ((np.arange(2 ** k) >> (k - 1 - j)) & 1) << bit
+
+        chunks = np.arange(self.num_chunks)
+        group_mask = sum(1 << bit for bit in global_bits)
+
+        for base in chunks[chunks & group_mask == 0]:
+            members = base + offsets
+            block = self.data[members].reshape((2,) * (k + L))
+            for j, axis in enumerate(local_axes):
+                block = np.swapaxes(block, j, k + axis)
+            self.data[members] = block.reshape(2 ** k, -1)
+
+            self.stats.bytes_read += block.nbytes
+            self.stats.bytes_written += block.nbytes
+
+        self.data.flush()
+
+    def _measure_pass(self, qubits: Sequence[int]) -> np.ndarray:
+        outcomes = local_outcomes(qubits, self.layout, self.local_qubits)
+
+        probabilities = np.zeros(2 ** len(qubits))
+        for c in range(self.num_chunks):
+            chunk = np.array(self.data[c])
+            probabilities += slab_probabilities(chunk, qubits, self.layout, c, outcomes)
+
+            self.stats.bytes_read += chunk.nbytes
+
+        return probabilities
+
+    def _amplitudes(self) -> np.ndarray:
+        amplitudes = np.array(self.data).reshape(-1)
+        self.stats.bytes_read += amplitudes.nbytes
+        return amplitudes
+
+    def close(self):
+        if self.data is None:
+            return
+
+        # Dropping the last reference unmaps the file
+        self.data.flush()
+        self.data = None
+        if self._owns_file:
+            os.remove(self.path)
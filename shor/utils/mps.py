@@ -0,0 +1,256 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from shor.errors import ProviderError
+from shor.gates import _Gate
+from shor.utils.precision import Precision, resolve_precision
+from shor.utils.statevector import _gate_matrix, apply_matrix, gate_axes
+
+# Shots sampled together, each holds a vector of the bond dimension while sweeping the chain
+SAMPLE_BATCH = 8192
+
+
+class TruncationStats(object):
+    """Work done by an MPS and the accuracy it gave up for it.
+
+    # Properties
+    truncation_error = sum over every SVD of the squared singular values discarded, relative to the total
+        squared norm before truncation.
+    fidelity = product over every SVD of the kept weight, an estimate of the overlap with the exact state.
+    truncations = SVDs that discarded any singular value.
+    max_bond = largest bond dimension reached.
+    swaps = swaps of neighbouring sites made to route gates.
+    gates_applied = gates applied.
+    """
+
+    __slots__ = ("truncation_error", "fidelity", "truncations", "max_bond", "swaps", "gates_applied")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.truncation_error = 0.0
+        self.fidelity = 1.0
+        self.max_bond = 1
+
+    def __repr__(self):
+        return "TruncationStats({})".format(
+            ", ".join("{}={}".format(name, getattr(self, name)) for name in self.__slots__)
+        )
+
+
+class MPS(object):
+    """State of n qubits as a matrix product state, a chain of (chi_left, 2, chi_right) tensors, one per site.
+
+    Weakly entangled states of many qubits only need small bonds, so memory and time grow with n * chi^2 rather
+    than 2^n. The chain is kept in mixed canonical form around ``center``: tensors left of it are left isometries and
+    tensors right of it are right isometries, so an SVD at the center discards exactly the weight it reports.
+
+    Qubits are mapped to sites by ``sites`` (qubit -> site) and ``qubits`` (site -> qubit). A gate on k qubits first
+    swaps them onto k neighbouring sites, moving every qubit by as few swaps as possible, and the layout is left as
+    the routing leaves it. The sites are then contracted into one block, the gate matrix applied, and the block split
+    back into sites with an SVD per bond.
+
+    Every SVD drops the singular values below a relative squared weight of cutoff, then keeps at most
+    max_bond_dimension of them, and renormalizes. The weight given up is accrued in ``stats``.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        initial_state: Sequence[int] = None,
+        max_bond_dimension: int = None,
+        cutoff: float = 1e-12,
+        precision: Precision = None,
+    ):
+        if max_bond_dimension is not None and max_bond_dimension < 1:
+            raise ProviderError("The max bond dimension must be at least 1, got {}".format(max_bond_dimension))
+        if cutoff < 0:
+            raise ProviderError("The truncation cutoff can't be negative, got {}".format(cutoff))
+
+        self.num_qubits = num_qubits
+        self.max_bond_dimension = max_bond_dimension
+        self.cutoff = cutoff
+        self.dtype = resolve_precision(precision)
+        self.stats = TruncationStats()
+
+        initial_state = list(initial_state or []) + [0] * (num_qubits - len(initial_state or []))
+        self.tensors: List[np.ndarray] = [
+            np.asarray([1 if s == 0 else 0, 1 if s == 1 else 0], dtype=self.dtype).reshape(1, 2, 1)
+            for s in initial_state
+        ]
+        self.sites = list(range(num_qubits))
+        self.qubits = list(range(num_qubits))
+        self.center = 0
+
+    @property
+    def bond_dimensions(self) -> List[int]:
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    def apply(self, gates: Sequence[_Gate]):
+        for gate in gates:
+            self.apply_gate(gate)
+
+    def apply_gate(self, gate: _Gate):
+        axes = gate_axes(gate)
+        if not axes:
+            return
+
+        matrix = _gate_matrix(gate, self.dtype)
+        start = self._route(axes)
+        k = len(axes)
+
+        if k == 1:
+            # A unitary on one site keeps it an isometry, the canonical form holds without moving the center
+            self.tensors[start] = apply_matrix(self.tensors[start], matrix, [1])
+        else:
+            block = self._contract(start, k)
+            block = apply_matrix(block, matrix, [1 + self.sites[q] - start for q in axes])
+            self._split(block, start, k)
+
+        self.stats.gates_applied += 1
+
+    def swap(self, site: int, leftwards: bool = False):
+        """Exchanges the qubits on site and site + 1, leaving the center on the left one when leftwards."""
+        block = self._contract(site, 2).transpose(0, 2, 1, 3)
+        self._split(block, site, 2, leftwards)
+
+        a, b = self.qubits[site], self.qubits[site + 1]
+        self.qubits[site], self.qubits[site + 1] = b, a
+        self.sites[a], self.sites[b] = site + 1, site
+        self.stats.swaps += 1
+
+    def move_center(self, site: int):
+        """Moves the orthogonality center to site with a QR decomposition per bond crossed."""
+        while self.center < site:
+            c = self.center
+            chi_left, _, chi_right = self.tensors[c].shape
+            q, r = np.linalg.qr(self.tensors[c].reshape(chi_left * 2, chi_right))
+            self.tensors[c] = q.reshape(chi_left, 2, -1)
+            self.tensors[c + 1] = np.tensordot(r, self.tensors[c + 1], axes=(1, 0))
+            self.center += 1
+
+        while self.center > site:
+            c = self.center
+            chi_left, _, chi_right = self.tensors[c].shape
+            q, r = np.linalg.qr(self.tensors[c].reshape(chi_left, 2 * chi_right).T)
+            self.tensors[c] = q.T.reshape(-1, 2, chi_right)
+            self.tensors[c - 1] = np.tensordot(self.tensors[c - 1], r.T, axes=(2, 0))
+            self.center -= 1
+
+    def _route(self, qubits: Sequence[int]) -> int:
+        """Swaps the qubits onto neighbouring sites, keeping their order, returns the first of the sites."""
+        k = len(qubits)
+        sites = sorted(self.sites[q] for q in qubits)
+
+        # Moving sites[i] to start + i costs |sites[i] - i - start| swaps, which the median minimizes
+        offsets = sorted(site - i for i, site in enumerate(sites))
+        start = min(max(offsets[k // 2], 0), self.num_qubits - k)
+
+        for i, site in enumerate(sites):
+            for s in range(site - 1, start + i - 1, -1):
+                self.swap(s, leftwards=True)
+        for i, site in reversed(list(enumerate(sites))):
+            for s in range(site, start + i):
+                self.swap(s)
+
+        return start
+
+    def _contract(self, start: int, k: int) -> np.ndarray:
+        """The sites start..start + k - 1 as one (chi_left, 2, ..., 2, chi_right) block holding the center."""
+        if self.center < start:
+            self.move_center(start)
+        elif self.center > start + k - 1:
+            self.move_center(start + k - 1)
+
+        block = self.tensors[start]
+        for site in range(start + 1, start + k):
+            block = np.tensordot(block, self.tensors[site], axes=(-1, 0))
+
+        return block
+
+    def _split(self, block: np.ndarray, start: int, k: int, leftwards: bool = False):
+        """Splits a block back into k sites, by SVDs from the left, or from the right when leftwards."""
+        chi_left, chi_right = block.shape[0], block.shape[-1]
+
+        if leftwards:
+            for site in range(start + k - 1, start, -1):
+                u, s, vh = self._svd(block.reshape(-1, 2 * chi_right))
+                self.tensors[site] = vh.reshape(-1, 2, chi_right)
+                block = (u * s).reshape(chi_left, *(2,) * (site - start), -1)
+                chi_right = s.size
+            self.tensors[start] = block
+            self.center = start
+        else:
+            for site in range(start, start + k - 1):
+                u, s, vh = self._svd(block.reshape(chi_left * 2, -1))
+                self.tensors[site] = u.reshape(chi_left, 2, -1)
+                block = (s[:, np.newaxis] * vh).reshape(s.size, *(2,) * (start + k - 1 - site), -1)
+                chi_left = s.size
+            self.tensors[start + k - 1] = block
+            self.center = start + k - 1
+
+    def _svd(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """SVD truncated to the cutoff and max bond dimension, with the singular values renormalized."""
+        u, s, vh = np.linalg.svd(matrix, full_matrices=False)
+
+        weights = np.square(s)
+        total = weights.sum()
+        # Smallest first: drop the longest tail whose weight stays within the cutoff
+        tail = np.cumsum(weights[::-1]) <= self.cutoff * total
+        keep = max(1, s.size - int(np.count_nonzero(tail)))
+        if self.max_bond_dimension is not None:
+            keep = min(keep, self.max_bond_dimension)
+
+        if keep < s.size:
+            discarded = weights[keep:].sum() / total if total > 0 else 0.0
+            self.stats.truncation_error += float(discarded)
+            self.stats.fidelity *= float(1 - discarded)
+            self.stats.truncations += 1
+            u, s, vh = u[:, :keep], s[:keep], vh[:keep]
+            s = s / np.linalg.norm(s)
+
+        self.stats.max_bond = max(self.stats.max_bond, keep)
+        return u, s.astype(self.dtype), vh
+
+    def statevector(self) -> np.ndarray:
+        """The state as a (2,) * n tensor, axis i being qubit i. Only for states that fit in memory."""
+        state = self.tensors[0]
+        for tensor in self.tensors[1:]:
+            state = np.tensordot(state, tensor, axes=(-1, 0))
+
+        state = state.reshape((2,) * self.num_qubits)
+        return np.transpose(state, self.sites)
+
+    def sample(self, qubits: Sequence[int], shots: int, rng: np.random.Generator) -> np.ndarray:
+        """Z basis measurements of the qubits, a (shots, len(qubits)) array of bits, column j being qubits[j].
+
+        Every shot sweeps the chain left to right, measuring each site from its conditional probabilities, until
+        the last site holding a measured qubit; sites to its right are left out as right isometries trace out to
+        the identity. All shots of a batch sweep together, each carrying its own left vector through the bonds.
+        """
+        if not qubits:
+            return np.zeros((shots, 0), dtype=np.uint8)
+
+        self.move_center(0)
+        last = max(self.sites[q] for q in qubits)
+
+        bits = np.empty((shots, last + 1), dtype=np.uint8)
+        for begin in range(0, shots, SAMPLE_BATCH):
+            end = min(begin + SAMPLE_BATCH, shots)
+            left = np.ones((end - begin, 1), dtype=self.dtype)
+
+            for site in range(last + 1):
+                tensor = self.tensors[site]
+                amplitudes = np.tensordot(left, tensor, axes=(1, 0))
+
+                weights = np.square(amplitudes.real) + np.square(amplitudes.imag)
+                weights = weights.sum(axis=2)
+                ones = rng.random(end - begin) * weights.sum(axis=1) < weights[:, 1]
+
+                outcome = ones.astype(np.intp)
+                left = amplitudes[np.arange(end - begin), outcome]
+                left /= np.sqrt(weights[np.arange(end - begin), outcome])[:, np.newaxis]
+                bits[begin:end, site] = outcome
+
+        return bits[:, [self.sites[q] for q in qubits]]
@@ -0,0 +1,379 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import _Gate
+from shor.providers.base import Job, Provider
+from shor.providers.Statevector import StatevectorJob, StatevectorResult
+from shor.quantum import QC
+from shor.utils.fusion import fuse_diagonal_gates
+from shor.utils.statevector import (
+    PERMUTATION_GATES,
+    apply_diagonal,
+    apply_matrix,
+    apply_permutation,
+    gate_axes,
+    measured_qubits,
+    sample_counts,
+)
+
+
+class IOStats(object):
+    """Work done by a PartitionedStatevector.
+
+    # Properties
+    local_passes = passes applying a run of gates slab by slab.
+    swap_passes = passes exchanging global qubits with local ones, see ``PartitionedStatevector``.
+    measure_passes = passes summing measurement probabilities.
+    bytes_exchanged = bytes sent between the processes holding the slabs, for distributed states.
+    """
+
+    __slots__ = (
+        "bytes_read",
+        "bytes_written",
+        "bytes_exchanged",
+        "local_passes",
+        "swap_passes",
+        "measure_passes",
+        "swapped_qubits",
+        "gates_applied",
+        "total_gates",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    @property
+    def passes(self) -> int:
+        return self.local_passes + self.swap_passes + self.measure_passes
+
+    def __repr__(self):
+        return "IOStats({})".format(", ".join("{}={}".format(name, getattr(self, name)) for name in self.__slots__))
+
+
+class PartitionedStatevector(ABC):
+    """Statevector split into 2^(n - L) slabs of 2^L amplitudes, L being local_qubits.
+
+    Qubits are mapped to bits of the amplitude index by ``layout``: qubits on the low L bits are local, every slab
+    holds all of their values, while each slab has fixed values of the other, global, qubits. Slab i holds the
+    amplitudes whose high bits are i.
+
+    Consecutive gates that only mix local qubits are applied in one pass, each slab on its own. Global qubits a gate
+    doesn't mix (controls, diagonal gates) are read off the slab's index and only select the part of the gate to
+    apply. A gate that mixes a global qubit first costs a swap pass exchanging it with the local qubit whose next
+    use is furthest away. The swap also brings in up to max_swap_qubits global qubits needed by the next lookahead
+    gates, so that one pass pays for several of them.
+
+    Subclasses store the slabs and implement the passes.
+
+    progress = called with ``stats`` after every pass.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        local_qubits: int,
+        max_swap_qubits: int = 2,
+        lookahead: int = 64,
+        progress: Callable[[IOStats], None] = None,
+    ):
+        self.num_qubits = num_qubits
+        self.local_qubits = max(1, min(local_qubits, num_qubits))
+        self.max_swap_qubits = max(1, max_swap_qubits)
+        self.lookahead = lookahead
+        self.progress = progress
+        self.stats = IOStats()
+
+        # layout[q] = bit of the amplitude index holding qubit q
+        self.layout = list(range(num_qubits))
+
+    @property
+    def num_slabs(self) -> int:
+        return 2 ** (self.num_qubits - self.local_qubits)
+
+    def is_local(self, qubit: int) -> bool:
+        return self.layout[qubit] < self.local_qubits
+
+    def apply(self, gates: Sequence[_Gate]):
+        gates = list(gates)
+        self.stats.total_gates += len(gates)
+
+        mixed = [mixed_qubits(gate) for gate in gates]
+        uses: Dict[int, List[int]] = {}
+        for i, qubits in enumerate(mixed):
+            for q in qubits:
+                uses.setdefault(q, []).append(i)
+
+        pending: List[_Gate] = []
+        for i, gate in enumerate(gates):
+            if len(mixed[i]) > self.local_qubits:
+                raise CircuitError(
+                    "The '{}' gate mixes {} qubits, more than the {} local qubits".format(
+                        gate.symbol, len(mixed[i]), self.local_qubits
+                    )
+                )
+
+            if not all(self.is_local(q) for q in mixed[i]):
+                if pending:
+                    self._local_pass(pending)
+                    self.stats.local_passes += 1
+                    self.stats.gates_applied += len(pending)
+                    self._report()
+                    pending = []
+
+                pairs = self._swaps(i, mixed, uses)
+                self._swap_pass(pairs)
+                for g, q in pairs:
+                    self.layout[g], self.layout[q] = self.layout[q], self.layout[g]
+                self.stats.swap_passes += 1
+                self.stats.swapped_qubits += len(pairs)
+                self._report()
+
+            pending.append(gate)
+
+        if pending:
+            self._local_pass(pending)
+            self.stats.local_passes += 1
+            self.stats.gates_applied += len(pending)
+            self._report()
+
+    def _swaps(self, i: int, mixed: List[List[int]], uses: Dict[int, List[int]]) -> List[Tuple[int, int]]:
+        """(global, local) qubit pairs to exchange before gate i."""
+
+        def next_use(qubit):
+            positions = uses.get(qubit, [])
+            j = bisect_right(positions, i)
+            return positions[j] if j < len(positions) else float("inf")
+
+        needed = [q for q in mixed[i] if not self.is_local(q)]
+
+        # Global qubits mixed soonest by the following gates, to bring in while we pay for the pass anyway
+        upcoming: List[int] = []
+        for qubits in mixed[i + 1 : i + 1 + self.lookahead]:
+            upcoming.extend(q for q in qubits if not self.is_local(q) and q not in needed and q not in upcoming)
+
+        # Evict the local qubits used furthest in the future
+        candidates = [q for q in range(self.num_qubits) if self.is_local(q) and q not in mixed[i]]
+        candidates.sort(key=next_use, reverse=True)
+
+        pairs = list(zip(needed, candidates))
+        for incoming, outgoing in zip(upcoming, candidates[len(needed) :]):
+            if len(pairs) >= self.max_swap_qubits or next_use(incoming) >= next_use(outgoing):
+                break
+            pairs.append((incoming, outgoing))
+
+        return pairs
+
+    def probabilities(self, qubits: Sequence[int]) -> np.ndarray:
+        """Marginal probabilities of the measured qubits, indexed like ``Result.counts``, in one pass."""
+        probabilities = self._measure_pass(qubits)
+
+        self.stats.measure_passes += 1
+        self._report()
+        return probabilities
+
+    def statevector(self) -> np.ndarray:
+        """Reads the whole state into memory as a (2,) * n tensor, axis i being qubit i."""
+        n = self.num_qubits
+        state = self._amplitudes().reshape((2,) * n)
+
+        return np.transpose(state, [n - 1 - self.layout[q] for q in range(n)])
+
+    @abstractmethod
+    def _local_pass(self, gates: List[_Gate]):
+        """Applies gates which only mix local qubits to every slab."""
+
+    @abstractmethod
+    def _swap_pass(self, pairs: List[Tuple[int, int]]):
+        """Exchanges the index bits of the (global, local) qubit pairs, the layout is updated afterwards."""
+
+    @abstractmethod
+    def _measure_pass(self, qubits: Sequence[int]) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def _amplitudes(self) -> np.ndarray:
+        """Every amplitude, as a flat array indexed by the physical index."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _report(self):
+        if self.progress is not None:
+            self.progress(self.stats)
+
+
+class PartitionedProvider(Provider):
+    """Base of the providers simulating on a PartitionedStatevector, subclasses only create the state.
+
+    # Config
+    seed = seed for the measurement sampler.
+    lookahead = gates scanned ahead when picking which qubits are swapped.
+    max_diagonal_qubits = runs of diagonal gates over up to this many qubits are folded into one, 0 disables it.
+    precision = "complex64" or "complex128", defaults to the global precision.
+    progress = called with the IOStats of the running simulation after every pass.
+
+    # Properties
+    stats = IOStats of the last run.
+    """
+
+    def __init__(self, **config):
+        self.seed = config.get("seed", None)
+        self.lookahead = config.get("lookahead", 64)
+        self.max_diagonal_qubits = config.get("max_diagonal_qubits", 10)
+        self.precision = config.get("precision", None)
+        self.progress = config.get("progress", None)
+        self.rng = np.random.default_rng(self.seed)
+        self.stats = IOStats()
+        self._jobs: List[StatevectorJob] = []
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    @abstractmethod
+    def state(self, circuit: QC) -> PartitionedStatevector:
+        """The circuit's initial state, closed by ``run`` once the measurement probabilities are computed."""
+
+    def run(self, circuit: QC, times: int) -> StatevectorJob:
+        qubits = measured_qubits(circuit)
+
+        with self.state(circuit) as state:
+            self.stats = state.stats
+            state.apply(self._gates(circuit))
+            probabilities = state.probabilities(qubits)
+
+        histogram = sample_counts(probabilities, times, self.rng)
+        job = StatevectorJob(StatevectorResult.from_histogram(histogram, len(qubits)))
+
+        self._jobs.append(job)
+        return job
+
+    def _gates(self, circuit: QC) -> List[_Gate]:
+        gates = circuit.to_gates()
+        if self.max_diagonal_qubits > 0:
+            gates, _ = fuse_diagonal_gates(gates, self.max_diagonal_qubits)
+
+        return gates
+
+
+def mixed_qubits(gate: _Gate) -> List[int]:
+    """Qubits whose values the gate exchanges amplitudes between, its other qubits only select where it acts.
+
+    E.g. a diagonal gate mixes none and CNOT only mixes its target. For dense gates this is read off the matrix: a
+    qubit is mixed unless the matrix is block diagonal in it.
+    """
+    if gate.is_diagonal:
+        return []
+
+    patterns = PERMUTATION_GATES.get(type(gate))
+    if patterns is not None:
+        return [q for q, bit_0, bit_1 in zip(gate.qbits, *patterns) if bit_0 != bit_1]
+
+    qubits = gate_axes(gate)
+    k = len(qubits)
+    tensor = np.reshape(gate.matrix, (2,) * 2 * k)
+
+    mixed = []
+    for j, q in enumerate(qubits):
+        off_diagonal = [slice(None)] * 2 * k
+        off_diagonal[j], off_diagonal[k + j] = 0, 1
+        lower = list(off_diagonal)
+        lower[j], lower[k + j] = 1, 0
+        if np.any(tensor[tuple(off_diagonal)]) or np.any(tensor[tuple(lower)]):
+            mixed.append(q)
+
+    return mixed
+
+
+def apply_to_slab(slab: np.ndarray, gates: Sequence[_Gate], layout: Sequence[int], index: int) -> np.ndarray:
+    """Applies gates which only mix local qubits to slab number index, a (2,) * L tensor, in place when possible.
+
+    Axis a of the slab is index bit L - 1 - a.
+    """
+    state = slab
+    for gate in gates:
+        state = _apply_gate_to_slab(state, gate, layout, index)
+
+    if state is not slab:
+        slab[...] = state
+    return slab
+
+
+def _fixed_bits(qubits: Sequence[int], layout: Sequence[int], local_qubits: int, index: int):
+    """Splits qubits into the slab's values of the global ones, by position, and the axes of the local ones."""
+    fixed, axes = {}, []
+    for j, q in enumerate(qubits):
+        bit = layout[q]
+        if bit >= local_qubits:
+            fixed[j] = (index >> (bit - local_qubits)) & 1
+        else:
+            axes.append(local_qubits - 1 - bit)
+
+    return fixed, axes
+
+
+def _apply_gate_to_slab(state: np.ndarray, gate: _Gate, layout: Sequence[int], index: int) -> np.ndarray:
+    patterns = PERMUTATION_GATES.get(type(gate))
+    if patterns is not None:
+        fixed, axes = _fixed_bits(gate.qbits, layout, state.ndim, index)
+        if any(patterns[0][j] != bit for j, bit in fixed.items()):
+            return state
+        local = [tuple(b for j, b in enumerate(pattern) if j not in fixed) for pattern in patterns]
+        return apply_permutation(state, local, axes)
+
+    qubits = gate_axes(gate)
+    fixed, axes = _fixed_bits(qubits, layout, state.ndim, index)
+    k = len(qubits)
+
+    if gate.is_diagonal:
+        phases = np.reshape(gate.diagonal, (2,) * k)[tuple(fixed.get(j, slice(None)) for j in range(k))]
+        if not axes:
+            return np.multiply(state, state.dtype.type(phases), out=state)
+        return apply_diagonal(state, phases.reshape(-1), axes)
+
+    # Global qubits the gate doesn't mix select the block of its matrix acting on the local ones
+    block = tuple(fixed.get(j, slice(None)) for j in range(k)) * 2
+    matrix = np.reshape(gate.matrix, (2,) * 2 * k)[block]
+    if not axes:
+        return np.multiply(state, state.dtype.type(matrix), out=state)
+    return apply_matrix(state, matrix.reshape(2 ** len(axes), 2 ** len(axes)), axes)
+
+
+def local_outcomes(qubits: Sequence[int], layout: Sequence[int], local_qubits: int) -> np.ndarray:
+    """Outcome bits of the local measured qubits for every position of a slab, see ``slab_probabilities``."""
+    positions = np.arange(2 ** local_qubits)
+
+    outcomes = np.zeros(2 ** local_qubits, dtype=np.int64)
+    for j, q in enumerate(qubits):
+        if layout[q] < local_qubits:
+            outcomes |= ((positions >> layout[q]) & 1) << j
+
+    return outcomes
+
+
+def slab_probabilities(
+    slab: np.ndarray, qubits: Sequence[int], layout: Sequence[int], index: int, outcomes: np.ndarray
+) -> np.ndarray:
+    """Contribution of slab number index to the marginal probabilities of the measured qubits.
+
+    outcomes = ``local_outcomes(qubits, layout, L)``, shared by every slab.
+    """
+    local_qubits = outcomes.size.bit_length() - 1
+    global_outcome = sum(
+        ((index >> (layout[q] - local_qubits)) & 1) << j for j, q in enumerate(qubits) if layout[q] >= local_qubits
+    )
+
+    amplitudes = slab.reshape(-1)
+    weights = np.square(amplitudes.real) + np.square(amplitudes.imag)
+    return np.bincount(outcomes | global_outcome, weights=weights, minlength=2 ** len(qubits))
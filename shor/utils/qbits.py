@@ -1,13 +1,14 @@
 from collections import deque
-from typing import Deque, List
+from functools import lru_cache
+from typing import Deque, List, Sequence, Tuple
 
 import numpy as np
 
 
-def get_entangled_initial_state(initial_state, new_qubit_order):
+def get_entangled_initial_state(initial_state, new_qubit_order, dtype="complex64"):
     states_to_entangle: Deque[np.ndarray] = deque()
 
-    states = list(map(lambda s: np.asarray([1 if s == 0 else 0, 1 if s == 1 else 0], dtype="complex64"), initial_state))
+    states = list(map(lambda s: np.asarray([1 if s == 0 else 0, 1 if s == 1 else 0], dtype=dtype), initial_state))
 
     for q in new_qubit_order:
         states_to_entangle.append(states[q])
@@ -23,13 +24,45 @@ def get_entangled_initial_state(initial_state, new_qubit_order):
     return states_to_entangle.pop()
 
 
-def change_qubit_order(matrix: np.ndarray, old_order, new_order) -> np.ndarray:
+def change_qubit_order(matrix: np.ndarray, old_order: Sequence[int], new_order: Sequence[int]) -> np.ndarray:
+    """Reorders the qubits of a statevector (1d) or operator (2d) from old_order to new_order.
+
+    The array is viewed as a (2,) * n tensor and reordered with a single transpose, so there is no
+    per-index bit twiddling in Python and only one copy is made.
+    """
+    num_qubits = len(old_order)
+    axes = qubit_permutation(tuple(old_order), tuple(new_order))
+
+    if matrix.ndim == 1:
+        return np.transpose(matrix.reshape((2,) * num_qubits), axes).reshape(matrix.shape)
+
+    axes = axes + tuple(a + num_qubits for a in axes)
+    return np.transpose(matrix.reshape((2,) * 2 * num_qubits), axes).reshape(matrix.shape)
+
+
+@lru_cache(maxsize=256)
+def qubit_permutation(old_order: Tuple[int, ...], new_order: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Tensor axes permutation taking qubits in old_order to new_order."""
     reorder_qubits = [new_order.index(q2) for q2 in old_order]
-    initial_row_order = [i for i in range(np.power(2, len(old_order)))]
+    return tuple(int(a) for a in np.argsort(reorder_qubits))
 
-    reorder_rows = list(map(lambda i: rearrange_bits(i, reorder_qubits), initial_row_order))
 
-    return matrix[reorder_rows][:, reorder_rows]
+@lru_cache(maxsize=64)
+def qubit_permutation_indices(old_order: Tuple[int, ...], new_order: Tuple[int, ...]) -> np.ndarray:
+    """Index array equivalent of ``change_qubit_order``, i.e. ``vector[indices]`` reorders a statevector.
+
+    Computed with vectorized bit operations and cached per (old_order, new_order), treat as read-only.
+    """
+    num_qubits = len(old_order)
+    reorder_qubits = [new_order.index(q2) for q2 in old_order]
+
+    rows = np.arange(np.power(2, num_qubits))
+    indices = np.zeros_like(rows)
+    for position, bit in enumerate(reorder_qubits):
+        indices |= ((rows >> (num_qubits - 1 - bit)) & 1) << (num_qubits - 1 - position)
+
+    indices.setflags(write=False)
+    return indices
 
 
 def rearrange_bits(num: int, new_bit_order: List[int]):
@@ -51,5 +84,10 @@ def int_to_bit_string(i: int, sig_bits: int) -> str:
     return "{0:b}".format(i).zfill(sig_bits)
 
 
+def outcome_index(bits: np.ndarray) -> int:
+    """The integer whose bit j is bits[j], of any length, i.e. the ``Result.counts`` key of measured bits."""
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
 def has_common_qbits(gate1, gate2):
     return len(set(gate1.qubits).intersection(set(gate2.qubits))) > 0
@@ -0,0 +1,191 @@
+from typing import Callable, Dict, List, Sequence, Union
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, CSWAP, ID, SWAP, Cx, PauliX, _Gate
+
+# Basis states given as integers: a uint64 array for up to 64 qubits, Python ints of any size otherwise
+BasisStates = Union[np.ndarray, Sequence[int]]
+
+
+class BitSlicedStates(object):
+    """Many computational basis states of n qubits, evolved together through a reversible circuit.
+
+    The states are stored bit sliced: ``bits[q]`` holds qubit q of every state, packed 64 states to a uint64 word.
+    A reversible gate is then one or two bitwise operations over a row of words, e.g. CCNOT(a, b, t) is
+    ``bits[t] ^= bits[a] & bits[b]``, updating 64 states per instruction with no amplitudes at all.
+
+    Basis states are read and written as integers whose bit q is qubit q, matching the keys of ``Result.counts``.
+    """
+
+    def __init__(self, bits: np.ndarray, num_states: int):
+        self.bits = bits
+        self.num_states = num_states
+
+    @property
+    def num_qubits(self) -> int:
+        return self.bits.shape[0]
+
+    @classmethod
+    def from_integers(cls, states: BasisStates, num_qubits: int) -> "BitSlicedStates":
+        return cls.from_bits(integers_to_bits(states, num_qubits))
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "BitSlicedStates":
+        """From a (num_states, num_qubits) array of bits."""
+        num_states = bits.shape[0]
+        words = -(-num_states // 64)
+
+        packed = np.zeros((bits.shape[1], words * 8), dtype=np.uint8)
+        packed[:, : -(-num_states // 8)] = np.packbits(bits.T.astype(bool), axis=1, bitorder="little")
+        return cls(packed.view(np.uint64), num_states)
+
+    @classmethod
+    def every_input(
+        cls, num_qubits: int, inputs: Sequence[int] = None, initial_state: Sequence[int] = None
+    ) -> "BitSlicedStates":
+        """Every assignment of the input qubits, state x setting inputs[j] to bit j of x.
+
+        The other qubits take their value in initial_state, 0 by default. inputs defaults to every qubit.
+        """
+        if inputs is None:
+            inputs = list(range(num_qubits))
+        initial_state = list(initial_state or []) + [0] * (num_qubits - len(initial_state or []))
+
+        num_states = 2 ** len(inputs)
+        words = -(-num_states // 64)
+        bits = np.zeros((num_qubits, words), dtype=np.uint64)
+        for q, value in enumerate(initial_state):
+            if value == 1:
+                bits[q] = ~np.uint64(0)
+
+        for j, q in enumerate(inputs):
+            if j < 6:
+                # Bit j of the index within a word, the same word repeated
+                pattern = sum(1 << i for i in range(64) if (i >> j) & 1)
+                bits[q] = np.uint64(pattern)
+            else:
+                # Whole words alternate in runs of 2^(j - 6)
+                bits[q] = np.where((np.arange(words) >> (j - 6)) & 1, ~np.uint64(0), np.uint64(0))
+
+        if num_states < 64:
+            bits &= np.uint64((1 << num_states) - 1)
+
+        return cls(bits, num_states)
+
+    def copy(self) -> "BitSlicedStates":
+        return BitSlicedStates(self.bits.copy(), self.num_states)
+
+    def apply_gate(self, gate: _Gate):
+        try:
+            apply = REVERSIBLE_GATES[type(gate)]
+        except KeyError:
+            raise CircuitError("The '{}' gate is not a classical reversible gate".format(gate.symbol)) from None
+
+        apply(self.bits, *gate.qbits)
+
+    def apply(self, gates: Sequence[_Gate]):
+        for gate in gates:
+            self.apply_gate(gate)
+
+    def to_bits(self, qubits: Sequence[int] = None) -> np.ndarray:
+        """A (num_states, len(qubits)) array of bits, column j being qubits[j], every qubit by default."""
+        if qubits is None:
+            qubits = list(range(self.num_qubits))
+
+        rows = np.ascontiguousarray(self.bits[list(qubits)]).view(np.uint8)
+        return np.unpackbits(rows, axis=1, count=self.num_states, bitorder="little").T
+
+    def to_integers(self, qubits: Sequence[int] = None) -> BasisStates:
+        """Every state as an integer whose bit j is qubits[j], see ``bits_to_integers``."""
+        return bits_to_integers(self.to_bits(qubits))
+
+
+def integers_to_bits(states: BasisStates, num_qubits: int) -> np.ndarray:
+    """A (len(states), num_qubits) array of bits, bit q of each state in column q."""
+    if num_qubits <= 64:
+        states = np.asarray(states, dtype=np.uint64)
+        return ((states[:, np.newaxis] >> np.arange(num_qubits, dtype=np.uint64)) & np.uint64(1)).astype(np.uint8)
+
+    num_bytes = -(-num_qubits // 8)
+    data = b"".join(int(state).to_bytes(num_bytes, "little") for state in states)
+    as_bytes = np.frombuffer(data, dtype=np.uint8).reshape(-1, num_bytes)
+    return np.unpackbits(as_bytes, axis=1, count=num_qubits, bitorder="little")
+
+
+def bits_to_integers(bits: np.ndarray) -> BasisStates:
+    """Inverse of ``integers_to_bits``: a uint64 array for up to 64 columns, a list of Python ints otherwise."""
+    if bits.shape[1] <= 64:
+        weights = np.uint64(1) << np.arange(bits.shape[1], dtype=np.uint64)
+        return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+
+def _x(bits: np.ndarray, a: int):
+    np.invert(bits[a], out=bits[a])
+
+
+def _cnot(bits: np.ndarray, c: int, t: int):
+    bits[t] ^= bits[c]
+
+
+def _ccnot(bits: np.ndarray, a: int, b: int, t: int):
+    bits[t] ^= bits[a] & bits[b]
+
+
+def _swap(bits: np.ndarray, a: int, b: int):
+    bits[[a, b]] = bits[[b, a]]
+
+
+def _cswap(bits: np.ndarray, c: int, a: int, b: int):
+    delta = bits[c] & (bits[a] ^ bits[b])
+    bits[a] ^= delta
+    bits[b] ^= delta
+
+
+# How each classical reversible gate updates the bit slices, called with the gate's qubits. The controls come
+# first, as in ``shor.utils.statevector.PERMUTATION_GATES``.
+REVERSIBLE_GATES: Dict[type, Callable] = {
+    PauliX: _x,
+    CNOT: _cnot,
+    Cx: _cnot,
+    CCNOT: _ccnot,
+    SWAP: _swap,
+    CSWAP: _cswap,
+    ID: lambda bits, *qubits: None,
+}
+
+
+def is_reversible(gates: List[_Gate]) -> bool:
+    """Whether every gate only permutes basis states, so the circuit is a reversible boolean function."""
+    return all(type(gate) in REVERSIBLE_GATES for gate in gates)
+
+
+def is_reversible_circuit(circuit) -> bool:
+    """Whether the circuit starts in a computational basis state and only has reversible gates."""
+    return all(state in (0, 1) for state in circuit.initial_state()) and is_reversible(circuit.to_gates())
+
+
+def evaluate(gates: Sequence[_Gate], states: BasisStates, num_qubits: int) -> BasisStates:
+    """The basis state each input basis state is mapped to, all of them evaluated at once."""
+    sliced = BitSlicedStates.from_integers(states, num_qubits)
+    sliced.apply(gates)
+    return sliced.to_integers()
+
+
+def tabulate(
+    gates: Sequence[_Gate],
+    num_qubits: int,
+    inputs: Sequence[int] = None,
+    outputs: Sequence[int] = None,
+    initial_state: Sequence[int] = None,
+) -> BasisStates:
+    """Truth table of a reversible circuit: entry x is the outputs' value (bit j is outputs[j]) when the input
+    qubits read x (bit j being inputs[j]) and every other qubit its initial state. Both default to every qubit.
+    """
+    sliced = BitSlicedStates.every_input(num_qubits, inputs, initial_state)
+    sliced.apply(gates)
+    return sliced.to_integers(outputs)
@@ -0,0 +1,251 @@
+from collections import Counter
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import CNOT, CY, ID, SWAP, Cx, Cz, Hadamard, Init_x, Init_y, PauliX, PauliY, PauliZ, S, Sdg, _Gate
+from shor.utils.qbits import outcome_index
+
+# Number of set bits of every byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Outcomes of up to 2^MAX_ENUMERATED_RANDOM_BITS equally likely values are drawn as one multinomial histogram
+MAX_ENUMERATED_RANDOM_BITS = 16
+
+
+class Tableau(object):
+    """Stabilizer state of n qubits as an Aaronson-Gottesman tableau.
+
+    Rows 0..n-1 are the destabilizers and rows n..2n-1 the stabilizers. Row i is the Pauli (-1)^r[i] times the
+    product over qubits q of X^x[i, q] Z^z[i, q], with the x and z bits of each row packed 64 qubits to a uint64.
+    Gates update whole columns across every row at once, in O(n) per gate.
+    """
+
+    def __init__(self, num_qubits: int):
+        self.num_qubits = num_qubits
+        words = max(1, -(-num_qubits // 64))
+
+        self.x = np.zeros((2 * num_qubits, words), dtype=np.uint64)
+        self.z = np.zeros((2 * num_qubits, words), dtype=np.uint64)
+        self.r = np.zeros(2 * num_qubits, dtype=np.uint64)
+
+        # |0...0>, destabilized by X_q and stabilized by Z_q
+        for q in range(num_qubits):
+            self.x[q, q // 64] = 1 << (q % 64)
+            self.z[num_qubits + q, q // 64] = 1 << (q % 64)
+
+    def copy(self) -> "Tableau":
+        tableau = Tableau.__new__(Tableau)
+        tableau.num_qubits = self.num_qubits
+        tableau.x, tableau.z, tableau.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return tableau
+
+    def _column(self, bits: np.ndarray, qubit: int) -> np.ndarray:
+        return (bits[:, qubit // 64] >> (qubit % 64)) & 1
+
+    def _flip(self, bits: np.ndarray, qubit: int, mask: np.ndarray):
+        bits[:, qubit // 64] ^= mask << (qubit % 64)
+
+    def apply_gate(self, gate: _Gate):
+        try:
+            apply = CLIFFORD_GATES[type(gate)]
+        except KeyError:
+            raise CircuitError("The '{}' gate is not a Clifford gate".format(gate.symbol)) from None
+
+        apply(self, *gate.qbits)
+
+    def apply(self, gates: Sequence[_Gate]):
+        for gate in gates:
+            self.apply_gate(gate)
+
+    def h(self, a: int):
+        xa, za = self._column(self.x, a), self._column(self.z, a)
+        self.r ^= xa & za
+        self._flip(self.x, a, xa ^ za)
+        self._flip(self.z, a, xa ^ za)
+
+    def s(self, a: int):
+        xa, za = self._column(self.x, a), self._column(self.z, a)
+        self.r ^= xa & za
+        self._flip(self.z, a, xa)
+
+    def sdg(self, a: int):
+        xa, za = self._column(self.x, a), self._column(self.z, a)
+        self.r ^= xa & (za ^ 1)
+        self._flip(self.z, a, xa)
+
+    def pauli_x(self, a: int):
+        self.r ^= self._column(self.z, a)
+
+    def pauli_y(self, a: int):
+        self.r ^= self._column(self.x, a) ^ self._column(self.z, a)
+
+    def pauli_z(self, a: int):
+        self.r ^= self._column(self.x, a)
+
+    def cnot(self, a: int, b: int):
+        xa, za = self._column(self.x, a), self._column(self.z, a)
+        xb, zb = self._column(self.x, b), self._column(self.z, b)
+        self.r ^= xa & zb & (xb ^ za ^ 1)
+        self._flip(self.x, b, xa)
+        self._flip(self.z, a, zb)
+
+    def cz(self, a: int, b: int):
+        self.h(b)
+        self.cnot(a, b)
+        self.h(b)
+
+    def cy(self, a: int, b: int):
+        self.sdg(b)
+        self.cnot(a, b)
+        self.s(b)
+
+    def swap(self, a: int, b: int):
+        for bits in (self.x, self.z):
+            delta = self._column(bits, a) ^ self._column(bits, b)
+            self._flip(bits, a, delta)
+            self._flip(bits, b, delta)
+
+    def measurement_record(self, qubits: Sequence[int]) -> np.ndarray:
+        """Z basis measurement of the qubits, in order, as an affine map over GF(2) of k independent random bits.
+
+        Returns a (m, 1 + k) boolean array, outcome j is ``record[j, 0] ^ (record[j, 1:] . bits)`` for uniformly
+        random bits. The tableau is measured with symbolic phases: a random measurement sets its stabilizer's phase
+        to a new bit, and as products of rows only ever XOR their phases, every later phase stays affine in them.
+        The tableau itself is left untouched.
+        """
+        n, m = self.num_qubits, len(qubits)
+        x, z = self.x.copy(), self.z.copy()
+
+        # Phases are packed like the x and z bits: bit 0 is the constant, bit k the k-th random bit
+        r = np.zeros((2 * n, 1 + m // 64), dtype=np.uint64)
+        r[:, 0] = self.r
+
+        record = np.zeros((m, r.shape[1]), dtype=np.uint64)
+        num_random = 0
+        for j, a in enumerate(qubits):
+            word, bit = divmod(a, 64)
+            anticommuting = ((x[:, word] >> bit) & 1).astype(bool)
+            stabilizers = np.flatnonzero(anticommuting[n:])
+
+            if stabilizers.size:
+                # Random outcome: multiply the first anticommuting stabilizer into every other anticommuting row,
+                # it then becomes a destabilizer and Z_a (with a fresh random sign) replaces it
+                p = n + stabilizers[0]
+                rows = np.flatnonzero(anticommuting)
+                rows = rows[rows != p]
+                _rowsum(x, z, r, rows, p)
+
+                x[p - n], z[p - n], r[p - n] = x[p], z[p], r[p]
+                x[p], z[p], r[p] = 0, 0, 0
+                z[p, word] = np.uint64(1 << bit)
+                num_random += 1
+                r[p, num_random // 64] = np.uint64(1 << (num_random % 64))
+                record[j] = r[p]
+            else:
+                # Deterministic outcome: Z_a is the product of the stabilizers paired with the destabilizers
+                # anticommuting with it, its sign is the outcome
+                rows = np.flatnonzero(anticommuting[:n]) + n
+                record[j] = _product_sign(x[rows], z[rows], r[rows])
+
+        record = np.unpackbits(record.view(np.uint8), axis=1, bitorder="little").astype(bool)
+        return record[:, : 1 + num_random]
+
+    def sample(self, qubits: Sequence[int], shots: int, rng: np.random.Generator) -> Counter:
+        """Measurement counts of shots Z basis measurements of the qubits, bit j of an outcome being qubits[j].
+
+        The outcomes are uniformly distributed over the affine subspace of ``measurement_record``: with few random
+        bits every outcome is enumerated and counted by one multinomial draw, otherwise the random bits of all
+        shots are drawn at once and mapped through the record by a single matrix product.
+        """
+        record = self.measurement_record(qubits)
+        constant, generators = record[:, 0], record[:, 1:]
+        num_random = generators.shape[1]
+
+        if num_random <= MAX_ENUMERATED_RANDOM_BITS:
+            indices = np.arange(2 ** num_random)
+            frequencies = rng.multinomial(shots, np.full(indices.size, 1 / indices.size))
+            bits = ((indices[frequencies > 0, np.newaxis] >> np.arange(num_random)) & 1).astype(np.uint8)
+            frequencies = frequencies[frequencies > 0]
+        else:
+            bits, frequencies = rng.integers(0, 2, size=(shots, num_random), dtype=np.uint8), None
+
+        # Sums of at most num_random bits are exact in float32, so BLAS does the GF(2) product
+        parities = (bits.astype(np.float32) @ generators.T.astype(np.float32)).astype(np.int64) & 1
+        outcomes = parities.astype(bool) ^ constant
+
+        outcomes, inverse = np.unique(outcomes, axis=0, return_inverse=True)
+        counts = np.bincount(inverse.reshape(-1), weights=frequencies, minlength=len(outcomes)).astype(np.int64)
+
+        return Counter({outcome_index(outcome): int(count) for outcome, count in zip(outcomes, counts) if count})
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a (..., W) uint64 array, by byte through a lookup table."""
+    return _POPCOUNT[np.ascontiguousarray(words).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def product_phase(x1: np.ndarray, z1: np.ndarray, x2: np.ndarray, z2: np.ndarray) -> np.ndarray:
+    """Exponent of i, mod 4, picked up multiplying the Pauli (x1, z1) into (x2, z2), per row.
+
+    Every qubit contributes -1, 0 or 1, the qubits contributing each are found with bitwise logic over the packed
+    words and counted.
+    """
+    positive = (x1 & z1 & z2 & ~x2) | (x1 & ~z1 & x2 & z2) | (~x1 & z1 & x2 & ~z2)
+    negative = (x1 & z1 & x2 & ~z2) | (x1 & ~z1 & ~x2 & z2) | (~x1 & z1 & x2 & z2)
+    return (popcount(positive) - popcount(negative)) % 4
+
+
+def _rowsum(x: np.ndarray, z: np.ndarray, r: np.ndarray, rows: np.ndarray, p: int):
+    """Multiplies row p into every row of rows at once."""
+    phase = product_phase(x[p], z[p], x[rows], z[rows])
+
+    x[rows] ^= x[p]
+    z[rows] ^= z[p]
+    r[rows] ^= r[p]
+    r[rows, 0] ^= (phase // 2).astype(np.uint64)
+
+
+def _product_sign(x: np.ndarray, z: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Symbolic sign of the product of commuting rows, multiplied pairwise in log2(rows) vectorized rounds."""
+    while len(x) > 1:
+        half = len(x) // 2
+        phase = product_phase(x[half : 2 * half], z[half : 2 * half], x[:half], z[:half])
+
+        signs = r[:half] ^ r[half : 2 * half]
+        signs[:, 0] ^= (phase // 2).astype(np.uint64)
+
+        x = np.concatenate([x[:half] ^ x[half : 2 * half], x[2 * half :]])
+        z = np.concatenate([z[:half] ^ z[half : 2 * half], z[2 * half :]])
+        r = np.concatenate([signs, r[2 * half :]])
+
+    return r[0]
+
+
+# How each Clifford gate class updates the tableau, called with the gate's qubits
+CLIFFORD_GATES: Dict[type, Callable] = {
+    Hadamard: Tableau.h,
+    Init_x: Tableau.h,
+    Init_y: lambda tableau, a: (tableau.h(a), tableau.s(a)),
+    S: Tableau.s,
+    Sdg: Tableau.sdg,
+    PauliX: Tableau.pauli_x,
+    PauliY: Tableau.pauli_y,
+    PauliZ: Tableau.pauli_z,
+    ID: lambda tableau, *qubits: None,
+    CNOT: Tableau.cnot,
+    Cx: Tableau.cnot,
+    Cz: Tableau.cz,
+    CY: Tableau.cy,
+    SWAP: Tableau.swap,
+}
+
+
+def is_clifford(gates: List[_Gate]) -> bool:
+    """Whether every gate is one the stabilizer tableau can apply."""
+    return all(type(gate) in CLIFFORD_GATES for gate in gates)
+
+
+def is_clifford_circuit(circuit) -> bool:
+    return is_clifford(circuit.to_gates())
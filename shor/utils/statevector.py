@@ -0,0 +1,335 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, CSWAP, SWAP, Cx, PauliX, _Gate, gate_matrix
+from shor.utils.collections import flatten
+from shor.utils.precision import Precision, resolve_precision
+from shor.utils.qbits import get_entangled_initial_state
+
+# Gates which only permute basis states, as the two patterns of their qubits' bits whose amplitudes they exchange.
+# E.g. CNOT(c, t) swaps the amplitudes where c = 1, t = 0 with those where c = 1, t = 1.
+PERMUTATION_GATES = {
+    PauliX: ((0,), (1,)),
+    CNOT: ((1, 0), (1, 1)),
+    Cx: ((1, 0), (1, 1)),
+    SWAP: ((0, 1), (1, 0)),
+    CCNOT: ((1, 1, 0), (1, 1, 1)),
+    CSWAP: ((1, 0, 1), (1, 1, 0)),
+}
+
+# States with fewer amplitudes per slab are updated on the calling thread, splitting them costs more than it saves
+MIN_SLAB_AMPLITUDES = 2 ** 14
+
+# Thread pools shared by every simulation, by number of threads
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+
+
+def num_circuit_qubits(circuit) -> int:
+    """Number of qubits a circuit acts on.
+
+    Qubits declared with a ``Qbits`` layer come first, any qubit referenced by a gate or measurement beyond
+    those is added in the |0> state.
+    """
+    num_qubits = len(circuit.initial_state())
+    for gate_or_op in circuit.to_gates(include_operations=True):
+        qbits = flatten(gate_or_op.qbits)
+        if qbits:
+            num_qubits = max(num_qubits, max(qbits) + 1)
+
+    return num_qubits
+
+
+def measured_qubits(circuit) -> List[int]:
+    qubits = flatten(circuit.measure_bits())
+    if len(set(qubits)) != len(qubits):
+        raise CircuitError("Each qubit can only be measured once, got: {}".format(qubits))
+
+    return qubits
+
+
+def initial_statevector(circuit, num_qubits: int = None, precision: Precision = None) -> np.ndarray:
+    """The circuit's initial state as a (2,) * n tensor, axis i is qubit i.
+
+    precision = the state's complex dtype, which every gate applied to it keeps. Defaults to the global precision.
+    """
+    initial_state = circuit.initial_state()
+    if num_qubits is None:
+        num_qubits = num_circuit_qubits(circuit)
+    initial_state = initial_state + [0] * (num_qubits - len(initial_state))
+
+    state = get_entangled_initial_state(initial_state, list(range(num_qubits)), resolve_precision(precision))
+    return np.reshape(state, (2,) * num_qubits)
+
+
+def gate_axes(gate: _Gate) -> List[int]:
+    # Cx.to_matrix() is written with its qubits in qiskit (little endian) order,
+    # every other gate matrix has its first qubit as the most significant bit.
+    if isinstance(gate, Cx):
+        return gate.qbits[::-1]
+    return gate.qbits
+
+
+def apply_matrix(state: np.ndarray, matrix: np.ndarray, axes: Sequence[int]) -> np.ndarray:
+    """Applies a 2^k x 2^k matrix to k axes of a (2,) * n state tensor.
+
+    The matrix is contracted against the target axes only, so the full 2^n x 2^n operator is never built.
+    """
+    k = len(axes)
+    tensor = np.reshape(_as_state_dtype(matrix, state), (2,) * 2 * k)
+    result = np.tensordot(tensor, state, axes=(list(range(k, 2 * k)), list(axes)))
+
+    return np.moveaxis(result, list(range(k)), list(axes))
+
+
+def apply_permutation(state: np.ndarray, patterns, axes: Sequence[int]) -> np.ndarray:
+    """Exchanges the amplitudes where the given axes read patterns[0] with those where they read patterns[1].
+
+    The state is updated in place by slicing, without any arithmetic, and returned.
+    """
+    if not state.flags.writeable:
+        state = state.copy()
+
+    index_0 = [slice(None)] * state.ndim
+    index_1 = [slice(None)] * state.ndim
+    for axis, bit_0, bit_1 in zip(axes, *patterns):
+        index_0[axis] = bit_0
+        index_1[axis] = bit_1
+    index_0, index_1 = tuple(index_0), tuple(index_1)
+
+    swapped = state[index_0].copy()
+    state[index_0] = state[index_1]
+    state[index_1] = swapped
+
+    return state
+
+
+def apply_diagonal(state: np.ndarray, diagonal: np.ndarray, axes: Sequence[int]) -> np.ndarray:
+    """Multiplies a (2,) * n state tensor by a diagonal operator on the given axes, in place when possible.
+
+    diagonal holds the 2^k diagonal entries, the first axis being the most significant bit like gate matrices.
+    It is broadcast against the state, so only one element-wise multiply is done per amplitude.
+    """
+    k = len(axes)
+    phases = np.transpose(np.reshape(_as_state_dtype(diagonal, state), (2,) * k), np.argsort(axes))
+
+    shape = [1] * state.ndim
+    for axis in axes:
+        shape[axis] = 2
+    phases = phases.reshape(shape)
+
+    if state.flags.writeable and state.dtype.kind == "c":
+        return np.multiply(state, phases, out=state)
+    return state * phases
+
+
+def apply_gate(state: np.ndarray, gate: _Gate) -> np.ndarray:
+    """Applies a gate to a (2,) * n state tensor. Permutation and diagonal gates update the state in place."""
+    patterns = PERMUTATION_GATES.get(type(gate))
+    if patterns is not None:
+        return apply_permutation(state, patterns, gate.qbits)
+    if gate.is_diagonal:
+        return apply_diagonal(state, gate.diagonal, gate_axes(gate))
+
+    return apply_matrix(state, _gate_matrix(gate, state.dtype), gate_axes(gate))
+
+
+def _gate_matrix(gate: _Gate, dtype: np.dtype) -> np.ndarray:
+    # Cached per dtype for the built-in gates, gates with their own matrix (e.g. fused blocks) are cast on use
+    if dtype.kind != "c" or type(gate).matrix is not _Gate.matrix:
+        return gate.matrix
+    return gate_matrix(gate, dtype)
+
+
+def _as_state_dtype(operand: np.ndarray, state: np.ndarray) -> np.ndarray:
+    # Keep complex64 states complex64 instead of letting the complex128 operand upcast every amplitude
+    if state.dtype.kind == "c" and operand.dtype != state.dtype:
+        return operand.astype(state.dtype)
+    return operand
+
+
+def simulate(circuit, gates: List[_Gate] = None, precision: Precision = None, num_threads: int = 1) -> np.ndarray:
+    """Evolves the circuit's initial state through its gates, returning the final state tensor.
+
+    gates defaults to ``circuit.to_gates()``, pass it to simulate an optimized gate list instead.
+    precision = complex64 or complex128, defaults to the global precision.
+    num_threads = threads every gate is applied with, see ``evolve``.
+    """
+    state = initial_statevector(circuit, precision=precision)
+    return evolve(state, circuit.to_gates() if gates is None else gates, num_threads)
+
+
+def evolve(state: np.ndarray, gates: List[_Gate], num_threads: int = 1) -> np.ndarray:
+    """Applies the gates to a (2,) * n state tensor in order.
+
+    With num_threads > 1 every gate is applied to independent slabs of the state in parallel: the state is split
+    along axes the gate doesn't act on, so each slab holds every amplitude the gate mixes together. NumPy releases
+    the GIL while it works on each slab, so the threads run on separate cores.
+    """
+    num_slabs = min(num_threads, state.size // MIN_SLAB_AMPLITUDES)
+    if num_slabs <= 1:
+        for gate in gates:
+            state = apply_gate(state, gate)
+        return state
+
+    if not state.flags.writeable:
+        state = state.copy()
+
+    executor = thread_pool(num_threads)
+    for gate in gates:
+        slabs = slab_indices(state.ndim, flatten(gate.qbits), num_slabs)
+        for future in [executor.submit(_apply_to_slab, state, gate, index) for index in slabs]:
+            future.result()
+
+    return state
+
+
+def slab_indices(ndim: int, axes: Sequence[int], num_slabs: int) -> List[tuple]:
+    """Indices splitting a (2,) * ndim tensor into at least num_slabs views along axes not in axes.
+
+    The split axes are kept with length 1, so the gate's axes are the same in every slab. The leading free axes
+    are split, which keeps each slab in as few contiguous runs of memory as possible.
+    """
+    free = [axis for axis in range(ndim) if axis not in axes]
+    split = free[: (num_slabs - 1).bit_length()]
+
+    slabs = []
+    for bits in product((0, 1), repeat=len(split)):
+        index = [slice(None)] * ndim
+        for axis, bit in zip(split, bits):
+            index[axis] = slice(bit, bit + 1)
+        slabs.append(tuple(index))
+
+    return slabs
+
+
+def thread_pool(num_threads: int) -> ThreadPoolExecutor:
+    if num_threads not in _EXECUTORS:
+        _EXECUTORS[num_threads] = ThreadPoolExecutor(num_threads, thread_name_prefix="shor-statevector")
+    return _EXECUTORS[num_threads]
+
+
+def _apply_to_slab(state: np.ndarray, gate: _Gate, index: tuple):
+    slab = state[index]
+    result = apply_gate(slab, gate)
+
+    # Permutations and diagonals update the slab in place, dense gates return a new array
+    if result is not slab:
+        slab[...] = result
+
+
+def unitary(gates: List[_Gate], num_qubits: int, chunk_size: int = None) -> np.ndarray:
+    """The 2^n x 2^n unitary of a gate list, with qubit 0 as the most significant bit like gate matrices.
+
+    Columns are computed by evolving basis states with the same kernels as the simulator, chunk_size columns at
+    a time (all at once by default), with a trailing column axis on the state tensor.
+    """
+    dimension = 2 ** num_qubits
+    chunk_size = dimension if chunk_size is None else max(1, min(chunk_size, dimension))
+
+    matrix = np.empty((dimension, dimension), dtype="complex128")
+    for start in range(0, dimension, chunk_size):
+        columns = min(chunk_size, dimension - start)
+
+        basis = np.zeros((dimension, columns), dtype="complex128")
+        basis[np.arange(start, start + columns), np.arange(columns)] = 1
+
+        states = evolve(basis.reshape((2,) * num_qubits + (columns,)), gates)
+        matrix[:, start : start + columns] = states.reshape(dimension, columns)
+
+    return matrix
+
+
+def batch_initial_states(num_qubits: int, initial_states, precision: Precision = None) -> np.ndarray:
+    """Builds a (B, 2, ..., 2) batch of states.
+
+    initial_states is either a sequence of computational basis indices or a (B, 2^n) array of amplitudes. Both
+    are indexed like ``Result.counts``, i.e. bit j of an index is qubit j.
+    """
+    initial_states = np.asarray(initial_states)
+    dtype = resolve_precision(precision)
+
+    if initial_states.ndim == 1:
+        indices = initial_states.astype(np.int64)
+        states = np.zeros((indices.size,) + (2,) * num_qubits, dtype=dtype)
+        bits = (indices[:, np.newaxis] >> np.arange(num_qubits)) & 1
+        states[(np.arange(indices.size),) + tuple(bits.T)] = 1
+        return states
+
+    if initial_states.shape[1:] != (2 ** num_qubits,):
+        raise CircuitError(
+            "Expected initial states of length {}, got shape {}".format(2 ** num_qubits, initial_states.shape)
+        )
+
+    states = initial_states.astype(dtype).reshape((-1,) + (2,) * num_qubits)
+    return np.transpose(states, [0] + list(range(num_qubits, 0, -1)))
+
+
+def apply_batch_matrices(states: np.ndarray, matrices: np.ndarray, axes: Sequence[int]) -> np.ndarray:
+    """Applies matrices[b] to the given qubit axes of states[b] for every b of a (B, 2, ..., 2) batch.
+
+    The target axes are moved last, so the whole batch is one (B, R, 2^k) x (B, 2^k, 2^k) matmul.
+    """
+    k = len(axes)
+    source = [a + 1 for a in axes]
+    target = list(range(states.ndim - k, states.ndim))
+
+    moved = np.moveaxis(states, source, target)
+    result = np.matmul(moved.reshape(states.shape[0], -1, 2 ** k), np.swapaxes(_as_state_dtype(matrices, states), 1, 2))
+
+    return np.moveaxis(result.reshape(moved.shape), target, source)
+
+
+def evolve_batch(states: np.ndarray, gates: List[_Gate], bindings: Sequence = None) -> np.ndarray:
+    """Applies the gates to every state of a (B, 2, ..., 2) batch at once.
+
+    Gates are shared by the whole batch, except parameterized gates which are bound to bindings[b] for state b.
+    """
+    for gate in gates:
+        axes = gate_axes(gate)
+        if type(gate) in PERMUTATION_GATES:
+            states = apply_permutation(states, PERMUTATION_GATES[type(gate)], [a + 1 for a in gate.qbits])
+        elif bindings is not None and gate.free_parameters:
+            # Built directly, a sweep's one-off matrices would only flush the shared matrix cache
+            matrices = np.stack([gate.bind(binding).to_matrix() for binding in bindings])
+            states = apply_batch_matrices(states, matrices, axes)
+        elif gate.is_diagonal:
+            states = apply_diagonal(states, gate.diagonal, [a + 1 for a in axes])
+        else:
+            states = apply_matrix(states, gate.matrix, [a + 1 for a in axes])
+
+    return states
+
+
+def measurement_probabilities(state: np.ndarray, qubits: Sequence[int]) -> np.ndarray:
+    """Marginal probabilities of the measured qubits.
+
+    Index i of the returned vector is the outcome where measured qubit j reads bit j of i,
+    matching the keys of ``Result.counts``.
+    """
+    return batch_measurement_probabilities(state[np.newaxis], qubits)[0]
+
+
+def batch_measurement_probabilities(states: np.ndarray, qubits: Sequence[int]) -> np.ndarray:
+    """``measurement_probabilities`` for every state of a (B, 2, ..., 2) batch, returns a (B, 2^k) array."""
+    probabilities = np.square(states.real) + np.square(states.imag)
+
+    other_axes = tuple(a + 1 for a in range(states.ndim - 1) if a not in qubits)
+    marginal = probabilities.sum(axis=other_axes)
+
+    remaining = sorted(qubits)
+    marginal = np.transpose(marginal, [0] + [remaining.index(q) + 1 for q in reversed(qubits)])
+
+    return marginal.reshape(states.shape[0], -1)
+
+
+def sample_counts(probabilities: np.ndarray, num_shots: int, rng: np.random.Generator) -> np.ndarray:
+    """Samples num_shots measurement outcomes in a single multinomial draw, returning the dense histogram.
+
+    A (B, 2^k) array of probabilities is sampled row by row, returning B histograms.
+    """
+    probabilities = np.asarray(probabilities, dtype="float64")
+    return rng.multinomial(num_shots, probabilities / probabilities.sum(axis=-1, keepdims=True))
@@ -18,6 +18,18 @@ def test_single_qubit():
     assert result[bin(1)] > 450
 
 
+def test_ibmq_honours_initial_states():
+    circuit = Circuit()
+    circuit.add(Qubits(2, state=1))
+    circuit.add(Hadamard(0))
+    circuit.add(Hadamard(0))
+    circuit.add(Measure([0, 1]))
+
+    # Same counts as the default local provider, both start in |11>
+    assert circuit.run(1024, provider=IBMQProvider()).result.counts.get(3) == 1024
+    assert circuit.run(1024).result.counts.get(3) == 1024
+
+
 def test_entanglement():
     circuit = Circuit()
     circuit.add(Qubits(2))
@@ -53,7 +65,8 @@ def test_unitary_symmetry_does_nothing():
     result_2 = symmetric_circuit_2.run(1024).result
 
     assert result_1.counts.get(0) == 1024
-    assert result_2.counts.get(0) == 1024
+    # Qubits(2, state=1) starts in |11>, which the symmetric gates leave untouched
+    assert result_2.counts.get(3) == 1024
 
 
 def test_multi_entangle():
@@ -1,7 +1,6 @@
 import math
 
 import numpy as np
-import pytest
 
 from shor.gates import (
     CCNOT,
@@ -278,7 +277,6 @@ def test_cr_int():
     assert result["11"] == 0
 
 
-@pytest.mark.xfail(reason="Not implemented by qiskit. Quantum-inspire does implement this")
 def test_crk_int():
     circuit = Circuit()
     circuit.add(Qubits(2))
@@ -379,7 +377,6 @@ def test_switch_input_int():
     assert result_1["10"] == 0
 
 
-@pytest.mark.xfail(reason="Not implemented by qiskit. Quantum-inspire does implement this")
 def test_initx_int():
     circuit_1 = Circuit()
     circuit_1.add(Qubits(1))
@@ -392,7 +389,6 @@ def test_initx_int():
     assert result_1["1"] > 450
 
 
-@pytest.mark.xfail(reason="Not implemented by qiskit. Quantum-inspire does implement this")
 def test_inity_int():
     circuit_1 = Circuit()
     circuit_1.add(Qubits(1))
@@ -405,7 +401,6 @@ def test_inity_int():
     assert result_1["1"] > 450
 
 
-@pytest.mark.xfail(reason="Not implemented by qiskit. Quantum-inspire does implement this")
 def test_QFT():
     qbits = Qbits(4)
     X = Circuit()
@@ -0,0 +1,84 @@
+import asyncio
+
+from shor.gates import CNOT, H, PauliX
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers.base import Job, Provider
+from shor.providers.ProcessPool import ProcessPoolProvider
+from shor.providers.Statevector import StatevectorProvider
+from shor.quantum import Circuit
+
+
+def basis_circuit(i):
+    return Circuit().add(Qubits(3)).add(PauliX(i)).add(Measure([0, 1, 2]))
+
+
+def test_circuit_run_async():
+    async def main():
+        job = await basis_circuit(1).run_async(100)
+        return await job.result_async()
+
+    assert asyncio.run(main()).counts == {2: 100}
+
+
+def test_gather_many_runs():
+    async def main():
+        provider = StatevectorProvider()
+        jobs = await asyncio.gather(*(basis_circuit(i).run_async(10, provider=provider) for i in range(3)))
+        return [(await job.result_async()).counts for job in jobs]
+
+    assert asyncio.run(main()) == [{1: 10}, {2: 10}, {4: 10}]
+
+
+def test_native_run_yields_between_layers():
+    circuit = Circuit().add(Qubits(4))
+    for _ in range(50):
+        circuit.add(H(0)).add(CNOT(0, 1)).add(CNOT(1, 2)).add(CNOT(2, 3))
+    circuit.add(Measure([0, 1, 2, 3]))
+
+    ticks = []
+
+    async def ticker(done):
+        while not done.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        done = asyncio.Event()
+        tick_task = asyncio.ensure_future(ticker(done))
+        job = await StatevectorProvider().run_async(circuit, 10)
+        done.set()
+        await tick_task
+        return job
+
+    job = asyncio.run(main())
+
+    assert sum(job.result.counts.values()) == 10
+    assert len(ticks) > 100
+
+
+def test_blocking_provider_is_offloaded():
+    class BlockingProvider(Provider):
+        jobs = []
+
+        def run(self, circuit, times):
+            return StatevectorProvider().run(circuit, times)
+
+    async def main():
+        return await BlockingProvider().run_many_async([basis_circuit(0), basis_circuit(2)], 5)
+
+    jobs = asyncio.run(main())
+
+    assert all(isinstance(job, Job) for job in jobs)
+    assert [job.result.counts for job in jobs] == [{1: 5}, {4: 5}]
+
+
+def test_process_pool_result_async():
+    async def main(provider):
+        jobs = await provider.run_many_async([basis_circuit(i) for i in range(3)], 10)
+        return await asyncio.gather(*(job.result_async() for job in jobs))
+
+    with ProcessPoolProvider(max_workers=2) as provider:
+        results = asyncio.run(main(provider))
+
+    assert [r.counts for r in results] == [{1: 10}, {2: 10}, {4: 10}]
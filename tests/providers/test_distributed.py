@@ -0,0 +1,110 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from shor.errors import ProviderError
+from shor.gates import CCNOT, CNOT, QFT, H, Rx
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import DistributedProvider, StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils.distributed import DistributedStatevector, SharedMemoryTransport, SocketTransport
+from shor.utils.statevector import simulate
+from tests.util import random_circuit
+
+
+@pytest.mark.parametrize("transport", ["shared_memory", "socket"])
+def test_distributed_state_matches_statevector(transport):
+    circuit = random_circuit(6, 60, seed=1)
+    provider = DistributedProvider(num_workers=4, transport=transport)
+
+    with provider.state(circuit) as state:
+        assert state.num_workers == 4 and state.local_qubits == 4
+        state.apply(provider._gates(circuit))
+
+        assert np.allclose(state.statevector(), simulate(circuit))
+        assert state.stats.swap_passes > 0
+        assert state.stats.bytes_exchanged == state.stats.swapped_qubits * 4 * 2 ** 3 * state.dtype.itemsize
+
+    assert state.workers == [] and state.blocks == []
+
+
+def test_distributed_run_matches_statevector():
+    circuit = Circuit().add(Qubits(5)).add(H([0, 4])).add(CNOT(4, 1)).add(QFT(4, 3)).add(Rx(2, angle=0.4))
+    circuit.add(CCNOT(4, 2, 0)).add(Measure([4, 1, 0]))
+
+    provider = DistributedProvider(seed=3, num_workers=2)
+    result = provider.run(circuit, 1000).result
+
+    expected = StatevectorProvider(seed=3).run(circuit, 1000).result.counts
+    assert set(result.counts) == set(expected)
+    assert all(abs(result.counts[k] - expected[k]) < 10 for k in expected)
+    assert provider.stats.measure_passes == 1
+
+
+def test_distributed_config_errors():
+    with pytest.raises(ProviderError):
+        DistributedStatevector(4, num_workers=3)
+    with pytest.raises(ProviderError):
+        DistributedStatevector(4, transport="carrier_pigeon")
+
+    # More workers than the state can be split across
+    with DistributedStatevector(2, [1, 0], num_workers=8) as state:
+        assert state.num_workers == 2
+        assert state.statevector()[1, 0] == 1
+
+
+@pytest.mark.parametrize("transport", ["shared_memory", "socket"])
+@pytest.mark.parametrize("num_qubits", [3, 4])
+def test_one_local_qubit_per_worker(transport, num_qubits):
+    circuit = Circuit().add(Qubits(num_qubits)).add(H(0)).add(CNOT(0, num_qubits - 1)).add(Rx(1, angle=0.7))
+
+    with DistributedStatevector(num_qubits, num_workers=2 ** (num_qubits - 1), transport=transport) as state:
+        assert state.local_qubits == 1
+        state.apply(circuit.to_gates())
+
+        assert np.allclose(state.statevector(), simulate(circuit))
+        assert state.stats.swap_passes > 0
+
+    circuit.add(Measure(list(range(num_qubits))))
+    provider = DistributedProvider(seed=1, num_workers=2 ** (num_qubits - 1), transport=transport)
+    assert sum(provider.run(circuit, 100).result.counts.values()) == 100
+
+
+class FailingSharedMemoryTransport(SharedMemoryTransport):
+    def exchange(self, partner, send, receive):
+        if self.rank == 1:
+            raise RuntimeError("worker 1 failed")
+        super().exchange(partner, send, receive)
+
+
+class FailingSocketTransport(SocketTransport):
+    def exchange(self, partner, send, receive):
+        if self.rank == 1:
+            raise RuntimeError("worker 1 failed")
+        super().exchange(partner, send, receive)
+
+
+@pytest.mark.parametrize("transport", [FailingSharedMemoryTransport, FailingSocketTransport])
+def test_failed_exchange_reaches_the_coordinator(transport):
+    # Without the abort, worker 0 would wait for its partner forever
+    with DistributedStatevector(3, num_workers=2, transport=transport(timeout=60)) as state:
+        with pytest.raises(RuntimeError, match="worker 1 failed"):
+            state.apply([H(2)])
+
+
+def test_import_does_not_load_shared_memory():
+    # multiprocessing.shared_memory is Python 3.8+, importing shor must not need it
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, shor.providers, shor.utils.distributed; print('multiprocessing.shared_memory' in sys.modules)",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+
+    assert output.strip() == b"False"
@@ -0,0 +1,55 @@
+import pytest
+
+from shor.errors import CircuitError
+from shor.gates import Rx
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.providers import IBMQ
+from shor.providers.IBMQ import TranspileCache
+from shor.quantum import Circuit
+from tests.util import bell
+
+
+def test_transpile_cache_counts_hits_and_evicts(monkeypatch):
+    converted = []
+    monkeypatch.setattr(IBMQ, "to_qiskit_circuit", lambda circuit: converted.append(circuit) or len(converted))
+
+    cache = TranspileCache(maxsize=2)
+
+    assert cache.get(bell()) == cache.get(bell()) == 1
+    assert cache.get(bell(0.1)) == 2
+    assert cache.get(bell(0.2)) == 3
+    assert cache.get(bell()) == 4
+
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert len(cache) == 2
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_transpile_cache_disabled(monkeypatch):
+    monkeypatch.setattr(IBMQ, "to_qiskit_circuit", lambda circuit: object())
+
+    cache = TranspileCache(maxsize=0)
+
+    assert cache.get(bell()) is not cache.get(bell())
+    assert cache.misses == 2 and len(cache) == 0
+
+
+def test_parameters_sharing_a_name_are_rejected():
+    a, b = Parameter("theta"), Parameter("theta")
+    circuit = Circuit().add(Qubits(2)).add(Rx(0, angle=a)).add(Rx(1, angle=b)).add(Measure([0, 1]))
+
+    # Rejected before qiskit is needed, the template would bind both to one qiskit parameter
+    with pytest.raises(CircuitError):
+        IBMQ.IBMQProvider(backend=object()).run_sweep(circuit, [{a: 0.1, b: 0.2}], 10)
+    with pytest.raises(CircuitError):
+        IBMQ.qiskit_value(b, {a: object()})
+
+
+def test_unsupported_initial_states_are_rejected():
+    # Qubits starting in |1> are flipped, other states have no qiskit equivalent
+    with pytest.raises(CircuitError):
+        IBMQ.to_qiskit_circuit(Circuit().add(Qubits(2, state=2)).add(Measure([0, 1])))
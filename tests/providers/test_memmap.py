@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, CRZ, CSWAP, QFT, SWAP, Cx, H, Rx, T
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import MemmapProvider, StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils.memmap import MemmapStatevector
+from shor.utils.partition import mixed_qubits
+from shor.utils.statevector import simulate
+from tests.util import random_circuit
+
+
+@pytest.mark.parametrize("local_qubits, max_swap_qubits", [(2, 1), (3, 2), (4, 3), (7, 2)])
+def test_memmap_state_matches_statevector(local_qubits, max_swap_qubits):
+    circuit = random_circuit(7, 80)
+    provider = MemmapProvider(local_qubits=local_qubits, max_swap_qubits=max_swap_qubits)
+
+    with provider.state(circuit) as state:
+        state.apply(provider._gates(circuit))
+        assert np.allclose(state.statevector(), simulate(circuit))
+        path = state.path
+
+    assert not os.path.exists(path)
+    if local_qubits < 7:
+        assert state.stats.swap_passes > 0
+    assert state.stats.gates_applied == state.stats.total_gates
+
+
+def test_memmap_run_matches_statevector():
+    circuit = Circuit().add(Qubits(6)).add(H([0, 1])).add(CNOT(1, 5)).add(QFT(5, 4)).add(Rx(3, angle=0.4))
+    circuit.add(CCNOT(5, 3, 2)).add(QFT(2, 1, 0))
+    circuit.add(Measure([5, 2, 0]))
+
+    progress = []
+    provider = MemmapProvider(seed=3, local_qubits=3, progress=lambda stats: progress.append(stats.passes))
+    result = provider.run(circuit, 1000).result
+
+    expected = StatevectorProvider(seed=3).run(circuit, 1000).result.counts
+    assert set(result.counts) == set(expected)
+    assert all(abs(result.counts[k] - expected[k]) < 10 for k in expected)
+    assert progress == list(range(1, provider.stats.passes + 1))
+    assert provider.stats.measure_passes == 1
+    assert provider.stats.bytes_read > 0 and provider.stats.bytes_written > 0
+
+
+def test_global_controls_and_diagonals_need_no_swaps():
+    gates = [H(0), H(1), CNOT(5, 0), CCNOT(4, 5, 1), CRZ(3, 0, angle=0.5), T(5), CSWAP(4, 0, 1)]
+
+    with MemmapStatevector(6, local_qubits=2) as state:
+        state.apply(gates)
+
+        assert state.stats.swap_passes == 0 and state.stats.local_passes == 1
+        assert np.allclose(state.statevector(), simulate(Circuit().add(Qubits(6)), gates))
+
+    assert mixed_qubits(Cx(0, 1)) == [1]
+    assert mixed_qubits(CRZ(0, 1, angle=0.1)) == []
+    assert mixed_qubits(CSWAP(0, 1, 2)) == [1, 2]
+
+
+def test_gate_wider_than_local_qubits():
+    with MemmapStatevector(3, local_qubits=1) as state:
+        with pytest.raises(CircuitError):
+            state.apply([SWAP(0, 2)])
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from shor.errors import ProviderError
+from shor.gates import CNOT, QFT, H, Rx, Ry
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import MPSProvider, MPSResult, StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils.mps import MPS
+from shor.utils.statevector import simulate
+from tests.util import random_circuit
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_state_matches_statevector(seed):
+    circuit = random_circuit(7, 60, seed=seed)
+
+    state = MPSProvider().state(circuit)
+
+    assert np.allclose(state.statevector(), simulate(circuit))
+    assert state.stats.swaps > 0
+    assert state.stats.truncation_error < 1e-10
+
+
+def test_run_matches_statevector():
+    circuit = Circuit().add(Qubits(5)).add(H([0, 4])).add(CNOT(4, 1)).add(QFT(4, 3, 0)).add(Rx(2, angle=0.4))
+    circuit.add(Measure([4, 1, 0]))
+
+    result = MPSProvider(seed=3).run(circuit, 4000).result
+    expected = StatevectorProvider(seed=3).run(circuit, 4000).result.counts
+
+    assert isinstance(result, MPSResult)
+    assert set(result.counts) == set(expected)
+    assert all(abs(result.counts[k] - expected[k]) < 200 for k in expected)
+
+
+def test_ghz_on_many_qubits():
+    n = 100
+    circuit = Circuit().add(Qubits(n)).add(H(0))
+    for q in range(n - 1):
+        circuit.add(CNOT(q, q + 1))
+    circuit.add(Measure(list(range(n))))
+
+    provider = MPSProvider(seed=1)
+    result = provider.run(circuit, 1000).result
+
+    assert set(result.counts) == {0, 2 ** n - 1}
+    assert abs(result.counts[0] - 500) < 100
+    assert provider.stats.max_bond == 2 and result.truncation_error == 0
+
+
+def test_truncation_error_is_reported():
+    circuit = Circuit().add(Qubits(6))
+    for layer in range(4):
+        circuit.add(Ry(list(range(6)), angle=0.3 + layer))
+        for q in range(layer % 2, 5, 2):
+            circuit.add(CNOT(q, q + 1))
+
+    exact = simulate(circuit).reshape(-1)
+    provider = MPSProvider(max_bond_dimension=2)
+    state = provider.state(circuit)
+    overlap = abs(np.vdot(exact, state.statevector().reshape(-1))) ** 2
+
+    assert max(state.bond_dimensions) == 2
+    assert state.stats.truncations > 0
+    assert overlap < 0.99 and provider.stats.truncation_error > 0.01
+    assert abs(provider.stats.fidelity - overlap) < 0.01
+
+
+def test_mps_config_errors():
+    with pytest.raises(ProviderError):
+        MPS(3, max_bond_dimension=0)
+    with pytest.raises(ProviderError):
+        MPS(3, cutoff=-1)
+
+    assert MPS(2, [1, 0]).statevector()[1, 0] == 1
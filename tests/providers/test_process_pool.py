@@ -0,0 +1,79 @@
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from shor.gates import CNOT, H, PauliX
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers.base import JobStatusCode
+from shor.providers.ProcessPool import ProcessPoolProvider
+from shor.quantum import Circuit
+
+
+def bell_circuit():
+    return Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1)).add(Measure([0, 1]))
+
+
+def slow_circuit(num_qubits=16, depth=40):
+    circuit = Circuit().add(Qubits(num_qubits))
+    for _ in range(depth):
+        circuit.add(H(range(num_qubits)))
+    return circuit.add(Measure([0]))
+
+
+def test_run_many_completes():
+    circuits = [Circuit().add(Qubits(3)).add(PauliX(i)).add(Measure([0, 1, 2])) for i in range(3)]
+
+    with ProcessPoolProvider(max_workers=2) as provider:
+        jobs = provider.run_many(circuits, 100)
+
+        assert [job.wait(timeout=60).counts for job in jobs] == [{1: 100}, {2: 100}, {4: 100}]
+        assert all(job.status.code == JobStatusCode.COMPLETED for job in jobs)
+        assert provider.jobs == jobs
+
+
+def test_workers_simulate_single_threaded():
+    # One process per core already, threads per worker would oversubscribe the machine
+    with ProcessPoolProvider("statevector", max_workers=2) as provider:
+        assert provider.provider.num_threads == 1
+        assert provider.run(bell_circuit(), 100).wait(timeout=60).sig_bits == 2
+
+
+def test_jobs_are_sampled_independently():
+    with ProcessPoolProvider(max_workers=1) as provider:
+        results = [job.result for job in provider.run_many([bell_circuit()] * 4, 1000)]
+
+    assert all(set(r.counts) == {0, 3} for r in results)
+    assert len({r[0] for r in results}) > 1
+
+
+def test_seeded_pool_is_reproducible():
+    with ProcessPoolProvider(max_workers=1, seed=3) as provider:
+        counts_1 = [job.result.counts for job in provider.run_many([bell_circuit()] * 2, 1000)]
+    with ProcessPoolProvider(max_workers=1, seed=3) as provider:
+        counts_2 = [job.result.counts for job in provider.run_many([bell_circuit()] * 2, 1000)]
+
+    assert counts_1 == counts_2
+
+
+def test_failed_job_reports_error():
+    with ProcessPoolProvider(max_workers=1) as provider:
+        job = provider.run(Circuit().add(Qubits(1)).add(H(0)), 10)
+
+        with pytest.raises(Exception):
+            job.wait(timeout=60)
+        assert job.status.code == JobStatusCode.ERROR
+        assert "CircuitError" in job.status.message
+
+
+def test_timeout_and_cancel():
+    with ProcessPoolProvider(max_workers=1) as provider:
+        jobs = provider.run_many([slow_circuit() for _ in range(4)], 10)
+
+        with pytest.raises(TimeoutError):
+            jobs[0].wait(timeout=0)
+
+        assert jobs[-1].cancel()
+        assert jobs[-1].status.code == JobStatusCode.ERROR
+        assert jobs[-1].status.message == "Job was cancelled"
+        assert jobs[0].wait(timeout=120).counts
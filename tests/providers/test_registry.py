@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+from shor.errors import ProviderError
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import ProcessPoolProvider, StatevectorProvider, available_providers, get_provider
+from shor.providers.registry import register_provider, resolve_provider
+from shor.quantum import Circuit
+
+
+def test_import_does_not_load_qiskit():
+    output = subprocess.run(
+        [sys.executable, "-c", "import sys, shor.quantum, shor.providers; print('qiskit' in sys.modules)"],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+
+    assert output.strip() == b"False"
+
+
+def test_import_does_not_load_backends():
+    script = "import sys, shor.providers; print(sorted(m for m in sys.modules if m.startswith('shor.providers.')))"
+    output = subprocess.run([sys.executable, "-c", script], check=True, stdout=subprocess.PIPE).stdout
+
+    assert output.strip() == b"['shor.providers.base', 'shor.providers.registry']"
+
+    import shor.providers
+
+    assert shor.providers.StatevectorProvider is StatevectorProvider
+    assert "MPSProvider" in dir(shor.providers) and "MPSProvider" in shor.providers.__all__
+    with pytest.raises(AttributeError):
+        shor.providers.NoSuchProvider
+
+
+def test_get_provider_by_name():
+    provider = get_provider("Statevector", seed=3)
+
+    assert isinstance(provider, StatevectorProvider)
+    assert provider.seed == 3
+    assert {"ibmq", "process_pool", "statevector"} <= set(available_providers())
+
+
+def test_unknown_provider():
+    with pytest.raises(ProviderError, match="Unknown provider 'nope'"):
+        get_provider("nope")
+
+
+def test_register_provider():
+    register_provider("seeded", lambda **config: StatevectorProvider(seed=5, **config))
+
+    assert resolve_provider("seeded").seed == 5
+    assert isinstance(ProcessPoolProvider("seeded").provider, StatevectorProvider)
+
+
+def test_circuit_run_with_provider_name():
+    circuit = Circuit().add(Qubits(1)).add(Measure([0]))
+
+    result = circuit.run(10, provider="statevector", seed=1).result
+
+    assert result.counts == {0: 10}
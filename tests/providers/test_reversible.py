@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from shor.algorithms.shor import quantum_amod_15
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, CSWAP, SWAP, Cx, H, PauliX
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import ReversibleProvider, ReversibleResult
+from shor.providers.registry import select_provider
+from shor.quantum import Circuit
+from shor.utils.reversible import BitSlicedStates, bits_to_integers, integers_to_bits
+from shor.utils.statevector import unitary
+from tests.util import random_circuit
+
+
+def ripple_carry_adder(n):
+    """Adds a (qubits 0..n-1) into b (qubits n..2n-1), the carry out ending on qubit 3n."""
+    circuit = Circuit().add(Qubits(3 * n + 1))
+    for i in range(n):
+        a, b, carry, carry_out = i, n + i, 2 * n + i, 2 * n + i + 1
+        circuit.add(CCNOT(a, b, carry_out)).add(CNOT(a, b)).add(CCNOT(carry, b, carry_out)).add(CNOT(carry, b))
+
+    return circuit
+
+
+def reverse_bits(x, n):
+    # Little endian basis states (bit q is qubit q) to and from unitary's big endian indices
+    return sum(1 << (n - 1 - q) for q in range(n) if (x >> q) & 1)
+
+
+def permutation_of(circuit, n):
+    matrix = unitary(circuit.to_gates(), n)
+    return [reverse_bits(int(np.argmax(np.abs(matrix[:, reverse_bits(x, n)]))), n) for x in range(2 ** n)]
+
+
+@pytest.mark.parametrize("a", [2, 4, 7, 8, 11, 13])
+def test_amod_15_table_matches_statevector(a):
+    circuit = Circuit().add(Qubits(5)).add(quantum_amod_15(a))
+
+    assert ReversibleProvider().tabulate(circuit).tolist() == permutation_of(circuit, 5)
+
+
+def test_random_permutation_circuits_match_statevector():
+    circuit = Circuit().add(Qubits(6))
+    for gate in random_circuit(6, 80, seed=2).to_gates():
+        if type(gate) in (CNOT, Cx, CCNOT, SWAP, CSWAP, PauliX):
+            circuit.add(gate)
+
+    inputs = [0, 5, 37, 63]
+    outputs = ReversibleProvider().evaluate(circuit, inputs)
+
+    expected = permutation_of(circuit, 6)
+    assert outputs.tolist() == [expected[x] for x in inputs]
+
+
+def test_adder_on_hundreds_of_qubits():
+    n = 100
+    circuit = ripple_carry_adder(n)
+    rng = np.random.default_rng(0)
+    a = [int.from_bytes(rng.bytes(13), "little") % 2 ** n for _ in range(300)]
+    b = [int.from_bytes(rng.bytes(13), "little") % 2 ** n for _ in range(300)]
+
+    outputs = ReversibleProvider().evaluate(circuit, [x | y << n for x, y in zip(a, b)])
+
+    for x, y, output in zip(a, b, outputs):
+        assert (output >> n) % 2 ** n == (x + y) % 2 ** n
+        assert output >> 3 * n == (x + y) >> n
+
+
+def test_tabulate_every_input():
+    circuit = Circuit().add(Qubits(10, state=0)).add(PauliX(9)).add(CNOT(2, 8)).add(Measure([8, 9, 2]))
+
+    table = ReversibleProvider().tabulate(circuit, inputs=list(range(8)))
+
+    x = np.arange(256)
+    assert table.tolist() == (((x >> 2) & 1) | 2 | ((x >> 2) & 1) << 2).tolist()
+    assert BitSlicedStates.every_input(3).to_integers().tolist() == list(range(8))
+    assert BitSlicedStates.every_input(8).to_integers().tolist() == list(range(256))
+
+
+def test_run_selects_the_reversible_provider():
+    circuit = Circuit().add(Qubits(5)).add(PauliX(4)).add(PauliX(0)).add(quantum_amod_15(7))
+    circuit.add(Measure([0, 1, 2, 3]))
+
+    result = circuit.run(100).result
+
+    assert isinstance(result, ReversibleResult)
+    assert dict(result.counts) == {7: 100}
+    assert select_provider(Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1))) == "stabilizer"
+    assert select_provider(Circuit().add(Qubits(2, state=2)).add(CNOT(0, 1))) != "reversible"
+
+    with pytest.raises(CircuitError):
+        ReversibleProvider().run(Circuit().add(Qubits(2)).add(H(0)), 10)
+
+
+def test_integer_conversions():
+    states = [0, 1, 2 ** 70 + 5, 2 ** 99]
+    bits = integers_to_bits(states, 100)
+
+    assert bits.shape == (4, 100) and bits[2, 70] == 1 and bits[3, 99] == 1
+    assert bits_to_integers(bits) == states
+    assert bits_to_integers(integers_to_bits(np.array([3, 2 ** 63]), 64)).tolist() == [3, 2 ** 63]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from shor.errors import CircuitError
+from shor.gates import CNOT, CY, SWAP, Cx, Cz, H, Init_y, PauliX, PauliY, PauliZ, S, Sdg, T
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.providers import StabilizerProvider, StabilizerResult
+from shor.providers.registry import resolve_provider, select_provider
+from shor.quantum import Circuit
+from shor.utils.qbits import outcome_index
+from shor.utils.stabilizer import Tableau, popcount
+from shor.utils.statevector import measurement_probabilities, simulate
+
+SINGLE = [H, S, Sdg, PauliX, PauliY, PauliZ, Init_y]
+DOUBLE = [CNOT, Cx, Cz, CY, SWAP]
+
+
+def random_clifford_circuit(num_qubits, num_gates, measured, seed=0):
+    rng = np.random.default_rng(seed)
+    circuit = Circuit().add(Qubits(num_qubits))
+    for _ in range(num_gates):
+        if rng.random() < 0.5:
+            circuit.add(SINGLE[rng.integers(len(SINGLE))](int(rng.integers(num_qubits))))
+        else:
+            a, b = rng.permutation(num_qubits)[:2].tolist()
+            circuit.add(DOUBLE[rng.integers(len(DOUBLE))](a, b))
+
+    return circuit.add(Measure(measured))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_distribution_matches_statevector(seed):
+    measured = [4, 0, 2, 5] if seed % 2 else [0, 1, 2, 3, 4, 5]
+    circuit = random_clifford_circuit(6, 40, measured, seed)
+
+    record = StabilizerProvider().tableau(circuit).measurement_record(measured)
+    constant, generators = record[:, 0], record[:, 1:]
+    num_random = generators.shape[1]
+
+    support = set()
+    for index in range(2 ** num_random):
+        bits = (index >> np.arange(num_random)) & 1
+        support.add(outcome_index(constant ^ (generators @ bits % 2).astype(bool)))
+
+    probabilities = measurement_probabilities(simulate(circuit), measured)
+    assert set(np.flatnonzero(probabilities > 1e-9)) == support
+    assert np.allclose(probabilities[sorted(support)], 2.0 ** -num_random)
+
+
+def test_ghz_on_many_qubits():
+    n = 1000
+    circuit = Circuit().add(Qubits(n)).add(H(0))
+    for q in range(n - 1):
+        circuit.add(CNOT(q, q + 1))
+    circuit.add(PauliX(n - 1)).add(Measure(list(range(n))))
+
+    result = circuit.run(1000, seed=1).result
+
+    assert isinstance(result, StabilizerResult)
+    assert set(result.counts) == {1 << (n - 1), 2 ** (n - 1) - 1}
+    assert sum(result.counts.values()) == 1000
+    assert abs(result.counts[1 << (n - 1)] - 500) < 100
+
+
+def test_batched_sampling_of_many_random_bits():
+    n = 40
+    circuit = Circuit().add(Qubits(n, state=1)).add(H(list(range(n)))).add(Measure(list(range(n))))
+
+    counts = StabilizerProvider(seed=0).run(circuit, 500).result.counts
+
+    assert sum(counts.values()) == 500
+    assert all(0 <= outcome < 2 ** n for outcome in counts)
+    assert len(counts) > 490
+
+
+def test_clifford_circuits_select_the_stabilizer_provider():
+    clifford = Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1)).add(Measure([0, 1]))
+    other = Circuit().add(Qubits(2)).add(H(0)).add(T(0)).add(Measure([0, 1]))
+
+    assert select_provider(clifford) == "stabilizer"
+    assert select_provider(other) == "statevector"
+    assert isinstance(resolve_provider(circuit=clifford), StabilizerProvider)
+
+    with pytest.raises(CircuitError):
+        StabilizerProvider().run(other, 10)
+
+
+def test_popcount():
+    words = np.array([[0, 1, 2 ** 64 - 1], [2 ** 63, 3, 0]], dtype=np.uint64)
+
+    assert popcount(words).tolist() == [65, 3]
+    assert Tableau(130).x.shape == (260, 3)
@@ -0,0 +1,229 @@
+import numpy as np
+import pytest
+
+from shor.algorithms.shor import quantum_amod_15
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, CRZ, CSWAP, CY, QFT, SWAP, Cx, H, PauliX, Rx, T
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.providers.Statevector import StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils import statevector
+from shor.utils.fusion import fuse_diagonal_gates, fuse_gates
+from shor.utils.precision import get_precision, precision
+from shor.utils.qbits import change_qubit_order
+from shor.utils.statevector import (
+    apply_gate,
+    apply_matrix,
+    evolve,
+    evolve_batch,
+    gate_axes,
+    initial_statevector,
+    simulate,
+    slab_indices,
+)
+
+
+def dense_unitary(gate, num_qubits):
+    """Reference implementation: embed the gate in the full 2^n x 2^n operator."""
+    others = [q for q in range(num_qubits) if q not in gate.qbits]
+    full = np.kron(gate.to_matrix(), np.eye(2 ** len(others)))
+
+    return change_qubit_order(full, list(gate.qbits) + others, list(range(num_qubits)))
+
+
+def test_apply_matrix_matches_dense_operator():
+    num_qubits = 4
+    gates = [H(0), CNOT(2, 0), CY(1, 3), CCNOT(3, 0, 2), CSWAP(1, 3, 0), QFT(2, 0, 1), Rx(3, angle=0.3), T(1)]
+
+    rng = np.random.default_rng(0)
+    state = rng.normal(size=2 ** num_qubits) + 1j * rng.normal(size=2 ** num_qubits)
+
+    for gate in gates:
+        expected = dense_unitary(gate, num_qubits).dot(state)
+        state = apply_matrix(state.reshape((2,) * num_qubits), gate.to_matrix(), gate.qbits).reshape(-1)
+
+        assert np.allclose(state, expected)
+
+
+def test_initial_statevector_honours_qubit_states():
+    circuit = Circuit().add(Qubits(2, state=1)).add(Qubits(1))
+
+    state = initial_statevector(circuit)
+
+    assert state.shape == (2, 2, 2)
+    assert state[1, 1, 0] == 1
+    assert np.count_nonzero(state) == 1
+
+
+def test_cx_uses_first_qubit_as_control():
+    circuit = Circuit().add(Qubits(2)).add(PauliX(0)).add(Cx(0, 1))
+
+    state = simulate(circuit)
+
+    assert state[1, 1] == 1
+
+
+def test_counts_are_little_endian():
+    circuit = Circuit().add(Qubits(3)).add(PauliX(0)).add(PauliX(2)).add(Measure([0, 1, 2]))
+
+    result = StatevectorProvider().run(circuit, 100).result
+
+    assert result["101"] == 100
+    assert result.counts == {0b101: 100}
+    assert result.sig_bits == 3
+
+
+def test_partial_measurement_marginalises():
+    circuit = Circuit().add(Qubits(3)).add(H(2)).add(PauliX(0)).add(Measure([2, 0]))
+
+    result = StatevectorProvider(seed=1).run(circuit, 1000).result
+
+    assert set(result.counts) == {0b10, 0b11}
+    assert sum(result.counts.values()) == 1000
+
+
+def test_seed_is_reproducible():
+    circuit = Circuit().add(Qubits(2)).add(H(0)).add(H(1)).add(Measure([0, 1]))
+
+    result_1 = StatevectorProvider(seed=7).run(circuit, 500).result
+    result_2 = StatevectorProvider(seed=7).run(circuit, 500).result
+
+    assert result_1.counts == result_2.counts
+
+
+def test_amod_15_is_a_permutation():
+    circuit = Circuit().add(Qubits(5)).add(PauliX(4)).add(PauliX(0)).add(quantum_amod_15(7))
+    circuit.add(Measure([0, 1, 2, 3]))
+
+    result = StatevectorProvider().run(circuit, 10).result
+
+    assert len(result.counts) == 1
+
+
+def test_fused_run_matches_unfused():
+    circuit = Circuit().add(Qubits(3)).add(H(0)).add(CNOT(0, 1)).add(CNOT(1, 2)).add(H(2)).add(H(2))
+    circuit.add(Measure([0, 1, 2]))
+
+    result_1 = StatevectorProvider(seed=3).run(circuit, 200).result
+    result_2 = StatevectorProvider(seed=3, max_fused_qubits=3).run(circuit, 200).result
+
+    assert set(result_1.counts) == {0b000, 0b111}
+    assert result_1.counts == result_2.counts
+
+
+def test_result_histogram():
+    circuit = Circuit().add(Qubits(2)).add(H(0)).add(Measure([0, 1]))
+
+    result = StatevectorProvider(seed=0).run(circuit, 10 ** 6).result
+
+    assert list(result.outcomes) == [0, 1]
+    assert result.histogram.sum() == 10 ** 6
+    assert result.histogram[2] == result.histogram[3] == 0
+    assert result["01"] == result.counts[1] == result.histogram[1]
+    assert result["11"] == 0
+    assert result.get(3, default=None) is None
+    assert abs(result[0] - 5 * 10 ** 5) < 5000
+    assert result.counts.most_common(1)[0][0] in (0, 1)
+
+
+def test_run_batch_over_basis_states():
+    circuit = Circuit().add(Qubits(5)).add(quantum_amod_15(7)).add(Measure([0, 1, 2, 3, 4]))
+    provider = StatevectorProvider()
+
+    jobs = provider.run_batch(circuit, 10, initial_states=range(32))
+
+    assert len(jobs) == 32
+    for x, job in enumerate(jobs):
+        single = Circuit().add(Qubits(5))
+        for q in range(5):
+            if x >> q & 1:
+                single.add(PauliX(q))
+        single.add(quantum_amod_15(7)).add(Measure([0, 1, 2, 3, 4]))
+
+        assert job.result.counts == provider.run(single, 10).result.counts
+
+
+def test_run_batch_amplitudes_and_chunking():
+    circuit = Circuit().add(Qubits(2)).add(CNOT(0, 1)).add(Measure([0, 1]))
+    amplitudes = np.array([[0, 1, 0, 0], [0, 0, 1, 0], [np.sqrt(0.5), np.sqrt(0.5), 0, 0]])
+
+    jobs = StatevectorProvider(seed=0, max_batch_amplitudes=4).run_batch(circuit, 100, initial_states=amplitudes)
+
+    assert jobs[0].result.counts == {0b11: 100}
+    assert jobs[1].result.counts == {0b10: 100}
+    assert set(jobs[2].result.counts) == {0b00, 0b11}
+
+
+def test_permutation_gates_match_dense_matrices():
+    num_qubits = 4
+    gates = [PauliX(2), CNOT(3, 1), Cx(0, 2), SWAP(1, 3), CCNOT(2, 0, 3), CSWAP(3, 2, 0), CSWAP(0, 1, 2)]
+
+    rng = np.random.default_rng(1)
+    state = rng.normal(size=(2,) * num_qubits) + 1j * rng.normal(size=(2,) * num_qubits)
+
+    for gate in gates:
+        expected = apply_matrix(state, gate.matrix, gate_axes(gate))
+        state = apply_gate(state, gate)
+
+        assert np.array_equal(state, expected)
+
+    # Batched states, including a read-only broadcast batch
+    states = np.broadcast_to(state, (3,) + state.shape)
+    assert np.array_equal(evolve_batch(states, gates)[2], evolve(state.copy(), gates))
+
+
+def test_complex64_precision():
+    theta = Parameter("theta")
+    circuit = Circuit().add(Qubits(4)).add(H([0, 1, 2])).add(CNOT(0, 3)).add(T(1)).add(CRZ(2, 1, angle=0.3))
+    circuit.add(SWAP(0, 2)).add(CY(3, 1)).add(QFT(0, 1, 2)).add(Rx(3, angle=theta)).add(Measure([0, 1, 2, 3]))
+    bound = circuit.bind({"theta": 0.7})
+
+    state = simulate(bound, precision="complex64")
+    assert state.dtype == np.complex64
+    assert np.allclose(state, simulate(bound), atol=1e-6)
+
+    # Fused, batched and swept runs keep the state in complex64 as well
+    fused = StatevectorProvider(max_fused_qubits=3, precision="complex64")
+    assert simulate(bound, fused._gates(bound), fused.precision).dtype == np.complex64
+    assert evolve_batch(initial_statevector(bound, precision="complex64")[np.newaxis], bound.to_gates()).dtype == (
+        np.complex64
+    )
+
+    jobs = StatevectorProvider(seed=0, precision="complex64").run_sweep(circuit, [{"theta": 0.7}], 100)
+    assert jobs[0].result.counts == StatevectorProvider(seed=0).run(bound, 100).result.counts
+
+
+def test_global_precision():
+    circuit = Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1)).add(Measure([0, 1]))
+
+    with precision("complex64"):
+        assert simulate(circuit).dtype == np.complex64
+        assert simulate(circuit, precision="complex128").dtype == np.complex128
+    assert get_precision() == np.complex128
+    assert simulate(circuit).dtype == np.complex128
+
+    with pytest.raises(CircuitError):
+        StatevectorProvider(precision="float32")
+
+
+def test_threaded_evolve_matches_serial(monkeypatch):
+    monkeypatch.setattr(statevector, "MIN_SLAB_AMPLITUDES", 4)
+    gates = [H(0), CNOT(0, 5), CCNOT(5, 1, 7), CRZ(2, 6, angle=0.3), T(3), SWAP(4, 0), CY(7, 2), Rx(6, angle=1.1)]
+    gates += fuse_gates(fuse_diagonal_gates(gates, 3)[0], 3)[0] + [CSWAP(1, 2, 3), QFT(0, 4, 6)]
+
+    rng = np.random.default_rng(0)
+    state = rng.normal(size=(2,) * 8) + 1j * rng.normal(size=(2,) * 8)
+    expected = evolve(state.copy(), gates)
+
+    for num_threads in (2, 3, 8):
+        assert np.allclose(evolve(np.broadcast_to(state, state.shape), gates, num_threads), expected)
+
+
+def test_slab_indices():
+    slabs = slab_indices(4, [0, 2], 3)
+
+    assert len(slabs) == 4
+    assert slabs[1] == (slice(None), slice(0, 1), slice(None), slice(1, 2))
+    assert slab_indices(2, [0, 1], 4) == [(slice(None), slice(None))]
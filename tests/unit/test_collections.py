@@ -0,0 +1,21 @@
+from shor.utils.collections import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    assert cache.get("a") == 1
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert "b" not in cache and cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    cache["a"] = 1
+
+    assert len(cache) == 0 and cache.get("a", 5) == 5
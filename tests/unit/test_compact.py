@@ -0,0 +1,116 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from shor.compact import CompactCircuit
+from shor.errors import CircuitError
+from shor.gates import CCNOT, CNOT, U2, CRk, H, PauliX, Rx
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.providers import StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils.fusion import FusedGate
+
+
+def layers():
+    return [
+        Qubits(3),
+        H([0, 1]),
+        CNOT(0, 2),
+        Rx(1, angle=0.25),
+        U2(2, phi=0.5, lam=1.5),
+        CRk(1, 0, k=3),
+        CCNOT(2, 1, 0),
+        Measure([0, 1, 2]),
+    ]
+
+
+def build(circuit_class):
+    circuit = circuit_class()
+    for layer in layers():
+        circuit.add(layer)
+    return circuit
+
+
+def test_gates_slots():
+    for layer in layers():
+        assert not hasattr(layer, "__dict__")
+
+
+def test_compact_circuit_is_equivalent():
+    circuit, compact = build(Circuit), build(CompactCircuit)
+
+    assert compact == circuit
+    assert compact.fingerprint == circuit.fingerprint
+    assert len(compact.layers) == len(circuit.layers)
+    assert [type(g) for g in compact.to_gates()] == [type(g) for g in circuit.to_gates()]
+    assert [g.qbits for g in compact.to_gates()] == [g.qbits for g in circuit.to_gates()]
+    assert [g.parameters for g in compact.to_gates()] == [g.parameters for g in circuit.to_gates()]
+    assert compact.initial_state() == circuit.initial_state()
+    assert compact.measure_bits() == circuit.measure_bits()
+
+    result = StatevectorProvider(seed=0).run(compact, 100).result
+    assert result.counts == StatevectorProvider(seed=0).run(circuit, 100).result.counts
+
+
+def test_compact_storage():
+    compact = build(CompactCircuit)
+
+    # Qubits and Measure are kept as objects, H([0, 1]) is stored once with both of its qubits
+    assert list(compact.opcodes < 0) == [True] + [False] * 6 + [True]
+    assert compact.qubits.tolist() == [0, 1, 0, 2, 1, 2, 1, 0, 2, 1, 0]
+    assert compact.qubit_offsets.tolist() == [0, 0, 2, 4, 5, 6, 8, 11, 11]
+    assert compact.parameters_array.tolist() == [0.25, 0.5, 1.5, 3.0]
+    assert compact.gate_class(compact.opcodes[1]) is H
+
+
+def test_compact_layers_view():
+    compact = CompactCircuit().add(Circuit().add(PauliX(0)).add(PauliX(1)))
+
+    assert isinstance(compact.layers[-1], PauliX) and compact.layers[-1].qbits == [1]
+    assert [layer.qbits for layer in compact.layers[:1]] == [[0]]
+    with pytest.raises(IndexError):
+        compact.layers[2]
+    with pytest.raises(AttributeError):
+        compact.layers.append(PauliX(0))
+    with pytest.raises(CircuitError):
+        compact.measure_bits()
+
+    # Adding a circuit to itself doubles it
+    compact.add(compact)
+    assert len(compact.layers) == 4
+    assert compact == Circuit().add(PauliX(0)).add(PauliX(1)).add(PauliX(0)).add(PauliX(1))
+
+
+def test_compact_keeps_parameters_and_foreign_gates():
+    theta = Parameter("theta")
+    fused = FusedGate(0, matrix=np.eye(2))
+    compact = CompactCircuit().add(Qubits(1)).add(Rx(0, angle=theta)).add(fused).add(Measure([0]))
+
+    assert compact.layers[2] is fused
+    assert compact.parameters == [theta]
+
+    bound = compact.bind({"theta": 0.25})
+    assert isinstance(bound, CompactCircuit)
+    assert bound.layers[1].angle == 0.25
+    assert bound.parameters == []
+
+
+def test_compact_circuit_pickles():
+    compact = build(CompactCircuit)
+
+    copy = pickle.loads(pickle.dumps(compact))
+
+    assert copy == compact
+    assert copy.layers[3].angle == 0.25
+
+
+def test_column_growth():
+    compact = CompactCircuit()
+    for q in range(1000):
+        compact.add(H(q))
+
+    assert compact.qubits.tolist() == list(range(1000))
+    assert compact.layers[999].qbits == [999]
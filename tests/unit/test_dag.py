@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from shor.gates import CNOT, CSWAP, H, PauliX, T
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.quantum import Circuit
+from shor.utils.dag import CircuitDAG
+
+
+def test_dag_edges_follow_shared_qubits():
+    circuit = Circuit().add(Qubits(3)).add(H(0)).add(H(1)).add(CNOT(0, 1)).add(PauliX(2)).add(Measure([0, 1, 2]))
+    dag = circuit.to_dag()
+
+    assert len(dag) == 5
+    assert sorted(dag.edges) == [(0, 2), (1, 2), (2, 4), (3, 4)]
+    assert list(dag.asap) == [0, 0, 1, 0, 2]
+    assert list(dag.alap) == [0, 0, 1, 1, 2]
+    assert list(dag.slack) == [0, 0, 0, 1, 0]
+    assert dag.depth == 3
+
+
+def test_dag_layers_are_independent():
+    circuit = Circuit().add(Qubits(4)).add(H(range(4))).add(CNOT(0, 1)).add(CNOT(2, 3)).add(CSWAP(1, 2, 3)).add(T(0))
+
+    for schedule in ["asap", "alap"]:
+        layers = list(circuit.to_dag().layers(schedule))
+
+        assert sum(len(layer) for layer in layers) == 8
+        for layer in layers:
+            qubits = [q for gate in layer for q in gate.qbits]
+            assert len(qubits) == len(set(qubits))
+
+
+def test_dag_asap_alap_schedules():
+    gates = [T(0), H(1), CNOT(1, 2), CNOT(2, 3)]
+    dag = CircuitDAG(gates)
+
+    assert list(dag.layers("asap")) == [[gates[0], gates[1]], [gates[2]], [gates[3]]]
+    assert list(dag.layers("alap")) == [[gates[1]], [gates[2]], [gates[0], gates[3]]]
+
+
+def test_dag_critical_path():
+    gates = [H(0), H(1), CNOT(1, 2), PauliX(3), CNOT(2, 3), T(0)]
+    dag = CircuitDAG(gates)
+
+    assert dag.depth == 3
+    assert dag.critical_path() == [gates[1], gates[2], gates[4]]
+
+
+def test_dag_unknown_schedule():
+    with pytest.raises(ValueError):
+        CircuitDAG([]).moments("fastest")
+
+
+def test_dag_scales_to_large_circuits():
+    random.seed(0)
+    gates = []
+    for _ in range(100000):
+        a, b = random.sample(range(50), 2)
+        gates.append(CNOT(a, b) if random.random() < 0.5 else H(a))
+
+    # Reference schedule and dependencies, tracked per qubit
+    free_moment, last_gate, edges = [0] * 50, {}, set()
+    for i, gate in enumerate(gates):
+        moment = max(free_moment[q] for q in gate.qbits)
+        for q in gate.qbits:
+            free_moment[q] = moment + 1
+            if q in last_gate:
+                edges.add((last_gate[q], i))
+            last_gate[q] = i
+
+    dag = CircuitDAG(gates)
+    layers = list(dag.layers())
+
+    assert dag.depth == max(free_moment)
+    assert set(dag.edges) == edges and len(dag.edges) == len(edges)
+    assert len(layers) == dag.depth and sum(map(len, layers)) == len(gates)
+    assert len(dag.critical_path()) == dag.depth
@@ -0,0 +1,98 @@
+import numpy as np
+
+from shor.algorithms.shor import quantum_amod_15
+from shor.gates import CNOT, CRZ, QFT, Cr, CRk, Cz, H, PauliX, PauliZ, Rz, S, T, Tdg
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.utils.fusion import DiagonalGate, FusedGate, fuse_diagonal_gates, fuse_gates
+from shor.utils.statevector import apply_gate, apply_matrix, gate_axes, simulate
+from tests.util import is_unitary, random_circuit
+
+
+def test_fusion_preserves_state():
+    circuit = random_circuit(5, 60)
+    expected = simulate(circuit)
+
+    for max_qubits in [1, 2, 3, 4]:
+        gates, num_fused = fuse_gates(circuit.to_gates(), max_qubits)
+
+        assert np.allclose(simulate(circuit, gates), expected)
+        assert len(gates) <= len(circuit.to_gates())
+
+
+def test_fusion_reports_fused_gates():
+    gates, num_fused = fuse_gates([H(0), CNOT(0, 1), T(1), H(2), PauliX(3)], max_qubits=2)
+
+    assert num_fused == 3
+    assert len(gates) == 3
+    assert isinstance(gates[0], FusedGate)
+    assert gates[0].qbits == [0, 1]
+    assert is_unitary(gates[0].matrix)
+    assert isinstance(gates[1], H) and isinstance(gates[2], PauliX)
+
+
+def test_fusion_respects_max_qubits():
+    gates, num_fused = fuse_gates(quantum_amod_15(7).to_gates(), max_qubits=2)
+
+    # CSWAPs are wider than 2 qubits and pass through untouched
+    assert num_fused == 0
+    assert all(g.dimension <= 3 for g in gates)
+
+    gates, _ = fuse_gates([QFT(0, 1, 2), H(0), H(0)], max_qubits=2)
+    assert isinstance(gates[0], QFT)
+    assert gates[1].dimension == 1
+
+
+def test_fusion_stops_at_operations():
+    gates, num_fused = fuse_gates([H(0), Measure([0]), H(0)], max_qubits=2)
+
+    assert num_fused == 0
+    assert isinstance(gates[1], Measure)
+
+
+def test_diagonal_gates_match_dense_matrices():
+    gates = [
+        PauliZ(1),
+        S(0),
+        Tdg(2),
+        Rz(1, angle=0.3),
+        Cz(2, 0),
+        CRZ(0, 2, angle=0.7),
+        Cr(1, 2, angle=0.2),
+        CRk(2, 1, k=3),
+    ]
+
+    rng = np.random.default_rng(0)
+    state = rng.normal(size=(2, 2, 2)) + 1j * rng.normal(size=(2, 2, 2))
+
+    for gate in gates:
+        assert gate.is_diagonal
+        expected = apply_matrix(state, gate.matrix, gate_axes(gate))
+        state = apply_gate(state, gate)
+
+        assert np.allclose(state, expected)
+
+
+def test_diagonal_folding_preserves_state():
+    circuit = random_circuit(5, 80, seed=1)
+    expected = simulate(circuit)
+
+    for max_qubits in [1, 2, 5]:
+        gates, num_fused = fuse_diagonal_gates(circuit.to_gates(), max_qubits)
+
+        assert num_fused > 0
+        assert np.allclose(simulate(circuit, gates), expected)
+
+
+def test_diagonal_folding_runs():
+    theta = Parameter("theta")
+    gates, num_fused = fuse_diagonal_gates(
+        [H(0), T(0), Cz(1, 3), S(2), PauliX(1), Rz(0, angle=theta), T(0), Tdg(0), Measure([0])], max_qubits=4
+    )
+
+    assert num_fused == 5
+    assert [type(g) for g in gates] == [H, DiagonalGate, PauliX, Rz, DiagonalGate, Measure]
+    assert gates[1].qbits == [0, 1, 3, 2]
+    assert gates[1].phases.shape == (2, 2, 2, 2)
+    assert np.allclose(gates[4].diagonal, 1)
+    assert np.allclose(gates[1].matrix, np.diag(gates[1].diagonal))
@@ -409,3 +409,55 @@ def test_cy_matrix():
     assert is_square(g.to_matrix())
     assert is_unitary(g.to_matrix())
     assert np.array_equal(g.to_matrix(), np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, -1j], [0, 0, 1j, 0]]))
+
+
+def test_matrix_is_cached_and_read_only():
+    from shor.gates import CNOT, Rx
+
+    m1 = CNOT(0, 1).matrix
+    m2 = CNOT(2, 3).matrix
+
+    assert m1 is m2
+    assert m1.dtype == np.complex128
+    assert not m1.flags.writeable
+    assert np.array_equal(m1, CNOT.to_matrix())
+
+    assert Rx(0, angle=0.1).matrix is Rx(1, angle=0.1).matrix
+    assert Rx(0, angle=0.1).matrix is not Rx(0, angle=0.2).matrix
+
+
+def test_matrix_cache_dtype():
+    from shor.gates import H, gate_matrix
+
+    m = gate_matrix(H(0), dtype="complex64")
+
+    assert m.dtype == np.complex64
+    assert np.allclose(m, H(0).to_matrix())
+    assert gate_matrix(H(0), dtype="complex64") is m
+
+
+def test_matrix_cache_skips_undeclared_state():
+    from shor.gates import _Gate
+
+    class Phase(_Gate):
+        def __init__(self, *qbits, phase=0):
+            self.phase = phase
+            super().__init__(*qbits)
+
+        def to_matrix(self) -> np.ndarray:
+            return np.diag([1, np.exp(1j * self.phase)])
+
+    assert Phase(0, phase=0.1).matrix[1, 1] == np.exp(0.1j)
+    assert Phase(0, phase=0.2).matrix[1, 1] == np.exp(0.2j)
+
+
+def test_qft_matrix_matches_definition():
+    from shor.gates import QFT
+
+    for k in range(1, 7):
+        g = QFT(*range(k))
+        n = 2 ** k
+        expected = np.array([[np.exp(2j * np.pi * i * j / n) for j in range(n)] for i in range(n)]) / np.sqrt(n)
+
+        assert is_unitary(g.to_matrix())
+        assert np.allclose(g.to_matrix(), expected)
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from shor.errors import CircuitError
+from shor.gates import CNOT, H
+from shor.layers import Qubits
+from shor.observables import PauliString, PauliSum, expectation, signed_sum, walsh_hadamard
+from shor.operations import Measure
+from shor.quantum import Circuit
+from shor.utils.statevector import simulate
+from tests.util import random_circuit
+
+PAULI_MATRICES = {
+    "I": np.eye(2),
+    "X": np.array([[0, 1], [1, 0]]),
+    "Y": np.array([[0, -1j], [1j, 0]]),
+    "Z": np.array([[1, 0], [0, -1]]),
+}
+
+
+def dense_observable(term: PauliString, num_qubits: int) -> np.ndarray:
+    """Reference implementation, big endian like the state tensor: the first kron factor is qubit 0."""
+    matrix = np.eye(1)
+    for q in range(num_qubits):
+        matrix = np.kron(matrix, PAULI_MATRICES[term.paulis.get(q, "I")])
+    return term.coefficient * matrix
+
+
+def test_pauli_strings():
+    term = 0.5 * PauliString("XIZY")
+
+    assert term.x_mask == 0b1001 and term.z_mask == 0b1100
+    assert term.paulis == {0: "X", 2: "Z", 3: "Y"}
+    assert term.num_qubits == 4
+    assert PauliString({1: "y"}).paulis == {1: "Y"}
+    assert len(term + PauliString("Z") + (PauliString("X") + PauliString("Y"))) == 4
+    assert (2 * PauliSum([term])).terms[0].coefficient == 1.0
+
+    with pytest.raises(CircuitError):
+        PauliString("XQ")
+
+
+def test_expectation_matches_dense_matrices():
+    num_qubits = 4
+    state = simulate(random_circuit(num_qubits, 40))
+    psi = state.reshape(-1)
+
+    labels = ["IIII", "ZIII", "IZIZ", "XIII", "IXYI", "YYYY", "XZXZ", "ZZZZ", "IIIY", "XXII"]
+    for label in labels:
+        term = PauliString(label, coefficient=0.7)
+        expected = np.vdot(psi, dense_observable(term, num_qubits).dot(psi))
+
+        assert np.isclose(expectation(state, term), expected.real)
+        assert abs(expected.imag) < 1e-12
+
+    hamiltonian = PauliSum(PauliString(label, coefficient=i + 1) for i, label in enumerate(labels))
+    expected = sum(np.vdot(psi, dense_observable(t, num_qubits).dot(psi)) for t in hamiltonian).real
+    assert np.isclose(expectation(state, hamiltonian), expected)
+
+
+def test_many_terms_use_walsh_hadamard():
+    num_qubits = 6
+    circuit = random_circuit(num_qubits, 60, seed=3)
+    psi = simulate(circuit).reshape(-1)
+
+    rng = np.random.default_rng(0)
+    labels = ["".join(rng.choice(list("IXYZ"), size=num_qubits)) for _ in range(300)]
+    labels += ["".join(rng.choice(list("IZ"), size=num_qubits)) for _ in range(300)]
+    coefficients = rng.normal(size=len(labels))
+    hamiltonian = PauliSum(PauliString(label, c) for label, c in zip(labels, coefficients))
+
+    expected = sum(np.vdot(psi, dense_observable(t, num_qubits).dot(psi)) for t in hamiltonian).real
+    assert np.isclose(circuit.expectation(hamiltonian), expected)
+
+
+def test_circuit_expectation_cache_follows_precision():
+    from shor.observables import _STATE_CACHE
+    from shor.utils.precision import precision
+
+    circuit = random_circuit(4, 20, seed=5)
+    observable = PauliString("ZXIY")
+
+    with precision("complex64"):
+        single = circuit.expectation(observable)
+    double = circuit.expectation(observable)
+
+    assert _STATE_CACHE.get((circuit.fingerprint, np.dtype("complex64").str)).dtype == np.complex64
+    assert _STATE_CACHE.get((circuit.fingerprint, np.dtype("complex128").str)).dtype == np.complex128
+    assert np.isclose(single, double, atol=1e-5)
+
+
+def test_circuit_expectation():
+    bell = Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1)).add(Measure([0, 1]))
+
+    assert np.isclose(bell.expectation(PauliString("ZZ")), 1)
+    assert np.isclose(bell.expectation(PauliString("XX")), 1)
+    assert np.isclose(bell.expectation(PauliString("YY")), -1)
+    assert np.isclose(bell.expectation(PauliString("ZI")), 0)
+    assert np.allclose(bell.expectation([PauliString("ZZ"), 2 * PauliString("XX")]), [1, 2])
+    assert bell.expectation(PauliString("ZZ", coefficient=1j)) == pytest.approx(1j)
+
+    with pytest.raises(CircuitError):
+        bell.expectation(PauliString("IIZ"))
+
+
+def test_signed_sum_and_walsh_hadamard():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=16)
+    signs = np.array([[(-1) ** bin(b & z).count("1") for b in range(16)] for z in range(16)])
+
+    assert np.allclose(walsh_hadamard(x), signs.dot(x))
+    assert np.allclose([signed_sum(x, z) for z in range(16)], signs.dot(x))
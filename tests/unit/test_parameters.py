@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+
+from shor.errors import CircuitError
+from shor.gates import CNOT, U2, H, Rx, Rz
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.parameters import Parameter
+from shor.providers.Statevector import StatevectorProvider
+from shor.quantum import Circuit
+from shor.utils.statevector import evolve_batch, initial_statevector, simulate
+
+
+def test_to_gates_keeps_parameters():
+    gates = Rz(0, 1, angle=0.5).to_gates()
+
+    assert [g.qbits for g in gates] == [[0], [1]]
+    assert all(g.angle == 0.5 for g in gates)
+
+    gates = U2([0, 1], phi=0.1, lam=0.2).to_gates()
+    assert all((g.theta, g.phi, g.lam) == (np.pi / 2, 0.1, 0.2) for g in gates)
+
+
+def test_bind_replaces_parameters():
+    theta = Parameter("theta")
+    template = Circuit().add(Qubits(2)).add(H(0)).add(Rx(1, angle=theta)).add(Rz(0, angle=theta))
+
+    assert template.parameters == [theta]
+
+    bound = template.bind({theta: 0.3})
+    assert bound.parameters == []
+    assert bound.layers[1] is template.layers[1]
+    assert bound.layers[2].angle == 0.3
+    assert template.layers[2].angle is theta
+
+    assert template.bind({"theta": 0.3}).layers[3].angle == 0.3
+
+
+def test_unbound_parameters_raise():
+    theta = Parameter("theta")
+    template = Circuit().add(Qubits(1)).add(Rx(0, angle=theta))
+
+    with pytest.raises(CircuitError):
+        template.layers[1].matrix
+
+    with pytest.raises(CircuitError):
+        template.bind({"phi": 1.0})
+
+
+def test_run_sweep_matches_bound_runs():
+    theta = Parameter("theta")
+    template = Circuit().add(Qubits(2)).add(Rx(0, angle=theta)).add(CNOT(0, 1)).add(Measure([0, 1]))
+    angles = [0, math.pi / 3, math.pi]
+
+    jobs = StatevectorProvider(seed=0).run_sweep(template, [{theta: a} for a in angles], 1000)
+
+    assert len(jobs) == len(angles)
+    assert jobs[0].result.counts == {0: 1000}
+    assert jobs[2].result.counts == {3: 1000}
+    assert set(jobs[1].result.counts) == {0, 3}
+
+    provider = StatevectorProvider(seed=0)
+    for job, angle in zip(jobs, angles):
+        assert provider.run(template.bind({theta: angle}), 1000).result.counts == job.result.counts
+
+
+def test_batched_sweep_matches_single_runs():
+    theta, phi = Parameter("theta"), Parameter("phi")
+    template = Circuit().add(Qubits(3)).add(H(0)).add(Rx(1, angle=theta)).add(CNOT(1, 2)).add(Rz(2, angle=phi))
+    bindings = [{theta: a, phi: 2 * a} for a in np.linspace(0, np.pi, 7)]
+
+    initial_state = initial_statevector(template)
+    states = evolve_batch(np.stack([initial_state] * len(bindings)), template.to_gates(), bindings)
+
+    for state, binding in zip(states, bindings):
+        assert np.allclose(state, simulate(template.bind(binding)))
+
+
+def test_batched_sweep_bypasses_matrix_cache():
+    from shor.gates import _MATRIX_CACHE
+
+    theta = Parameter("theta")
+    template = Circuit().add(Qubits(2)).add(H(0)).add(Rx(1, angle=theta))
+    bindings = [{theta: a} for a in np.linspace(0, 1, 50)]
+    gates = template.to_gates()
+    states = np.stack([initial_statevector(template)] * len(bindings))
+
+    evolve_batch(states, gates, bindings)
+    cached = len(_MATRIX_CACHE)
+    evolve_batch(states, gates, [{theta: a + 1} for a in np.linspace(0, 1, 50)])
+
+    assert len(_MATRIX_CACHE) == cached
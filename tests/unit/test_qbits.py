@@ -0,0 +1,43 @@
+import random
+
+import numpy as np
+
+from shor.utils.qbits import change_qubit_order, qubit_permutation_indices, rearrange_bits
+
+
+def reference_change_qubit_order(matrix, old_order, new_order):
+    reorder_qubits = [new_order.index(q2) for q2 in old_order]
+    reorder_rows = [rearrange_bits(i, reorder_qubits) for i in range(2 ** len(old_order))]
+
+    return matrix[reorder_rows][:, reorder_rows]
+
+
+def test_change_qubit_order_operator():
+    random.seed(0)
+    for num_qubits in range(1, 6):
+        old_order = list(range(num_qubits))
+        new_order = random.sample(old_order, num_qubits)
+        m = np.random.rand(2 ** num_qubits, 2 ** num_qubits)
+
+        assert np.array_equal(
+            change_qubit_order(m, old_order, new_order), reference_change_qubit_order(m, old_order, new_order)
+        )
+
+
+def test_change_qubit_order_statevector():
+    random.seed(1)
+    for num_qubits in range(1, 6):
+        old_order = random.sample(range(num_qubits), num_qubits)
+        new_order = random.sample(range(num_qubits), num_qubits)
+        v = np.random.rand(2 ** num_qubits)
+
+        expected = np.diag(reference_change_qubit_order(np.diag(v), old_order, new_order))
+        assert np.array_equal(change_qubit_order(v, old_order, new_order), expected)
+        assert np.array_equal(v[qubit_permutation_indices(tuple(old_order), tuple(new_order))], expected)
+
+
+def test_change_qubit_order_swap_two_qubits():
+    # |01> -> |10> when the two qubits trade places
+    v = np.array([0, 1, 0, 0])
+
+    assert np.array_equal(change_qubit_order(v, [0, 1], [1, 0]), np.array([0, 0, 1, 0]))
@@ -1,7 +1,16 @@
+import numpy as np
 import pytest
 
-from shor.layers import _Layer
+from shor.algorithms.shor import quantum_amod_15
+from shor.errors import CircuitError
+from shor.gates import CNOT, CSWAP, Cx, H, Rx, T
+from shor.layers import Qubits, _Layer
+from shor.operations import Measure
+from shor.parameters import Parameter
 from shor.quantum import Circuit
+from shor.utils.qbits import change_qubit_order
+from shor.utils.statevector import gate_axes
+from tests.util import bell
 
 
 def test_circuit_init():
@@ -42,3 +51,66 @@ def test_circuit_add_wrong_type():
 
     with pytest.raises(TypeError):
         Circuit().add(SomeClass())
+
+
+def test_circuit_equality_is_structural():
+    assert bell() == bell()
+    assert hash(bell()) == hash(bell())
+    assert len({bell(), bell(), bell(0.25)}) == 2
+
+    assert bell() != bell(angle=0.25)
+    assert bell() == bell(angle=np.float64(0.5))
+    assert Circuit().add(Qubits(2)) != Circuit().add(Qubits(3))
+    assert Circuit().add(Qubits(2)) != Circuit().add(Qubits(2, state=1))
+    assert Circuit().add(CNOT(0, 1)) != Circuit().add(CNOT(1, 0))
+    assert bell().add(Measure([1])) != bell().add(Measure([0]))
+
+
+def test_fingerprint_is_canonical():
+    assert Circuit().add(H([0, 1])) == Circuit().add(H(0)).add(H(1))
+    assert Circuit().add(Rx(0, angle=Parameter("theta"))) == Circuit().add(Rx(0, angle=Parameter("theta")))
+    assert Circuit().add(Rx(0, angle=Parameter("theta"))) != Circuit().add(Rx(0, angle=Parameter("phi")))
+
+
+def test_fingerprint_is_incremental():
+    circuit = Circuit().add(Qubits(2)).add(H(0))
+    other = Circuit().add(Qubits(2))
+    assert circuit != other
+
+    other.add(H(0))
+    assert circuit.fingerprint == other.fingerprint
+
+    # Layers appended directly are caught up on, replacing the layers starts over
+    circuit.layers.append(CNOT(0, 1))
+    assert circuit == Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1))
+
+    circuit.layers = circuit.layers[:2]
+    assert circuit == other
+    assert bell(Parameter("theta")).bind({"theta": 0.5}) == bell()
+
+
+def test_to_unitary_matches_dense_operators():
+    circuit = Circuit().add(Qubits(3)).add(H(0)).add(CNOT(0, 2)).add(Rx(1, angle=0.3)).add(CSWAP(1, 0, 2))
+    circuit.add(T(2)).add(Cx(2, 1)).add(Measure([0, 1, 2]))
+
+    expected = np.eye(8)
+    for gate in circuit.to_gates():
+        others = [q for q in range(3) if q not in gate.qbits]
+        dense = np.kron(gate.to_matrix(), np.eye(2 ** len(others)))
+        expected = change_qubit_order(dense, list(gate_axes(gate)) + others, [0, 1, 2]).dot(expected)
+
+    assert np.allclose(circuit.to_unitary(), expected)
+    assert np.allclose(bell().to_unitary(chunk_size=3), bell().to_unitary())
+
+
+def test_to_unitary_is_cached():
+    unitary = quantum_amod_15(7).to_unitary()
+
+    assert quantum_amod_15(7).to_unitary() is unitary
+    assert not unitary.flags.writeable
+    # amod_15 only permutes basis states
+    assert np.array_equal(np.sort(unitary.real, axis=0)[-1], np.ones(32))
+    assert np.count_nonzero(unitary) == 32
+
+    with pytest.raises(CircuitError):
+        Circuit().add(Rx(0, angle=Parameter("theta"))).to_unitary()
@@ -1,5 +1,10 @@
 import numpy as np
 
+from shor.gates import CCNOT, CNOT, CRZ, CSWAP, SWAP, U3, Cx, H, PauliX, Rx, S, T
+from shor.layers import Qubits
+from shor.operations import Measure
+from shor.quantum import Circuit
+
 
 def is_square(m):
     return m.shape[0] == m.shape[1] and len(m.shape) == 2
@@ -7,3 +12,37 @@ def is_square(m):
 
 def is_unitary(m):
     return np.allclose(np.eye(m.shape[0]), m.dot(m.conj().T))
+
+
+def bell(angle=0.5):
+    return Circuit().add(Qubits(2)).add(H(0)).add(CNOT(0, 1)).add(Rx(1, angle=angle)).add(Measure([0, 1]))
+
+
+def random_circuit(num_qubits, num_gates, seed=0):
+    """Random gates on 1 to 3 of num_qubits (at least 3) qubits, starting from |0..010>, measuring every qubit.
+
+    The mix covers diagonal, permutation and dense gates, controlled ones and both CNOT conventions.
+    """
+    rng = np.random.default_rng(seed)
+    circuit = Circuit().add(Qubits(num_qubits)).add(PauliX(1))
+
+    for _ in range(num_gates):
+        a, b, c = rng.permutation(num_qubits)[:3].tolist()
+        angle = rng.uniform(0, 2 * np.pi)
+        circuit.add(
+            [
+                H(a),
+                T(a),
+                S(a),
+                Rx(a, angle=angle),
+                U3(a, theta=angle, phi=0.3, lam=1.1),
+                CNOT(a, b),
+                Cx(a, b),
+                CRZ(a, b, angle=angle),
+                SWAP(a, b),
+                CCNOT(a, b, c),
+                CSWAP(a, b, c),
+            ][rng.integers(11)]
+        )
+
+    return circuit.add(Measure(list(range(num_qubits))))